@@ -0,0 +1,38 @@
+"""
+Compares building long rows with the builtin sum, pulp.lpSum and the HorusLP expression helpers.
+
+    python benchmarks/bench_expressions.py [terms]
+
+The builtin sum is quadratic, so it is only timed on shorter rows and the time for the full row is extrapolated.
+"""
+import sys
+import time
+
+import pulp as pl
+
+from horuslp.core.expressions import dot, weighted_sum
+
+
+def timed(build):
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def main(terms=100000):
+    keys = list(range(terms))
+    group = {key: pl.LpVariable('x_%d' % key, 0, 1) for key in keys}
+    weights = {key: key % 7 + 1 for key in keys}
+    short = min(terms, 5000)
+    short_keys = keys[:short]
+    builtin = timed(lambda: sum(group[key] * weights[key] for key in short_keys))
+    print('builtin sum, %d terms: %.3fs (about %.1fs for %d terms)' % (
+        short, builtin, builtin * (terms / short) ** 2, terms))
+    print('pulp.lpSum, %d terms: %.3fs' % (terms, timed(lambda: pl.lpSum(group[key] * weights[key] for key in keys))))
+    print('weighted_sum, %d terms: %.3fs' % (terms, timed(lambda: weighted_sum((group[key], weights[key])
+                                                                                 for key in keys))))
+    print('dot, %d terms: %.3fs' % (terms, timed(lambda: dot(group, weights))))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
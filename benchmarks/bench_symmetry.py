@@ -0,0 +1,108 @@
+"""
+Compares the solve time of a staffing model with interchangeable temp workers with and without symmetry breaking.
+
+    python -m benchmarks.bench_symmetry [temps] [time limit]
+
+The model extends the Game of Thrones staffing example: instead of counting the Dothraki temps per shift, every temp
+is hired and assigned to shifts individually, which makes the temps interchangeable. At least 17 temps are needed to
+staff the shifts, fewer make the model infeasible. The spare temps are what makes the model hard: from about 23 temps
+on, the solve without symmetry breaking runs into the time limit while proving optimality, whereas the solve with
+symmetry breaking finishes in a few seconds. The speedup is only reported when the solves can be compared.
+"""
+import sys
+import time
+
+import pulp as pl
+
+from examples.got_staffing2 import workers, DOTHRAKI_COST
+from horuslp.core import ConstraintFamily, VariableManager, Problem, ObjectiveComponent
+from horuslp.core.Variables import BinaryVariableGroup
+from horuslp.core.constants import MINIMIZE
+
+SHIFT_REQUIREMENTS = [5, 9, 8, 11, 7, 6, 10, 4]
+SHIFT_HOURS = [3, 5, 4, 6, 5, 3, 4, 6]
+TEMP_HOURS = 11
+HIRING_COST = 60
+MIN_TEMPS = 17
+TIME_LIMIT = 30
+
+
+def build_problem(temps, symmetry_breaking):
+    temp_ids = list(range(temps))
+    shifts = list(range(len(SHIFT_REQUIREMENTS)))
+
+    class TempVariables(VariableManager):
+        vars = [
+            BinaryVariableGroup('employee_shifts', [(employee, shift) for employee, info in workers.items()
+                                                    for shift in info['availability']]),
+            BinaryVariableGroup('temp_shifts', [(temp, shift) for temp in temp_ids for shift in shifts]),
+            BinaryVariableGroup('temp_hired', temp_ids)
+        ]
+
+    class ShiftRequirements(ConstraintFamily):
+        def define(self, employee_shifts, temp_shifts):
+            for shift, requirement in enumerate(SHIFT_REQUIREMENTS):
+                staff = [var for key, var in employee_shifts.items() if key[1] == shift]
+                staff += [temp_shifts[temp, shift] for temp in temp_ids]
+                yield shift, pl.lpSum(staff) >= requirement
+
+    class TempHours(ConstraintFamily):
+        def define(self, temp_shifts, temp_hired):
+            for temp in temp_ids:
+                hours = pl.lpSum(SHIFT_HOURS[shift] * temp_shifts[temp, shift] for shift in shifts)
+                yield temp, hours <= TEMP_HOURS * temp_hired[temp]
+
+    class LaborStandards(ConstraintFamily):
+        def define(self, employee_shifts):
+            for employee in workers:
+                yield employee, pl.lpSum(var for key, var in employee_shifts.items() if key[0] == employee) <= 2
+
+    class StaffingCost(ObjectiveComponent):
+        def define(self, employee_shifts, temp_shifts, temp_hired):
+            return pl.lpSum(workers[key[0]]['cost'] * var for key, var in employee_shifts.items()) + \
+                pl.lpSum(DOTHRAKI_COST * var for var in temp_shifts.values()) + \
+                pl.lpSum(HIRING_COST * var for var in temp_hired.values())
+
+    class TempStaffingProblem(Problem):
+        variables = TempVariables
+        objective = StaffingCost
+        constraints = [ShiftRequirements, TempHours, LaborStandards]
+        sense = MINIMIZE
+
+    prob = TempStaffingProblem()
+    prob.symmetry_breaking = symmetry_breaking
+    return prob
+
+
+def timed_solve(temps, symmetry_breaking, time_limit):
+    prob = build_problem(temps, symmetry_breaking)
+    prob.build_model()
+    start = time.perf_counter()
+    status = prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)}, time_limit=time_limit)
+    return time.perf_counter() - start, status, pl.value(prob.prob.objective), prob
+
+
+def main(temps=24, time_limit=TIME_LIMIT):
+    if temps < MIN_TEMPS:
+        print('%d temps can not staff the shifts, the model needs at least %d' % (temps, MIN_TEMPS))
+        return
+    plain_time, plain_status, plain_objective, _ = timed_solve(temps, False, time_limit)
+    print('without symmetry breaking: %.2fs, %s, objective %.1f' % (plain_time, plain_status, plain_objective))
+    broken_time, broken_status, broken_objective, prob = timed_solve(temps, True, time_limit)
+    print('with symmetry breaking: %.2fs, %s, objective %.1f' % (broken_time, broken_status, broken_objective))
+    for symmetry in prob.symmetries:
+        print('  %s[%s]: %d interchangeable values, linked to %s' % (
+            symmetry.group, symmetry.position, len(symmetry.values), symmetry.linked))
+    print('%d ordering rows' % len(prob.symmetry_rows))
+    speedup = plain_time / max(broken_time, 1e-9)
+    if plain_status == broken_status == 'Optimal':
+        print('speedup %.1fx' % speedup)
+    elif plain_status == 'Feasible' and broken_status == 'Optimal':
+        print('speedup at least %.1fx, the solve without symmetry breaking hit the %ss time limit' % (
+            speedup, time_limit))
+    else:
+        print('no speedup reported, the solves did not both finish')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 24, float(sys.argv[2]) if len(sys.argv) > 2 else TIME_LIMIT)
@@ -12,6 +12,8 @@ class Constraint:
 
     name = None
     dependent_constraints = None
+    # the block of a block-structured problem the constraint is local to, None for the constraints linking the blocks
+    block = None
 
     def __init__(self):
         """
@@ -43,3 +45,60 @@ class Constraint:
         assert inspect.isclass(constraint), 'dependent constraint must be a class'
         assert issubclass(constraint, Constraint), 'dependent constraint must be a subclass of Constraint class'
         self.dependent_constraints.append(constraint)
+
+
+class ConstraintFamily(Constraint):
+    """
+    An indexed family of constraints. A single define function yields all the rows of the family, which are
+    implemented in one pass and reported grouped under the family name. In the model, each row is named
+    <name>_<key>_, see utils.add_family_row.
+    """
+
+    def define(self, **kwargs):
+        """
+        The main function for the constraint family.
+
+        :dictionary kwargs: variable that would be needed by the constraint in order to define it. Passed in the same
+        way as for the Constraint class.
+
+        :returns generator<tuple>: (key, LPAffineExpression) pairs, one for each row of the family. A dictionary of
+        the rows keyed the same way can be returned instead.
+        """
+        raise NotImplementedError("Constraint family must be implemented!")
+
+
+class LazyConstraint(ConstraintFamily):
+    """
+    A constraint family whose rows are only added to the model once they are violated. The define function gives
+    the rows the model starts with, none by default. When the problem is solved with solve_lazy, the separate
+    function is called with the result variables after each solve, and the rows it returns the keys of are defined
+    with define_row and added to the model before re-solving.
+    """
+
+    def define(self, **kwargs):
+        """
+        :dictionary kwargs: the variables required to define the initial rows, passed in the same way as for the
+        Constraint class
+        :returns generator<tuple>: (key, LPAffineExpression) pairs for the initial rows of the family
+        """
+        return {}
+
+    def separate(self, **kwargs):
+        """
+        Finds the rows of the family that the current solution violates.
+
+        :dictionary kwargs: the values of the result variables that would be needed to check the rows. If kwargs
+        are used, then all the result variables will be passed in as a dictionary
+        :returns list: the keys of the violated rows
+        """
+        raise NotImplementedError("Lazy constraint separation must be implemented!")
+
+    def define_row(self, key, **kwargs):
+        """
+        Defines a single row of the family.
+
+        :object key: the key of the row. Because of it, no variable of the problem can be named key
+        :dictionary kwargs: the variables needed to define the row, passed in the same way as for define
+        :returns LPAffineExpression: the row expression
+        """
+        raise NotImplementedError("Lazy constraint row definition must be implemented!")
@@ -0,0 +1,186 @@
+"""
+Lagrangian decomposition of block-structured problems
+"""
+import math
+from collections import OrderedDict
+
+import pulp as pl
+
+from horuslp.core.constants import MAXIMIZE
+from horuslp.core.utils import get_constraints_value
+
+
+class LagrangianRelaxation:
+    """
+    Solves a block-structured problem by Lagrangian relaxation. The constraints of the problem are tagged with the
+    block they are local to through their block attribute, and the untagged constraints are the linking
+    constraints. The linking constraints are moved into the objective with a multiplier each, which leaves
+    independent block subproblems that are solved separately, in a solver pool if one is given. The multipliers are
+    updated with subgradient steps.
+
+    Every iteration gives a dual bound on the optimal objective value (an upper bound when maximizing, a lower bound
+    when minimizing). Whenever the block solutions happen to satisfy the linking constraints, they also give a
+    primal bound.
+    """
+
+    def __init__(self, problem, pool=None, solve_args=None, tolerance=1e-6):
+        """
+        :Problem problem: the problem to decompose, the model is built if it hasn't been
+        :SolverPool pool: the solver pool to solve the block subproblems in, they are solved one after the other in
+        this process if it is None
+        :dictionary solve_args: the arguments to pass into the PuLP solve function for the block subproblems
+        :float tolerance: the tolerance on the linking constraints and on the gap between the bounds
+        """
+        problem.build_model()
+        self.problem = problem
+        self.pool = pool
+        self.solve_args = {} if solve_args is None else solve_args
+        self.tolerance = tolerance
+        self.sign = 1 if problem.sense == MAXIMIZE else -1
+        self.linking_rows = []
+        self.block_rows = OrderedDict()
+        self.block_variables = OrderedDict()
+        self.multipliers = []
+        self.iterations = []
+        self.dual_bound = None
+        self.primal_bound = None
+        self.solution = None
+        self.partition()
+
+    def partition(self):
+        """
+        Splits the rows of the model into the linking rows and the rows of each block, and assigns every variable to
+        the block whose rows it appears in. The variables that appear in no block row form a block of their own,
+        keyed None.
+        """
+        blocks = {constraint.name: constraint.block for constraint in self.problem.flattened_constraints}
+        var_blocks = {}
+        for constr_name in self.problem.implemented_constraints:
+            block = blocks.get(constr_name)
+            for row_id, row in self.problem.get_constraint_rows(constr_name):
+                if block is None:
+                    self.linking_rows.append((row_id, row))
+                    continue
+                self.block_rows.setdefault(block, []).append(row)
+                for var in row.keys():
+                    owner = var_blocks.setdefault(var.name, block)
+                    if owner != block:
+                        raise ValueError('Variable %s is shared by the blocks %s and %s, the constraints between '
+                                         'them must be linking constraints' % (var.name, owner, block))
+        for var in self.problem.prob.variables():
+            self.block_variables.setdefault(var_blocks.get(var.name), []).append(var)
+        for block in self.block_variables:
+            self.block_rows.setdefault(block, [])
+        self.multipliers = [0.0] * len(self.linking_rows)
+
+    def solve_blocks(self):
+        """
+        Solves the block subproblems for the current multipliers.
+        :returns float: the value of the Lagrangian function, which is a dual bound
+        """
+        objective = self.problem.prob.objective
+        costs = {var: objective.get(var, 0) for var in self.problem.prob.variables()}
+        constant = objective.constant
+        for multiplier, (row_id, row) in zip(self.multipliers, self.linking_rows):
+            if multiplier == 0:
+                continue
+            for var, coef in row.items():
+                costs[var] -= self.sign * multiplier * coef
+            constant -= self.sign * multiplier * row.constant
+        models = []
+        for block, variables in self.block_variables.items():
+            model = pl.LpProblem('%s_%s' % (self.problem.name, block), self.problem.prob.sense)
+            model += pl.LpAffineExpression([(var, costs[var]) for var in variables])
+            for row in self.block_rows[block]:
+                model += row
+            models.append(model)
+        if self.pool is None:
+            statuses = [model.solve(**self.solve_args) for model in models]
+        else:
+            futures = [self.pool.submit_model(model, self.solve_args) for model in models]
+            statuses = [future.result() for future in futures]
+        for block, status in zip(self.block_variables, statuses):
+            if status != pl.LpStatusOptimal:
+                raise ValueError('The subproblem of block %s is %s' % (block, pl.LpStatus[status]))
+        return sum(pl.value(model.objective) for model in models) + constant
+
+    def is_satisfied(self, row, residual):
+        """
+        :LPConstraint row: the linking row
+        :float residual: the value of the row expression minus the right hand side
+        :returns boolean: whether the row is satisfied within the tolerance
+        """
+        if row.sense == pl.LpConstraintLE:
+            return residual <= self.tolerance
+        if row.sense == pl.LpConstraintGE:
+            return residual >= -self.tolerance
+        return abs(residual) <= self.tolerance
+
+    def gap(self):
+        """
+        :returns float: the relative gap between the best bounds, or None if there is no primal bound yet
+        """
+        if self.primal_bound is None:
+            return None
+        return abs(self.dual_bound - self.primal_bound) / max(1, abs(self.primal_bound))
+
+    def run(self, iterations=50, step=2.0, patience=3):
+        """
+        Runs the subgradient iterations. The step length follows the Polyak rule once a primal bound is known,
+        and a diminishing normalized step before that. The step factor is halved whenever the dual bound hasn't
+        improved for a number of iterations.
+
+        :int iterations: the maximum number of iterations
+        :float step: the initial step factor
+        :int patience: the number of iterations without improvement of the dual bound before the step is halved
+        :returns list<OrderedDict>: the iteration log, with the dual bound of the iteration and the best bounds and
+        gap so far for every iteration
+        """
+        stalled = 0
+        for iteration in range(len(self.iterations), len(self.iterations) + iterations):
+            value = self.solve_blocks()
+            if self.dual_bound is None or self.sign * (value - self.dual_bound) < 0:
+                self.dual_bound = value
+                stalled = 0
+            else:
+                stalled += 1
+                if stalled >= patience:
+                    step /= 2
+                    stalled = 0
+            residuals = [get_constraints_value(row) + row.constant for row_id, row in self.linking_rows]
+            if all(self.is_satisfied(row, residual) for (row_id, row), residual in zip(self.linking_rows, residuals)):
+                primal = pl.value(self.problem.prob.objective)
+                if self.primal_bound is None or self.sign * (primal - self.primal_bound) > 0:
+                    self.primal_bound = primal
+                    self.solution = {var: var.varValue for var in self.problem.prob.variables()}
+            self.iterations.append(OrderedDict([
+                ('iteration', iteration),
+                ('bound', value),
+                ('dual_bound', self.dual_bound),
+                ('primal_bound', self.primal_bound),
+                ('gap', self.gap())
+            ]))
+            norm = sum(residual ** 2 for residual in residuals)
+            if norm == 0 or (self.gap() is not None and self.gap() <= self.tolerance):
+                break
+            if self.primal_bound is None:
+                step_length = step / ((iteration + 1) * math.sqrt(norm))
+            else:
+                step_length = step * abs(value - self.primal_bound) / norm
+            self.update_multipliers(residuals, step_length)
+        return self.iterations
+
+    def update_multipliers(self, residuals, step_length):
+        """
+        Moves the multipliers along the subgradient and projects them onto their domains: non-negative for <= rows,
+        non-positive for >= rows and free for equality rows.
+        :list<float> residuals: the value of each linking row expression minus its right hand side
+        :float step_length: the length of the step
+        """
+        for i, ((row_id, row), residual) in enumerate(zip(self.linking_rows, residuals)):
+            multiplier = self.multipliers[i] + step_length * residual
+            if row.sense == pl.LpConstraintLE:
+                multiplier = max(multiplier, 0.0)
+            elif row.sense == pl.LpConstraintGE:
+                multiplier = min(multiplier, 0.0)
+            self.multipliers[i] = multiplier
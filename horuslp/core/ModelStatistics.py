@@ -0,0 +1,188 @@
+"""
+Size and sparsity statistics of a built model, broken down by variable group and by constraint.
+"""
+from collections import OrderedDict
+
+import pulp as pl
+
+from horuslp.core.Report import Report
+from horuslp.core.utils import is_constraint_group
+
+
+def _coefficient_range(values):
+    """
+    :iterable<float> values: the coefficients
+    :returns tuple<float>: the smallest and largest magnitude of the nonzero coefficients, None if there are none
+    """
+    magnitudes = [abs(value) for value in values if value]
+    if not magnitudes:
+        return None, None
+    return min(magnitudes), max(magnitudes)
+
+
+def _format(value):
+    """
+    :float value: a statistic, or the name of a constraint class
+    :returns string: the statistic formatted for a table, - if it is unknown
+    """
+    if value is None:
+        return '-'
+    if isinstance(value, (int, str)):
+        return str(value)
+    return '%.3g' % value
+
+
+class ModelStatistics:
+    """
+    Describes the size and shape of the model of a problem: the number of variables of every group by type, and the
+    number of rows, the number of nonzeros and the range of the coefficients and right hand sides of every
+    constraint. The constraint matrix is walked once, counting the nonzeros of the columns as it goes, so that the
+    dense columns, which appear in many rows, can be listed as well.
+    """
+
+    def __init__(self, problem, dense_fraction=0.1):
+        """
+        :Problem problem: the problem, its model is built if it hasn't been yet
+        :float dense_fraction: the fraction of the rows a column has to appear in to be listed as dense
+        """
+        self.dense_fraction = dense_fraction
+        self.variables = OrderedDict()
+        self.constraints = OrderedDict()
+        self.objective = OrderedDict()
+        self.columns = 0
+        self.rows = 0
+        self.nonzeros = 0
+        self.dense_columns = []
+        self.column_keys = {}
+        problem.build_model()
+        self.analyze_variables(problem)
+        self.analyze_constraints(problem)
+        self.analyze_objective(problem)
+
+    def analyze_variables(self, problem):
+        """
+        Counts the variables of every variable group by type. Single variables are counted as groups of one.
+        :Problem problem: the built problem
+        """
+        for var_name, pl_var in problem.vars.items():
+            group = pl_var.items() if isinstance(pl_var, dict) else [(None, pl_var)]
+            stats = OrderedDict([('columns', 0), ('binary', 0), ('integer', 0), ('continuous', 0)])
+            for key, var in group:
+                self.column_keys[var] = (var_name, key)
+                stats['columns'] += 1
+                if var.cat == pl.LpContinuous:
+                    stats['continuous'] += 1
+                elif var.lowBound == 0 and var.upBound == 1:
+                    stats['binary'] += 1
+                else:
+                    stats['integer'] += 1
+            self.variables[var_name] = stats
+            self.columns += stats['columns']
+
+    def analyze_constraints(self, problem):
+        """
+        Walks the rows of every implemented constraint once, collecting the row statistics of the constraint and the
+        nonzero counts of the columns.
+        :Problem problem: the built problem
+        """
+        constraint_classes = {constraint.name: constraint.__class__.__name__
+                              for constraint in problem.flattened_constraints}
+        column_counts = {}
+        for constr_name, constr_expr in problem.implemented_constraints.items():
+            if constr_expr is True:
+                continue
+            rows = constr_expr.values() if is_constraint_group(constr_expr) else [constr_expr]
+            nonzeros = 0
+            largest_row = 0
+            min_coef = max_coef = min_rhs = max_rhs = None
+            for row in rows:
+                row_min, row_max = _coefficient_range(row.values())
+                if row_min is not None:
+                    min_coef = row_min if min_coef is None else min(min_coef, row_min)
+                    max_coef = row_max if max_coef is None else max(max_coef, row_max)
+                rhs = abs(row.constant)
+                if rhs:
+                    min_rhs = rhs if min_rhs is None else min(min_rhs, rhs)
+                    max_rhs = rhs if max_rhs is None else max(max_rhs, rhs)
+                nonzeros += len(row)
+                largest_row = max(largest_row, len(row))
+                for var in row.keys():
+                    column_counts[var] = column_counts.get(var, 0) + 1
+            row_count = len(rows)
+            self.constraints[constr_name] = OrderedDict([
+                ('class', constraint_classes.get(constr_name, constr_name)),
+                ('rows', row_count),
+                ('nonzeros', nonzeros),
+                ('largest_row', largest_row),
+                ('min_coef', min_coef),
+                ('max_coef', max_coef),
+                ('min_rhs', min_rhs),
+                ('max_rhs', max_rhs)
+            ])
+            self.rows += row_count
+            self.nonzeros += nonzeros
+        threshold = max(self.dense_fraction * self.rows, 1)
+        dense_columns = [(self.column_keys.get(var, (var.name, None)), count)
+                         for var, count in column_counts.items() if count > threshold]
+        self.dense_columns = sorted(dense_columns, key=lambda column: -column[1])
+
+    def analyze_objective(self, problem):
+        """
+        Collects the size and coefficient range of the objective.
+        :Problem problem: the built problem
+        """
+        objective = problem.prob.objective if problem.prob.objective is not None else {}
+        min_coef, max_coef = _coefficient_range(objective.values())
+        self.objective = OrderedDict([('nonzeros', len(objective)), ('min_coef', min_coef), ('max_coef', max_coef)])
+
+    @property
+    def density(self):
+        """
+        :returns float: the fraction of the entries of the constraint matrix that are nonzero
+        """
+        if not self.rows or not self.columns:
+            return 0.0
+        return self.nonzeros / float(self.rows * self.columns)
+
+    @property
+    def coefficient_range(self):
+        """
+        :returns tuple<float>: the smallest and largest magnitude of the nonzero coefficients of the constraints
+        """
+        minimums = [stats['min_coef'] for stats in self.constraints.values() if stats['min_coef'] is not None]
+        maximums = [stats['max_coef'] for stats in self.constraints.values() if stats['max_coef'] is not None]
+        if not minimums:
+            return None, None
+        return min(minimums), max(maximums)
+
+    def render(self, report=None, max_dense_columns=10):
+        """
+        Renders the statistics as tables of the variable groups and of the constraints, followed by the densest
+        columns.
+        :Report report: the report to render into, a new report written to stdout is used if it is None
+        :int max_dense_columns: the maximum number of dense columns to list
+        """
+        with report or Report() as report:
+            min_coef, max_coef = self.coefficient_range
+            report.line('columns: %d, rows: %d, nonzeros: %d, density: %.3g, coefficients: [%s, %s]' % (
+                self.columns, self.rows, self.nonzeros, self.density, _format(min_coef), _format(max_coef)))
+            report.line('objective: %d nonzeros, coefficients: [%s, %s]' % (
+                self.objective['nonzeros'], _format(self.objective['min_coef']),
+                _format(self.objective['max_coef'])))
+            if self.variables:
+                report.add_table([('variable',) + tuple(next(iter(self.variables.values())).keys())] + [
+                    (str(name),) + tuple(_format(value) for value in stats.values())
+                    for name, stats in self.variables.items()
+                ])
+            if self.constraints:
+                report.add_table([('constraint',) + tuple(next(iter(self.constraints.values())).keys())] + [
+                    (str(name),) + tuple(_format(value) for value in stats.values())
+                    for name, stats in self.constraints.items()
+                ])
+            if self.dense_columns:
+                report.add_table([('dense column', 'rows')] + [
+                    (name if key is None else '%s[%s]' % (name, key), str(count))
+                    for (name, key), count in self.dense_columns[:max_dense_columns]
+                ])
+                if len(self.dense_columns) > max_dense_columns:
+                    report.line('... %d more dense columns' % (len(self.dense_columns) - max_dense_columns))
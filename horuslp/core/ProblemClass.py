@@ -2,13 +2,68 @@
 The problem class that manages the main logic for the library
 """
 
+import asyncio
 import itertools
+import math
+import weakref
 import pulp as pl
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from horuslp.core.Constraint import ConstraintFamily, LazyConstraint
+from horuslp.core.Decomposition import LagrangianRelaxation
+from horuslp.core.ModelStatistics import ModelStatistics
 from horuslp.core.Objective import CombinedObjective
-from horuslp.core.constants import MAXIMIZE, MINIMIZE
+from horuslp.core.constants import MAXIMIZE, MINIMIZE, THREAD, PROCESS, FEASIBLE
+from horuslp.core.parametric import piecewise_linear_curve
+from horuslp.core.presolve import presolve_problem, INFINITY
+from horuslp.core.Report import Report
+from horuslp.core.scaling import scale_problem
+from horuslp.core.ResultTable import ResultTable, VARIABLE, CONSTRAINT, METRIC
+from horuslp.core.SolutionPool import SolutionPool
+from horuslp.core.symmetry import find_symmetries, add_symmetry_breaking
+from horuslp.core.Variables import PULP_TYPES
+from horuslp.core import serialization
+from horuslp.core.solver import CbcProcess, apply_limits, check_log_solve_args
 
-from horuslp.core.utils import get_constraints_value, call_with_required_args
+from horuslp.core.utils import get_constraints_value, call_with_required_args, iterate_variables, \
+    serialize_constraint, deserialize_constraint, is_constraint_group, collect_rows, get_model_rows, remove_model_row, \
+    add_family_row, SparseValues
+
+# variables held by each worker of the process pool when the constraints are defined in parallel
+_worker_vars = None
+
+
+def _define_constraint(constraint, variables):
+    """
+    Calls the define function of the constraint. The rows of a constraint family are collected into a dictionary
+    so that the whole family is defined in one go.
+    :Constraint constraint: the constraint object to define
+    :dictionary variables: the variables dictionary of the problem
+    :returns LPConstraint/OrderedDict: the constraint expression, or the rows of the family keyed by the row key
+    """
+    constraint_spec = call_with_required_args(constraint.define, variables)
+    if isinstance(constraint, ConstraintFamily):
+        return collect_rows(constraint_spec)
+    return constraint_spec
+
+
+def _init_define_worker(variables):
+    """
+    Initializer for the process pool workers. Stores the variables once per worker so they don't have to be sent
+    along with every constraint.
+    :dictionary variables: the variables dictionary of the problem
+    """
+    global _worker_vars
+    _worker_vars = variables
+
+
+def _define_serialized(constraint):
+    """
+    Defines the constraint inside of a process pool worker and returns it as a serialized coefficient block.
+    :Constraint constraint: the constraint object to define
+    :returns tuple: the serialized constraint
+    """
+    return serialize_constraint(_define_constraint(constraint, _worker_vars))
 
 
 class Problem:
@@ -21,7 +76,24 @@ class Problem:
     constraints = None
     metrics = None
     sense = MINIMIZE
+    parallel_define = None
+    parallel_workers = None
+    presolve = False
+    scaling = False
+    symmetry_breaking = False
+    columnar_results = False
+    sparse_results = False
+    sparse_threshold = 0
+    time_limit = None
+    rel_gap = None
+    abs_gap = None
+    node_limit = None
+    # reuse the constraint objects and the flattened constraint tree of the first instance of the class, which
+    # saves flattening large trees again for every instance. The constraint objects are then shared by the instances
+    cache_constraints = False
     _flatten_constraints = True
+    # flattened constraint trees keyed by the problem class
+    _constraint_cache = weakref.WeakKeyDictionary()
 
     def __init__(self):
         """
@@ -31,57 +103,268 @@ class Problem:
         self.name = self.__class__.__name__ if self.name is None else self.name
         self.constraints = [] if self.constraints is None else self.constraints
         self.metrics = [] if self.metrics is None else self.metrics
-        self.variables_obj = self.variables()
-        self.variables_obj.define_variables()
-        self.vars = self.variables_obj.variables
-        self.objective_obj = self.objective()
+        self.init_definitions()
         self.model_built = False
         self.state = 0
         self.prob = None
+        self.presolved = None
+        self.scaled = None
+        self.symmetries = []
+        self.symmetry_rows = []
         self.status = None
+        self.sol_status = None
+        self.progress_callbacks = []
         self.result_variables = {}
         self.implemented_constraints = {}
         self.constraint_results = {}
         self.metrics_results = {}
-        self.constraint_objs = [c() for c in self.constraints]
-        if self._flatten_constraints:
-            self.flattened_constraints = self.flatten_constraints(self.constraint_objs)
+        self.constraint_duals = {}
+        self.constraint_slacks = {}
+        self.reduced_costs = {}
+        self.result_table = None
+        self.disabled_rows = OrderedDict()
+        self.constraint_children = OrderedDict()
+        self.constraint_parents = OrderedDict()
+        cached = self._constraint_cache.get(self.__class__) if self.cache_constraints else None
+        if cached is None:
+            self.constraint_objs = [c() for c in self.constraints]
+            if self._flatten_constraints:
+                self.flattened_constraints = self.flatten_constraints(self.constraint_objs)
+            else:
+                self.flattened_constraints = self.constraint_objs
+                for constraint_obj in self.constraint_objs:
+                    self.constraint_children[constraint_obj.name] = []
+                    self.constraint_parents[constraint_obj.name] = []
+            if self.cache_constraints:
+                self._constraint_cache[self.__class__] = (
+                    tuple(self.constraint_objs), tuple(self.flattened_constraints),
+                    tuple((name, tuple(names)) for name, names in self.constraint_children.items()),
+                    tuple((name, tuple(names)) for name, names in self.constraint_parents.items()))
         else:
-            self.flattened_constraints = self.constraint_objs
+            constraint_objs, flattened_constraints, constraint_children, constraint_parents = cached
+            self.constraint_objs = list(constraint_objs)
+            self.flattened_constraints = list(flattened_constraints)
+            self.constraint_children = OrderedDict((name, list(names)) for name, names in constraint_children)
+            self.constraint_parents = OrderedDict((name, list(names)) for name, names in constraint_parents)
+
+    def init_definitions(self):
+        """
+        Instantiates the variable manager and the objective, and defines the variables. Also creates the cache of the
+        evaluated constraint expressions, keyed by the constraint name. Subproblems override this to share the
+        definitions of their parent problem.
+        """
+        self.variables_obj = self.variables()
+        self.variables_obj.define_variables()
+        self.vars = self.variables_obj.variables
+        self.objective_obj = self.objective()
+        self.constraint_specs = {}
 
     def flatten_constraints(self, constraint_objs):
         """
-        Recursively look into the constraints' dependents to create a flattened list of constraints to implement.
+        Walk through the constraints' dependents to create a flattened list of constraints to implement. The walk is
+        iterative, so deep dependency trees don't hit the recursion limit. A dependent constraint class shared by
+        several constraints is only instantiated and implemented once. The parent/child relationships are recorded
+        by name in constraint_children and constraint_parents.
+
         :list<constraint> constraint_objs: List of initialized constraint objects
         :return: the list of all constraints that need to be implemented for the model
         """
         flat_constraints = []
+        instances = OrderedDict()
         for constraint_obj in constraint_objs:
+            instances.setdefault(constraint_obj.__class__, constraint_obj)
+        visited = set()
+
+        def visit(constraint_obj):
+            visited.add(constraint_obj.__class__)
             flat_constraints.append(constraint_obj)
-            dependent_objs = [c() for c in constraint_obj.dependent_constraints]
-            flat_constraints.extend(self.flatten_constraints(dependent_objs))
+            self.constraint_children.setdefault(constraint_obj.name, [])
+            self.constraint_parents.setdefault(constraint_obj.name, [])
+
+        for root in constraint_objs:
+            root = instances[root.__class__]
+            if root.__class__ in visited:
+                continue
+            visit(root)
+            path = [root.__class__]
+            stack = [(root, iter(root.dependent_constraints))]
+            while stack:
+                parent, dependents = stack[-1]
+                dependent = next(dependents, None)
+                if dependent is None:
+                    stack.pop()
+                    path.pop()
+                    continue
+                if dependent in path:
+                    cycle = path[path.index(dependent):] + [dependent]
+                    raise ValueError('Cyclic constraint dependency: %s' % ' -> '.join(c.__name__ for c in cycle))
+                if dependent not in instances:
+                    instances[dependent] = dependent()
+                dependent_obj = instances[dependent]
+                self.constraint_children[parent.name].append(dependent_obj.name)
+                self.constraint_parents.setdefault(dependent_obj.name, []).append(parent.name)
+                if dependent in visited:
+                    continue
+                visit(dependent_obj)
+                path.append(dependent)
+                stack.append((dependent_obj, iter(dependent_obj.dependent_constraints)))
         return flat_constraints
 
+    def get_constraint_descendants(self, constraint_name):
+        """
+        Looks up all the constraints that depend on the given constraint, directly or not, using the recorded
+        constraint hierarchy.
+        :string constraint_name: the name of the constraint
+        :returns list<string>: the names of the descendants in the flattened order
+        """
+        descendants = []
+        seen = {constraint_name}
+        stack = list(reversed(self.constraint_children.get(constraint_name, [])))
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            descendants.append(name)
+            stack.extend(reversed(self.constraint_children.get(name, [])))
+        return descendants
+
+    def get_constraint_rows(self, constraint_name, key=None):
+        """
+        Looks up the implemented rows of a constraint.
+        :string constraint_name: the name of the constraint
+        :object key: the key of a single row of a constraint family, all the rows are returned if it is None
+        :returns list<tuple>: ((constraint name, row key), row) pairs, the row key being None for a single row
+        """
+        constr_expr = self.implemented_constraints.get(constraint_name)
+        if constr_expr is None or constr_expr is True:
+            return []
+        if not is_constraint_group(constr_expr):
+            return [((constraint_name, None), constr_expr)]
+        if key is not None:
+            return [((constraint_name, key), constr_expr[key])]
+        return [((constraint_name, row_key), row) for row_key, row in constr_expr.items()]
+
+    def disable_constraint(self, constraint_name, key=None, dependents=True):
+        """
+        Turns a constraint off in the built model, so the problem can be re-solved without it. The rows are not
+        removed, their bounds are relaxed to infinity instead, which the solver treats as free rows. The original
+        bounds are kept in disabled_rows until the constraint is enabled again.
+
+        :string constraint_name: the name of the constraint
+        :object key: the key of a single row of a constraint family to disable, all the rows are disabled if it is
+        None
+        :boolean dependents: whether to disable the dependent constraints as well
+        """
+        if constraint_name not in self.constraint_children and constraint_name not in self.implemented_constraints:
+            raise KeyError('Unknown constraint: %s' % constraint_name)
+        self.build_model()
+        names = [constraint_name]
+        if dependents and key is None:
+            names.extend(self.get_constraint_descendants(constraint_name))
+        for name in names:
+            for row_id, row in self.get_constraint_rows(name, key):
+                if row_id in self.disabled_rows:
+                    continue
+                self.disabled_rows[row_id] = (row.sense, row.constant)
+                if row.sense == pl.LpConstraintGE:
+                    row.changeRHS(-INFINITY)
+                else:
+                    row.sense = pl.LpConstraintLE
+                    row.changeRHS(INFINITY)
+
+    def enable_constraint(self, constraint_name, key=None, dependents=True):
+        """
+        Turns a constraint disabled with disable_constraint back on by restoring the original bounds of its rows.
+
+        :string constraint_name: the name of the constraint
+        :object key: the key of a single row of a constraint family to enable, all the rows are enabled if it is None
+        :boolean dependents: whether to enable the dependent constraints as well
+        """
+        if constraint_name not in self.constraint_children and constraint_name not in self.implemented_constraints:
+            raise KeyError('Unknown constraint: %s' % constraint_name)
+        names = [constraint_name]
+        if dependents and key is None:
+            names.extend(self.get_constraint_descendants(constraint_name))
+        for name in names:
+            for row_id, row in self.get_constraint_rows(name, key):
+                if row_id not in self.disabled_rows:
+                    continue
+                row.sense, constant = self.disabled_rows.pop(row_id)
+                row.changeRHS(-constant)
+
     def implement_constraint(self, prob, constraint):
         """
-        Implements the constraint and puts them into a context dictionary.
+        Implements the constraint and puts them into a context dictionary. A constraint that has already been
+        evaluated, by this problem or by the problem it is a subproblem of, isn't defined again.
 
         :LPProblem prob: The Pulp LPProblem instance
         :Constraint constraint: the constraint object to be implemented
         """
-        constraint_spec = call_with_required_args(constraint.define, self.vars)
+        if constraint.name in self.constraint_specs:
+            constraint_spec = self.constraint_specs[constraint.name]
+        else:
+            constraint_spec = _define_constraint(constraint, self.vars)
+        self.add_constraint_spec(prob, constraint, constraint_spec)
+
+    def add_constraint_spec(self, prob, constraint, constraint_spec):
+        """
+        Puts an already defined constraint expression into the model and the context dictionary.
+
+        :LPProblem prob: The Pulp LPProblem instance
+        :Constraint constraint: the constraint object the expression was defined by
+        :LPConstraint constraint_spec: the constraint expression returned by the define function, or the dictionary
+        of rows for a constraint family
+        """
+        self.constraint_specs[constraint.name] = constraint_spec
+        if constraint_spec is None:
+            return
+        self.implemented_constraints[constraint.name] = constraint_spec
+        if is_constraint_group(constraint_spec):
+            for key, row in constraint_spec.items():
+                add_family_row(prob, constraint.name, key, row)
+        elif constraint_spec is not True:
+            prob += constraint_spec, constraint.name
 
-        if constraint_spec is not None:
-            self.implemented_constraints[constraint.name] = constraint_spec
-            prob += constraint_spec
+    def define_constraints_parallel(self, constraints):
+        """
+        Calls the define function of the constraints concurrently. With THREAD, the define functions are run in a
+        thread pool, which suits constraints that spend their time loading data. With PROCESS, the define functions
+        are run in a process pool and the constraints are sent back as serialized coefficient blocks, which suits
+        CPU-bound constraints. The constraint classes must then be picklable, i.e. defined at the module level.
+
+        :list<Constraint> constraints: the constraint objects to define
+        :returns list<LPConstraint>: the constraint expressions, in the same order as the constraints. Constraints
+        that have already been evaluated are taken from the cache rather than defined again.
+        """
+        assert self.parallel_define in (THREAD, PROCESS), 'parallel_define must be THREAD or PROCESS'
+        pending = [c for c in constraints if c.name not in self.constraint_specs]
+        if self.parallel_define == THREAD:
+            with ThreadPoolExecutor(max_workers=self.parallel_workers) as executor:
+                specs = list(executor.map(lambda c: _define_constraint(c, self.vars), pending))
+        else:
+            var_lookup = {var.name: var for var in iterate_variables(self.vars)}
+            with ProcessPoolExecutor(max_workers=self.parallel_workers, initializer=_init_define_worker,
+                                     initargs=(self.vars,)) as executor:
+                blocks = list(executor.map(_define_serialized, pending))
+            specs = [deserialize_constraint(block, var_lookup) for block in blocks]
+        defined = dict(zip((c.name for c in pending), specs))
+        return [defined[c.name] if c.name in defined else self.constraint_specs[c.name] for c in constraints]
 
     def implement_constraints(self, prob):
         """
-        Implement all the constraints required for the model.
+        Implement all the constraints required for the model. If parallel_define is set, the define functions are
+        evaluated concurrently first, and the results are then added to the model in the declaration order so that
+        the model is the same as the sequentially built one.
         :LPProblem prob: the Pulp LPProblem instance
         """
-        for constraint in self.flattened_constraints:
-            self.implement_constraint(prob, constraint)
+        if self.parallel_define is None:
+            for constraint in self.flattened_constraints:
+                self.implement_constraint(prob, constraint)
+            return
+        constraint_specs = self.define_constraints_parallel(self.flattened_constraints)
+        for constraint, constraint_spec in zip(self.flattened_constraints, constraint_specs):
+            self.add_constraint_spec(prob, constraint, constraint_spec)
 
     def implement_objective(self, prob):
         """
@@ -90,18 +373,31 @@ class Problem:
         """
         prob += call_with_required_args(self.objective_obj.define, self.vars)
 
-    def build_model(self):
+    def build_model(self, parallel=None, max_workers=None):
         """
-        Checks if the model has been built, and if negative, build the LPProblem model.
+        Checks if the model has been built, and if negative, build the LPProblem model. If symmetry_breaking is set,
+        the interchangeable columns of the variable groups are ordered by additional rows, see SymmetryFinder. If
+        scaling is set, the scaling factors of the model are computed as well, see ScaledProblem.
+        :constant parallel: THREAD or PROCESS to define the constraints concurrently, overrides parallel_define
+        :int max_workers: the number of workers to define the constraints with, overrides parallel_workers
         :return:
         """
         if self.model_built:
             return
+        if parallel is not None:
+            self.parallel_define = parallel
+        if max_workers is not None:
+            self.parallel_workers = max_workers
         pl_sense = pl.LpMaximize if self.sense == MAXIMIZE else pl.LpMinimize
         prob = pl.LpProblem(self.name, pl_sense)
         self.implement_constraints(prob)
         self.implement_objective(prob)
         self.prob = prob
+        if self.symmetry_breaking:
+            self.symmetries = find_symmetries(prob, self.vars)
+            self.symmetry_rows = add_symmetry_breaking(prob, self.symmetries)
+        if self.scaling:
+            self.scaled = scale_problem(prob)
         self.model_built = True
 
     def get_pulp_problem(self):
@@ -112,17 +408,142 @@ class Problem:
             self.build_model()
         return self.prob
 
+    def find_symmetries(self):
+        """
+        Builds the model and finds the interchangeable values of the keys of the variable groups, without breaking
+        the symmetry. If symmetry_breaking is set, the symmetries were already broken when the model was built, and
+        they are held in symmetries.
+        :returns list<SymmetryClass>: the symmetry classes
+        """
+        self.build_model()
+        return find_symmetries(self.prob, self.vars)
+
+    def get_model_statistics(self, dense_fraction=0.1):
+        """
+        Builds the model and analyzes its size and sparsity, see ModelStatistics. Use render on the result to print
+        the statistics.
+        :float dense_fraction: the fraction of the rows a column has to appear in to be listed as dense
+        :returns ModelStatistics: the statistics of the model
+        """
+        return ModelStatistics(self, dense_fraction)
+
+    def get_model_layout(self):
+        """
+        Describes which rows of the model belong to which constraint, by the names of the rows, so that the
+        implemented constraints can be restored when the model is loaded back, including the rows that were added
+        after the model was built.
+        :returns list<tuple>: (constraint name, rows) pairs. The rows are True for a constraint without a row, the
+        name of the row for a single row, and the list of (key, row name) pairs for a constraint family
+        """
+        layout = []
+        for constr_name, constr_expr in self.implemented_constraints.items():
+            if constr_expr is True:
+                layout.append((constr_name, True))
+            elif is_constraint_group(constr_expr):
+                layout.append((constr_name, [(key, row.name) for key, row in constr_expr.items()]))
+            else:
+                layout.append((constr_name, constr_expr.name))
+        return layout
+
+    def set_model(self, prob, layout):
+        """
+        Uses an already built model as the model of the problem, restoring the implemented constraints from the
+        rows of the model according to the layout created by get_model_layout. The model is scaled if scaling is set,
+        as it is when it is built.
+        :LPProblem prob: the model, built over the variables of this problem
+        :list<tuple> layout: the model layout
+        """
+        rows = {row.name: row for row in get_model_rows(prob)}
+        self.implemented_constraints = {}
+        for constr_name, row_names in layout:
+            if row_names is True:
+                self.implemented_constraints[constr_name] = True
+            elif isinstance(row_names, str):
+                self.implemented_constraints[constr_name] = rows[row_names]
+            else:
+                self.implemented_constraints[constr_name] = OrderedDict((key, rows[name]) for key, name in row_names)
+        self.prob = prob
+        if self.scaling:
+            self.scaled = scale_problem(prob)
+        self.model_built = True
+
+    def save_model(self, path):
+        """
+        Builds the model and writes it to a file in the binary model format, see serialization.save_model.
+        :string path: the path of the file
+        """
+        self.build_model()
+        serialization.save_model(self.prob, path, self.get_model_layout())
+
+    def load_model(self, path):
+        """
+        Loads a model written by save_model instead of building it, so the constraints aren't defined again. The
+        file is memory mapped and the rows are bound to the variables of this problem.
+        :string path: the path of the file
+        """
+        var_lookup = {var.name: var for var in iterate_variables(self.vars)}
+        prob, _, layout = serialization.load_model(path, var_lookup)
+        self.set_model(prob, layout)
+
+    def share_model(self):
+        """
+        Builds the model and places it in shared memory, so other processes can load it with attach_model without
+        building it. The caller has to close and unlink the returned block once the other processes are done.
+        :returns SharedMemory: the shared memory block holding the model
+        """
+        self.build_model()
+        return serialization.share_model(self.prob, self.get_model_layout())
+
+    def attach_model(self, shared_name):
+        """
+        Loads a model placed in shared memory by share_model instead of building it.
+        :string shared_name: the name of the shared memory block
+        """
+        var_lookup = {var.name: var for var in iterate_variables(self.vars)}
+        prob, _, layout = serialization.attach_model(shared_name, var_lookup)
+        self.set_model(prob, layout)
+
     def read_result_var_group(self, var_name, pl_var):
         """
-        Take the resulting value of the VariableGroup variables and put them into the result dictionary.
+        Take the resulting value of the VariableGroup variables and put them into the result dictionary. Sparse
+        groups are read with read_sparse_var_group.
         :string var_name: name of the variable group
         :dictionary<LPVariable> pl_var: dictionary of the LPVariable in the group
         """
+        if self.is_sparse_group(var_name):
+            self.read_sparse_var_group(var_name, pl_var)
+            return
         result_dict = {}
         for key, var in pl_var.items():
             result_dict[key] = pl.value(var)
         self.result_variables[var_name] = result_dict
 
+    def is_sparse_group(self, var_name):
+        """
+        Checks whether the results of a variable group are read sparsely. sparse_results is either a boolean for all
+        the groups, or a collection of the names of the sparse groups.
+        :string var_name: name of the variable group
+        :returns boolean: True if only the nonzero values of the group are read
+        """
+        if isinstance(self.sparse_results, bool):
+            return self.sparse_results
+        return var_name in self.sparse_results
+
+    def read_sparse_var_group(self, var_name, pl_var):
+        """
+        Reads only the values of the variable group that are greater than sparse_threshold in absolute value into
+        a SparseValues dictionary, which returns zero for the other keys. Unknown values are left out as well.
+        :string var_name: name of the variable group
+        :dictionary<LPVariable> pl_var: dictionary of the LPVariable in the group
+        """
+        threshold = self.sparse_threshold
+        result_dict = SparseValues()
+        for key, var in pl_var.items():
+            value = var.varValue
+            if value is not None and abs(value) > threshold:
+                result_dict[key] = value
+        self.result_variables[var_name] = result_dict
+
     def read_result_variables(self):
         """
         Read the resulting variables values into the result dictionary. The structure mirrors the variable group
@@ -136,12 +557,48 @@ class Problem:
     def read_constraint_values(self):
         """
         Look through the constraints and calculates the resulting value of the constraints. The resulting values
-        are then put into the constraint results dictionary
+        are then put into the constraint results dictionary. The results of a constraint family are grouped in a
+        dictionary keyed by the row keys, mirroring the variable groups.
+        """
+        for constr_name, constr_expr in self.implemented_constraints.items():
+            if constr_expr is True:
+                continue
+            if is_constraint_group(constr_expr):
+                self.constraint_results[constr_name] = OrderedDict(
+                    (key, get_constraints_value(row)) for key, row in constr_expr.items()
+                )
+            else:
+                self.constraint_results[constr_name] = get_constraints_value(constr_expr)
+
+    def read_sensitivity(self):
         """
+        Collects the shadow prices and slacks of all the implemented constraints, and the reduced costs of all the
+        variables, in one pass over the model. The duals are keyed like constraint_results and the reduced costs like
+        result_variables. The values are only meaningful for LP problems: for MIP problems the solver reports the
+        values of the final LP relaxation. Values the solver didn't report are None. The reduced costs of sparse
+        groups are read into SparseValues dictionaries, which only hold the nonzero reduced costs.
+        """
+        self.constraint_duals = {}
+        self.constraint_slacks = {}
         for constr_name, constr_expr in self.implemented_constraints.items():
             if constr_expr is True:
                 continue
-            self.constraint_results[constr_name] = get_constraints_value(constr_expr)
+            if is_constraint_group(constr_expr):
+                self.constraint_duals[constr_name] = OrderedDict((key, row.pi) for key, row in constr_expr.items())
+                self.constraint_slacks[constr_name] = OrderedDict(
+                    (key, row.slack) for key, row in constr_expr.items()
+                )
+            else:
+                self.constraint_duals[constr_name] = constr_expr.pi
+                self.constraint_slacks[constr_name] = constr_expr.slack
+        self.reduced_costs = {}
+        for var_name, pl_var in self.vars.items():
+            if isinstance(pl_var, OrderedDict) and self.is_sparse_group(var_name):
+                self.reduced_costs[var_name] = SparseValues((key, var.dj) for key, var in pl_var.items() if var.dj)
+            elif isinstance(pl_var, OrderedDict):
+                self.reduced_costs[var_name] = {key: var.dj for key, var in pl_var.items()}
+            else:
+                self.reduced_costs[var_name] = pl_var.dj
 
     def read_metric_values(self):
         """
@@ -152,33 +609,588 @@ class Problem:
             metric_obj = metric()
             self.metrics_results[metric_obj.name] = call_with_required_args(metric_obj.define, self.result_variables)
 
-    def solve(self, solve_args=None):
+    def get_solve_args(self, solve_args=None, time_limit=None, rel_gap=None, abs_gap=None, node_limit=None):
+        """
+        Adds the termination limits to the solve arguments. The limits given here override the ones set on the
+        problem class. If any limit is set, the solver of the solve arguments, or the bundled CBC, is copied and the
+        limits are set on the copy, see apply_limits.
+
+        :dictionary solve_args: The arguments to pass into the solve function
+        :float time_limit: the maximum number of seconds to solve for
+        :float rel_gap: the relative gap between the incumbent and the bound to stop at
+        :float abs_gap: the absolute gap between the incumbent and the bound to stop at
+        :int node_limit: the maximum number of branch and bound nodes
+        :returns dictionary: the solve arguments with the limits
+        """
+        solve_args = {} if solve_args is None else solve_args
+        limits = [
+            self.time_limit if time_limit is None else time_limit,
+            self.rel_gap if rel_gap is None else rel_gap,
+            self.abs_gap if abs_gap is None else abs_gap,
+            self.node_limit if node_limit is None else node_limit
+        ]
+        if all(limit is None for limit in limits):
+            return solve_args
+        return dict(solve_args, solver=apply_limits(solve_args.get('solver'), *limits))
+
+    def get_status(self):
+        """
+        Describes the status of the last solve. A solve that was stopped by a limit with a solution, which isn't
+        proven to be optimal, is reported as Feasible.
+        :returns string: the PuLP status name, or Feasible
+        """
+        if self.status == pl.LpStatusOptimal and self.sol_status == pl.LpSolutionIntegerFeasible:
+            return FEASIBLE
+        return pl.LpStatus[self.status]
+
+    def solve(self, solve_args=None, time_limit=None, rel_gap=None, abs_gap=None, node_limit=None):
         """
         Builds the model and calls the LPProblem solve function. The result variables are then read into the result
-        data containers.
+        data containers. If the solve is stopped by a limit, the best solution found is read. If progress callbacks
+        are registered, the solver is run with solve_with_callbacks. If scaling is set, the scaled model is solved
+        and the solution is unscaled before it is read.
 
         :dictionary solve_args: The arguments to pass into the solve function for those who want to access specific
-        solvers or other low level API functions
+        solvers or other low level API functions. If presolve is set, the model is reduced before it is solved.
+        :float time_limit: the maximum number of seconds to solve for, overrides the problem's time_limit
+        :float rel_gap: the relative gap to stop at, overrides the problem's rel_gap
+        :float abs_gap: the absolute gap to stop at, overrides the problem's abs_gap
+        :int node_limit: the maximum number of branch and bound nodes, overrides the problem's node_limit
 
-        :returns the status of the model after solve:
+        :returns the status of the model after solve, see get_status:
         """
-        if solve_args is None:
-            solve_args = {}
+        solve_args = self.get_solve_args(solve_args, time_limit, rel_gap, abs_gap, node_limit)
         self.build_model()
-        self.status = self.prob.solve(**solve_args)
+        model = self.prob if self.scaled is None else self.scaled.scale()
+        try:
+            if self.progress_callbacks:
+                self.status = self.solve_with_callbacks(solve_args, model)
+            elif self.presolve:
+                self.status = self.solve_presolved(solve_args, model)
+                self.sol_status = getattr(self.presolved.reduced, 'sol_status', None)
+            else:
+                self.status = model.solve(**solve_args)
+                self.sol_status = getattr(model, 'sol_status', None)
+        finally:
+            if model is not self.prob:
+                self.scaled.unscale()
+        self.read_results()
+        return self.get_status()
+
+    def solve_lazy(self, max_rounds=100, solve_args=None):
+        """
+        Solves the problem with lazy constraint generation. After each solve, the separate function of every lazy
+        constraint is called with the result variables, the violated rows are added to the built model, and the
+        model is re-solved, until no more rows are violated. The model only ever holds the rows that were needed.
+
+        :int max_rounds: the maximum number of solves
+        :dictionary solve_args: The arguments to pass into the solve function
+        :returns the status of the model after the last solve, see get_status. If the rounds run out while the last
+        solution still violates lazy rows, the model is left with the status Not Solved:
+        """
+        self.build_model()
+        lazy_constraints = [c for c in self.flattened_constraints if isinstance(c, LazyConstraint)]
+        for _ in range(max_rounds):
+            status = self.solve(solve_args)
+            if self.status != pl.LpStatusOptimal or not self.add_violated_rows(lazy_constraints):
+                return status
+        self.status = pl.LpStatusNotSolved
+        self.sol_status = None
+        return self.get_status()
+
+    def add_violated_rows(self, lazy_constraints):
+        """
+        Adds the rows of the lazy constraints that the current solution violates to the built model. The row key is
+        passed to define_row as the key argument, so no variable can be named key.
+        :list<LazyConstraint> lazy_constraints: the lazy constraint objects
+        :returns int: the number of rows added
+        """
+        assert not lazy_constraints or 'key' not in self.vars, \
+            "a variable named 'key' clashes with the row key argument of LazyConstraint.define_row"
+        added = 0
+        for constraint in lazy_constraints:
+            rows = self.implemented_constraints.setdefault(constraint.name, OrderedDict())
+            for key in call_with_required_args(constraint.separate, self.get_results(VARIABLE)):
+                if key in rows:
+                    continue
+                row = call_with_required_args(constraint.define_row, dict(self.vars, key=key))
+                if row is True or row is None:
+                    continue
+                rows[key] = row
+                add_family_row(self.prob, constraint.name, key, row)
+                added += 1
+        return added
+
+    def read_result_table(self):
+        """
+        Reads the values of the variables, the constraints and the metrics into a ResultTable, straight from the
+        model and without building the result dictionaries. The result dictionary is only built temporarily if the
+        problem has metrics, since they are defined over it.
+        :returns ResultTable: the results
+        """
+        table = ResultTable()
+        for var_name, pl_var in self.vars.items():
+            if isinstance(pl_var, dict):
+                table.add_group(VARIABLE, var_name, list(pl_var), (var.varValue for var in pl_var.values()))
+            else:
+                table.add_group(VARIABLE, var_name, None, [pl_var.varValue])
+        for constr_name, constr_expr in self.implemented_constraints.items():
+            if constr_expr is True:
+                continue
+            if is_constraint_group(constr_expr):
+                table.add_group(CONSTRAINT, constr_name, list(constr_expr),
+                                (get_constraints_value(row) for row in constr_expr.values()))
+            else:
+                table.add_group(CONSTRAINT, constr_name, None, [get_constraints_value(constr_expr)])
+        if self.metrics:
+            result_variables = table.to_dict(VARIABLE)
+            for metric in self.metrics:
+                metric_obj = metric()
+                table.add_group(METRIC, metric_obj.name, None,
+                                [call_with_required_args(metric_obj.define, result_variables)])
+        return table
+
+    def export_results(self, path, batch_size=65536):
+        """
+        Writes the results of the last solve to a CSV, Parquet or Arrow file, see ResultTable.write. The Parquet and
+        Arrow formats require pyarrow.
+        :string path: the path of the file, its extension selects the format
+        :int batch_size: the maximum number of rows written at a time
+        """
+        table = self.result_table if self.result_table is not None else self.read_result_table()
+        table.write(path, batch_size)
+
+    def read_results(self):
+        """
+        Read the variables, constraints, sensitivity and metrics values into the result data containers after a
+        solve. If columnar_results is set, the results are only read into result_table instead.
+        """
+        if self.columnar_results:
+            self.result_table = self.read_result_table()
+            return
         self.read_result_variables()
         self.read_constraint_values()
+        self.read_sensitivity()
         self.read_metric_values()
-        return pl.LpStatus[self.status]
+
+    def get_results(self, section):
+        """
+        Looks up the results of a section as nested dictionaries. If columnar_results is set, the dictionaries are
+        built from result_table, since the solve doesn't fill in the result data containers.
+        :string section: VARIABLE, CONSTRAINT or METRIC
+        :returns dictionary: result_variables, constraint_results or metrics_results, or the equivalent dictionary
+        """
+        if self.columnar_results and self.result_table is not None:
+            return self.result_table.to_dict(section)
+        return {VARIABLE: self.result_variables, CONSTRAINT: self.constraint_results,
+                METRIC: self.metrics_results}[section]
+
+    def add_progress_callback(self, callback):
+        """
+        Registers a function to be called with the progress of the solver during solve. The callback is called with
+        a ProgressEvent every time the solver log reports progress. If it returns True, the solver is interrupted,
+        and the solve finishes with the best solution found so far.
+
+        :function callback: the callback
+        """
+        self.progress_callbacks.append(callback)
+
+    def remove_progress_callback(self, callback):
+        """
+        Unregisters a progress callback registered with add_progress_callback.
+        :function callback: the callback
+        """
+        self.progress_callbacks.remove(callback)
+
+    def emit_progress(self, event):
+        """
+        Calls all the progress callbacks with a progress event.
+        :ProgressEvent event: the progress event
+        :returns boolean: True if any of the callbacks asked to stop the solve
+        """
+        stop = False
+        for callback in self.progress_callbacks:
+            stop = bool(callback(event)) or stop
+        return stop
+
+    def solve_with_callbacks(self, solve_args, model=None):
+        """
+        Runs CBC on the built model, reading its log as it is written and passing the progress events to the
+        progress callbacks. When a callback asks to stop, the solver is sent an interrupt, after which it stops and
+        writes out the best solution found. The model is reduced first if presolve is set.
+
+        :dictionary solve_args: The arguments of the solve. Only the solver argument is supported, and it must be a
+        PuLP CBC command solver.
+        :LPProblem model: the model to solve, defaults to the built model
+        :returns the PuLP status of the model after solve:
+        """
+        check_log_solve_args(solve_args)
+        original = self.prob if model is None else model
+        model = original
+        if self.presolve:
+            self.presolved = presolve_problem(original)
+            model = self.presolved.reduced
+            status = self.presolved.settle()
+            if status is not None:
+                self.sol_status = model.sol_status
+                self.presolved.postsolve()
+                return status
+        try:
+            status = CbcProcess(model, solve_args.get('solver'), self.sense == MAXIMIZE).run(self.emit_progress)
+            self.sol_status = getattr(model, 'sol_status', None)
+            return status
+        finally:
+            if model is not original:
+                self.presolved.postsolve()
+
+    async def solve_progress(self, solve_args=None, timeout=None, executor=None):
+        """
+        Solves the model without blocking the event loop, yielding the progress of the solver as it runs. The model
+        is built in an executor, and the solver is run and its log followed in an executor thread. If the iteration
+        is cancelled or times out, the solver process is killed.
+
+        async for event in prob.solve_progress(timeout=60):
+            print(event.incumbent, event.bound)
+
+        :dictionary solve_args: The arguments of the solve. Only the solver argument is supported, and it must be a
+        PuLP CBC command solver. The termination limits set on the problem are applied to it.
+        :float timeout: the number of seconds after which the solve is aborted with asyncio.TimeoutError
+        :Executor executor: the thread pool executor to build the model, run the solver and read the results in,
+        defaults to the loop's default
+        :returns async generator<ProgressEvent>: the progress events parsed from the solver log
+        """
+        solve_args = self.get_solve_args(solve_args)
+        check_log_solve_args(solve_args)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        await loop.run_in_executor(executor, self.build_model)
+        original = self.prob if self.scaled is None else self.scaled.scale()
+        model = original
+        if self.presolve:
+            self.presolved = await loop.run_in_executor(executor, presolve_problem, original)
+            model = self.presolved.reduced
+            if self.presolved.settle() is not None:
+                self.status, self.sol_status = model.status, model.sol_status
+                self.presolved.postsolve()
+                if original is not self.prob:
+                    self.scaled.unscale()
+                await loop.run_in_executor(executor, self.read_results)
+                return
+        cbc = CbcProcess(model, solve_args.get('solver'), self.sense == MAXIMIZE)
+        events = asyncio.Queue()
+        run = None
+
+        def queue_event(event):
+            # returns None, a true value would ask the solver to stop
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        try:
+            run = loop.run_in_executor(executor, cbc.run, queue_event)
+            # the events are queued from the executor thread ahead of the end of the run
+            run.add_done_callback(lambda _: events.put_nowait(None))
+            while True:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                event = await asyncio.wait_for(events.get(), remaining)
+                if event is None:
+                    break
+                yield event
+            self.status = await run
+            self.sol_status = getattr(model, 'sol_status', None)
+        except BaseException:
+            cbc.kill()
+            if run is not None:
+                await asyncio.gather(run, return_exceptions=True)
+            raise
+        finally:
+            if model is not original:
+                self.presolved.postsolve()
+            if original is not self.prob:
+                self.scaled.unscale()
+        await loop.run_in_executor(executor, self.read_results)
+
+    async def solve_async(self, solve_args=None, timeout=None, executor=None):
+        """
+        Builds and solves the model without blocking the event loop, see solve_progress.
+
+        :dictionary solve_args: The arguments of the solve, see solve_progress
+        :float timeout: the number of seconds after which the solve is aborted with asyncio.TimeoutError
+        :Executor executor: the executor to build the model and read the results in
+        :returns the status of the model after solve:
+        """
+        async for _ in self.solve_progress(solve_args, timeout, executor):
+            pass
+        return self.get_status()
+
+    def solve_presolved(self, solve_args, model=None):
+        """
+        Reduces the built model with the HorusLP presolve, solves the reduced model and maps the solution back onto
+        the original variables, so the results are read the same way as without presolve. The presolve statistics
+        are available from presolved.stats afterwards.
+
+        :dictionary solve_args: The arguments to pass into the solve function
+        :LPProblem model: the model to reduce, defaults to the built model
+        :returns the PuLP status of the reduced model after solve:
+        """
+        self.presolved = presolve_problem(self.prob if model is None else model)
+        try:
+            return self.presolved.solve(solve_args)
+        finally:
+            self.presolved.postsolve()
+
+    def solve_parametric(self, set_parameter, read_slope, lower, upper, solve_args=None):
+        """
+        Traces the optimal objective value of the built LP model as a function of a single parameter, re-solving the
+        same model for the parameter values chosen by piecewise_linear_curve.
+
+        :function set_parameter: called with a parameter value, sets it in the model
+        :function read_slope: called after a solve, returns the derivative of the objective value by the parameter
+        :float lower: the lower end of the parameter range
+        :float upper: the upper end of the parameter range
+        :dictionary solve_args: the arguments to pass into the PuLP solve function
+        :returns list<tuple>: the (parameter, objective value) breakpoints of the curve
+        """
+        solve_args = {} if solve_args is None else solve_args
+        self.build_model()
+        assert not self.prob.isMIP(), 'parametric analysis is only supported for LP problems'
+
+        def evaluate(param):
+            set_parameter(param)
+            status = self.prob.solve(**solve_args)
+            if status != pl.LpStatusOptimal:
+                raise ValueError('The problem is %s at the parameter value %s' % (pl.LpStatus[status], param))
+            return pl.value(self.prob.objective), read_slope()
+
+        return piecewise_linear_curve(evaluate, lower, upper)
+
+    def parametric_rhs(self, constraint_name, lower, upper, key=None, solve_args=None):
+        """
+        Computes the optimal objective value as a function of the right hand side of a constraint, for example a
+        capacity, using the shadow price of the row as the slope. The original right hand side is restored
+        afterwards. The result containers are not updated, but the variables hold the solution of the last re-solve.
+
+        :string constraint_name: the name of the constraint
+        :float lower: the lower end of the right hand side range
+        :float upper: the upper end of the right hand side range
+        :object key: the key of the row if the constraint is a constraint family
+        :dictionary solve_args: the arguments to pass into the PuLP solve function
+        :returns list<tuple>: the (right hand side, objective value) breakpoints, the objective value being linear in
+        between
+        """
+        self.build_model()
+        rows = self.get_constraint_rows(constraint_name, key)
+        assert len(rows) == 1, 'the constraint must have a single row, pass the key of a constraint family row'
+        row = rows[0][1]
+        constant = row.constant
+        try:
+            return self.solve_parametric(lambda rhs: row.changeRHS(rhs), lambda: row.pi, lower, upper, solve_args)
+        finally:
+            row.changeRHS(-constant)
+
+    def parametric_cost(self, variable_name, lower, upper, key=None, solve_args=None):
+        """
+        Computes the optimal objective value as a function of the objective coefficient of a variable, using the
+        value of the variable as the slope. The original coefficient is restored afterwards. The result containers
+        are not updated, but the variables hold the solution of the last re-solve.
+
+        :string variable_name: the name of the variable, or of the variable group
+        :float lower: the lower end of the coefficient range
+        :float upper: the upper end of the coefficient range
+        :object key: the key of the variable if it is in a variable group
+        :dictionary solve_args: the arguments to pass into the PuLP solve function
+        :returns list<tuple>: the (coefficient, objective value) breakpoints, the objective value being linear in
+        between
+        """
+        self.build_model()
+        var = self.vars[variable_name] if key is None else self.vars[variable_name][key]
+        objective = self.prob.objective
+        in_objective = var in objective
+        coef = objective.get(var, 0)
+
+        def set_coef(value):
+            objective[var] = value
+
+        try:
+            return self.solve_parametric(set_coef, lambda: var.varValue, lower, upper, solve_args)
+        finally:
+            if in_objective:
+                objective[var] = coef
+            else:
+                del objective[var]
+
+    def solve_pool(self, k, solve_args=None):
+        """
+        Collects up to k distinct solutions, best first. After each solve, a no-good cut that excludes the binary
+        part of the solution is added to the built model and the model is re-solved. The cuts are removed
+        afterwards, and the best solution is read into the result data containers. Solutions are told apart by
+        their binary variables only.
+
+        :int k: the number of solutions to collect
+        :dictionary solve_args: The arguments to pass into the PuLP solve function
+        :returns SolutionPool: the solutions and their objective values, fewer than k if the model runs out of
+        solutions
+        """
+        solve_args = {} if solve_args is None else solve_args
+        self.build_model()
+        variable_keys = []
+        variables = []
+        for var_name, pl_var in self.vars.items():
+            if isinstance(pl_var, dict):
+                for key, var in pl_var.items():
+                    variable_keys.append((var_name, key))
+                    variables.append(var)
+            else:
+                variable_keys.append((var_name, None))
+                variables.append(pl_var)
+        # only the binaries in the model get values, the ones that are declared but unused are left out
+        binaries = [var for var in self.prob.variables()
+                    if var.cat == pl.LpInteger and var.lowBound == 0 and var.upBound == 1]
+        assert binaries, 'the solution pool needs binary variables to tell the solutions apart'
+        pool = SolutionPool(variable_keys)
+        cuts = []
+        status = None
+        sol_status = None
+        try:
+            while len(pool) < k:
+                status = self.prob.solve(**solve_args)
+                self.sol_status = getattr(self.prob, 'sol_status', None)
+                if status != pl.LpStatusOptimal:
+                    break
+                if not len(pool):
+                    sol_status = self.sol_status
+                pool.add([var.varValue for var in variables], pl.value(self.prob.objective))
+                cut_name = '_solution_pool_cut_%d' % len(cuts)
+                self.prob += pl.lpSum(1 - var if var.varValue > 0.5 else var for var in binaries) >= 1, cut_name
+                cuts.append(cut_name)
+        finally:
+            for cut_name in cuts:
+                remove_model_row(self.prob, cut_name)
+        if len(pool) == 0:
+            self.status = status
+            return pool
+        for var, value in zip(variables, pool.values[0]):
+            var.varValue = None if math.isnan(value) else value
+        self.status = pl.LpStatusOptimal
+        self.sol_status = sol_status
+        self.read_results()
+        return pool
+
+    def solve_lagrangian(self, iterations=50, step=2.0, pool=None, solve_args=None, tolerance=1e-6):
+        """
+        Solves a block-structured problem with Lagrangian relaxation, see LagrangianRelaxation. The constraints are
+        tagged with the block they are local to with their block attribute, the untagged constraints link the blocks.
+        The best primal solution found, if any, is read into the result data containers. The status is Optimal if
+        the gap between the bounds was closed, Not Solved otherwise.
+
+        :int iterations: the maximum number of subgradient iterations
+        :float step: the initial step factor
+        :SolverPool pool: the solver pool to solve the block subproblems in parallel with
+        :dictionary solve_args: the arguments to pass into the PuLP solve function for the block subproblems
+        :float tolerance: the tolerance on the linking constraints and on the gap between the bounds
+        :returns LagrangianRelaxation: the relaxation holding the bounds, multipliers and the iteration log
+        """
+        relaxation = LagrangianRelaxation(self, pool, solve_args, tolerance)
+        relaxation.run(iterations, step)
+        gap = relaxation.gap()
+        self.status = pl.LpStatusOptimal if gap is not None and gap <= tolerance else pl.LpStatusNotSolved
+        if relaxation.solution is not None:
+            for var, value in relaxation.solution.items():
+                var.varValue = value
+            self.read_results()
+        return relaxation
+
+    def add_column(self, column):
+        """
+        Adds a new variable to a variable group of the built model, without rebuilding it. The variable is added to
+        the objective and to the rows it has coefficients in, and it is read into the results like the other
+        variables of the group.
+
+        :Column column: the column to add
+        :returns LpVariable: the new variable
+        """
+        self.build_model()
+        group = self.vars.get(column.group_name)
+        assert isinstance(group, dict), 'columns can only be added to variable groups'
+        assert column.key not in group, 'the variable group already has the key %s' % (column.key,)
+        var = pl.LpVariable('%s[%s]' % (column.group_name, column.key), column.lb, column.ub,
+                            PULP_TYPES[column.var_type])
+        group[column.key] = var
+        self.prob.objective.addInPlace(column.cost * var)
+        for row_name, coef in column.coefficients.items():
+            name, key = row_name if isinstance(row_name, tuple) else (row_name, None)
+            for row_id, row in self.get_constraint_rows(name, key):
+                row.addInPlace(coef * var)
+        return var
+
+    def generate_columns(self, pricing, max_iterations=100, solve_args=None):
+        """
+        Runs column generation on the built model, which serves as the restricted master problem. The LP relaxation
+        of the model is solved, and the pricing function is called with the results to propose new columns, until
+        it proposes none. The pricing function is called with the arguments it requires out of duals (the
+        constraint_duals), reduced_costs, result_variables and problem, and returns a list of Column objects.
+
+        The integrality of the variables is restored afterwards, so calling solve then solves the integer master
+        problem over all the generated columns.
+
+        :function pricing: the pricing function
+        :int max_iterations: the maximum number of times the master problem is solved
+        :dictionary solve_args: The arguments to pass into the PuLP solve function
+        :returns list<OrderedDict>: the iteration log, with the objective value of the master problem and the number
+        of columns added in every iteration
+        """
+        solve_args = {} if solve_args is None else solve_args
+        self.build_model()
+        relaxed = []
+
+        def relax(var):
+            if var.cat != pl.LpContinuous:
+                relaxed.append((var, var.cat))
+                var.cat = pl.LpContinuous
+
+        for var in self.prob.variables():
+            relax(var)
+        log = []
+        try:
+            for iteration in range(max_iterations):
+                self.status = self.prob.solve(**solve_args)
+                if self.status != pl.LpStatusOptimal:
+                    raise ValueError('The restricted master problem is %s' % pl.LpStatus[self.status])
+                self.read_results()
+                if self.columnar_results:
+                    # the result table doesn't hold the duals and reduced costs the pricing needs
+                    self.read_sensitivity()
+                columns = call_with_required_args(pricing, {
+                    'duals': self.constraint_duals,
+                    'reduced_costs': self.reduced_costs,
+                    'result_variables': self.get_results(VARIABLE),
+                    'problem': self
+                })
+                log.append(OrderedDict([
+                    ('iteration', iteration),
+                    ('objective', pl.value(self.prob.objective)),
+                    ('columns', len(columns))
+                ]))
+                if not columns:
+                    break
+                for column in columns:
+                    relax(self.add_column(column))
+        finally:
+            for var, cat in relaxed:
+                var.cat = cat
+        return log
 
     def build_subproblem(self, constraint_subset, flatten):
         """
-        Builds a subproblem for to support searching for the constraint subset that is infeasible
+        Builds a subproblem for to support searching for the constraint subset that is infeasible. The subproblem is
+        a view of this problem: it shares the variables, the objective and the evaluated constraint expressions, and
+        only selects which of the rows go into its model. Solving the subproblem therefore writes its solution into
+        the shared variables.
+
         :tuple<Constraint> constraint_subset: the subset of constraints to build the subproblem out of
         :boolean flatten: whether to flatten the constraints
         :returns SubProblem, tuple<string>: the defined subproblem and the list of constraint names
         """
         constr_names = tuple(constr.name for constr in constraint_subset)
+        parent = self
 
         class SubProblem(Problem):
             variables = self.variables
@@ -186,8 +1198,15 @@ class Problem:
             sense = self.sense
             objective = self.objective
             name = '%s[%s]' % (self.__class__.__name__, str(constr_names))
+            scaling = self.scaling
             _flatten_constraints = flatten
 
+            def init_definitions(self):
+                self.variables_obj = parent.variables_obj
+                self.vars = parent.vars
+                self.objective_obj = parent.objective_obj
+                self.constraint_specs = parent.constraint_specs
+
         sub_prob = SubProblem()
         return sub_prob, constr_names
 
@@ -250,73 +1269,86 @@ class Problem:
             return None
         return sorted(infeasible_subsets, key=lambda x: len(x))[0]
 
-    def print_result_variables(self):
+    def print_result_variables(self, report=None):
         """
         Print all the result variable by name
+        :Report report: the report to render into, a new report written to stdout is used if it is None
         """
-        for var_name, pl_var in self.result_variables.items():
-            if isinstance(pl_var, dict):
-                for var_subscript, var_val in pl_var.items():
-                    print('%s[%s]' % (var_name, var_subscript), var_val)
-            else:
-                print(var_name, pl_var)
+        with report or Report() as report:
+            report.add_values(self.get_results(VARIABLE), '%s %s')
 
-    def print_result_objectives(self):
+    def print_result_objectives(self, report=None):
         """
         Print the objectives to stdout. If the objective is a CombinedObjective, print the value and weights for the
         combined objectives as well.
+        :Report report: the report to render into, a new report written to stdout is used if it is None
         """
-        print("%s: %.2f" % (self.objective_obj.name,
-                            call_with_required_args(self.objective_obj.define, self.result_variables)))
-        if isinstance(self.objective_obj, CombinedObjective):
-            for objective_component_class, weight in self.objective_obj.objectives:
-                print("%s: %.2f * %d" % (
-                    objective_component_class.__name__,
-                    call_with_required_args(objective_component_class().define, self.result_variables),
-                    weight
-                ))
+        result_variables = self.get_results(VARIABLE)
+        with report or Report() as report:
+            report.line("%s: %.2f" % (self.objective_obj.name,
+                                      call_with_required_args(self.objective_obj.define, result_variables)))
+            if isinstance(self.objective_obj, CombinedObjective):
+                for objective_component_class, weight in self.objective_obj.objectives:
+                    report.line("%s: %.2f * %d" % (
+                        objective_component_class.__name__,
+                        call_with_required_args(objective_component_class().define, result_variables),
+                        weight
+                    ))
 
-    def print_result_constraints(self):
+    def print_result_constraints(self, report=None):
         """
         Print the resulting value and name of all the constraints
+        :Report report: the report to render into, a new report written to stdout is used if it is None
         """
-        for constr_name, constr_val in self.constraint_results.items():
-            print('%s: %.2f' % (constr_name, constr_val))
+        with report or Report() as report:
+            report.add_values(self.get_results(CONSTRAINT), '%s: %.2f')
 
-    def print_result_metrics(self):
+    def print_result_metrics(self, report=None):
         """
         Print the name and resulting value of all the metrics.
+        :Report report: the report to render into, a new report written to stdout is used if it is None
         """
-        for metric_name, metric_value in self.metrics_results.items():
-            print("%s: %.2f" % (metric_name, metric_value))
+        with report or Report() as report:
+            for metric_name, metric_value in self.get_results(METRIC).items():
+                report.line("%s: %.2f" % (metric_name, metric_value))
 
-    def print_optimal_results(self):
+    def print_optimal_results(self, report=None):
         """
         Print all the results to stdout
+        :Report report: the report to render into, a new report written to stdout is used if it is None
         """
-        self.print_result_variables()
-        self.print_result_objectives()
-        self.print_result_constraints()
-        self.print_result_metrics()
+        with report or Report() as report:
+            self.print_result_variables(report)
+            self.print_result_objectives(report)
+            self.print_result_constraints(report)
+            self.print_result_metrics(report)
 
-    def print_infeasible_results(self, deep_infeasibility_search):
+    def print_infeasible_results(self, deep_infeasibility_search, report=None):
         """
         Finds and prints to stdout the smallest possible combination of constraints that causes infeasibility.
         :boolean deep_infeasibility_search: whether to flatten the constraints and perform a deep search
+        :Report report: the report to render into, a new report written to stdout is used if it is None
         """
-        print("Finding incompatible constraints...")
-        print("Incompatible Constraints:", self.find_incompatibility(flatten=deep_infeasibility_search))
+        with report or Report() as report:
+            report.line("Finding incompatible constraints...")
+            report.flush()
+            report.line("Incompatible Constraints:", self.find_incompatibility(flatten=deep_infeasibility_search))
 
-    def print_results(self, find_infeasible=False, deep_infeasibility_search=False):
+    def print_results(self, find_infeasible=False, deep_infeasibility_search=False, report=None, **report_options):
         """
         Checks if the results are infeasible or optimal. If the results are in infeasible, find the infeasibility.
-        If optimal, print the results. If other then just print the status.
+        If optimal or feasible, print the results. If other then just print the status. The output is rendered with a
+        Report and written out in bulk.
         :boolean find_infeasible:
         :boolean deep_infeasibility_search:
+        :Report report: the report to render into, a new report written to stdout is used if it is None
+        :dictionary report_options: the options of the new report, such as nonzero, top, groups, summary and stream,
+        see Report
         """
-        status = pl.LpStatus[self.status]
-        print('%s: %s' % (self.name, status))
-        if status == 'Optimal':
-            self.print_optimal_results()
-        elif status == 'Infeasible' and find_infeasible:
-            self.print_infeasible_results(deep_infeasibility_search)
+        status = self.get_status()
+        with report or Report(**report_options) as report:
+            report.line('%s: %s' % (self.name, status))
+            if status in ('Optimal', FEASIBLE):
+                self.print_optimal_results(report)
+            elif status == 'Infeasible' and find_infeasible:
+                self.print_infeasible_results(deep_infeasibility_search, report)
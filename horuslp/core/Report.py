@@ -0,0 +1,133 @@
+"""
+Rendering of the results of a problem into a text report. The lines are collected into a buffer and written out in
+bulk, rather than printed one at a time.
+"""
+import heapq
+import sys
+
+
+class Report:
+    """
+    Collects the lines of a report and writes them to a stream in one go. The report can be entered as a context
+    manager several times over, by the functions that render the separate sections, and it is only written out when
+    the outermost context is left.
+
+    The rows of the variable groups and constraint families can be filtered to the nonzero values, the top values by
+    magnitude, or to some of the groups. In summary mode, every group is reduced to a single row of a table with its
+    size and value statistics.
+    """
+
+    def __init__(self, stream=None, nonzero=False, top=None, groups=None, summary=False, tolerance=1e-9):
+        """
+        :file stream: the stream to write to, defaults to sys.stdout at the time of writing
+        :boolean nonzero: whether to leave out the values that are zero, or unknown
+        :int top: the number of values with the largest magnitude to show per group, all the values are shown if
+        it is None
+        :collection<string> groups: the names of the variables and constraints to show, all are shown if it is None
+        :boolean summary: whether to render a table with a summary row per group instead of a row per value
+        :float tolerance: the magnitude under which a value is considered zero
+        """
+        assert top is None or top >= 0, 'top must not be negative'
+        self.stream = stream
+        self.nonzero = nonzero
+        self.top = top
+        self.groups = groups
+        self.summary = summary
+        self.tolerance = tolerance
+        self.lines = []
+        self.depth = 0
+
+    def line(self, *parts):
+        """
+        Adds a line to the report. The parts are joined with spaces, like the arguments of print.
+        :list parts: the parts of the line
+        """
+        self.lines.append(' '.join(str(part) for part in parts))
+
+    def flush(self):
+        """
+        Writes the buffered lines to the stream and clears the buffer.
+        """
+        if not self.lines:
+            return
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write('\n'.join(self.lines) + '\n')
+        stream.flush()
+        self.lines = []
+
+    def __enter__(self):
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.depth -= 1
+        if self.depth == 0:
+            self.flush()
+
+    def shows(self, name):
+        """
+        :string name: the name of a variable or a constraint
+        :returns boolean: whether the group filter lets the name through
+        """
+        return self.groups is None or name in self.groups
+
+    def select(self, values):
+        """
+        Applies the nonzero and top filters to the values of a group.
+        :dictionary values: the values keyed by the key within the group
+        :returns list<tuple>: the selected (key, value) pairs
+        """
+        items = values.items()
+        if self.nonzero:
+            tolerance = self.tolerance
+            items = [(key, value) for key, value in items if value is not None and abs(value) > tolerance]
+        if self.top is not None:
+            return heapq.nlargest(self.top, items, key=lambda item: -1 if item[1] is None else abs(item[1]))
+        return list(items)
+
+    def add_values(self, results, value_format):
+        """
+        Renders the values of the variables or the constraints, one line per value, or a summary table.
+        :dictionary results: the values keyed by name, and by the key within the groups for groups
+        :string value_format: the format of a line, given the name and the value
+        """
+        results = [(name, value) for name, value in results.items() if self.shows(name)]
+        if self.summary:
+            self.add_summary(results)
+            return
+        for name, value in results:
+            if isinstance(value, dict):
+                row_format = value_format.replace('%s', '%s[%%s]' % str(name).replace('%', '%%'), 1)
+                self.lines.extend([row_format % item for item in self.select(value)])
+            elif not self.nonzero or value is not None and abs(value) > self.tolerance:
+                self.lines.append(value_format % (name, value))
+
+    def add_summary(self, results):
+        """
+        Renders a table with a row per variable or constraint, holding the number of values, the number of nonzero
+        values, and the minimum, maximum and total of the known values.
+        :list<tuple> results: the (name, value) pairs, the value being a dictionary for groups
+        """
+        if not results:
+            return
+        rows = [('name', 'count', 'nonzero', 'min', 'max', 'total')]
+        for name, values in results:
+            values = list(values.values()) if isinstance(values, dict) else [values]
+            known = [value for value in values if value is not None]
+            nonzero = sum(1 for value in known if abs(value) > self.tolerance)
+            if known:
+                stats = ['%.2f' % min(known), '%.2f' % max(known), '%.2f' % sum(known)]
+            else:
+                stats = ['-', '-', '-']
+            rows.append((str(name), str(len(values)), str(nonzero)) + tuple(stats))
+        self.add_table(rows)
+
+    def add_table(self, rows):
+        """
+        Renders a table with aligned columns. The first column is aligned to the left, the others to the right.
+        :list<tuple<string>> rows: the rows of the table, the first row being the header
+        """
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        for row in rows:
+            cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+            self.lines.append('  '.join(cells))
@@ -0,0 +1,198 @@
+"""
+Columnar storage of the results of a solve, and export of the results to CSV, Arrow and Parquet files. pyarrow is
+only needed for the Arrow and Parquet exports.
+"""
+import csv
+import math
+from array import array
+from collections import OrderedDict
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+VARIABLE = 'variable'
+CONSTRAINT = 'constraint'
+METRIC = 'metric'
+
+
+def _require_pyarrow():
+    """
+    Checks that the optional pyarrow dependency is installed.
+    """
+    if pa is None:
+        raise ImportError('pyarrow is required to export the results to Arrow or Parquet files')
+
+
+class ResultTable:
+    """
+    Holds the results of a solve in columns rather than in nested dictionaries. The results are organized in
+    groups, such as a variable group or the rows of a constraint family, and every group has a key table and a flat
+    array of values in the same order. Single variables and constraints are groups with the single key None.
+    Unknown values are stored as NaN.
+
+    The table is exported group by group and in batches, so the export never holds more than one batch of rows.
+    The exported rows have the columns section, group, key and value, the keys being written as strings.
+    """
+
+    def __init__(self):
+        self.keys = OrderedDict()
+        self.values = OrderedDict()
+
+    def add_group(self, section, name, keys, values):
+        """
+        Adds a group of results to the table.
+        :string section: the kind of results, VARIABLE, CONSTRAINT or METRIC
+        :string name: the name of the group
+        :list keys: the key table of the group, None for a single value
+        :iterable<float> values: the values in the order of the keys, None for unknown values
+        """
+        if not isinstance(values, array):
+            values = array('d', (float('nan') if value is None else value for value in values))
+        keys = [None] if keys is None else keys
+        assert len(keys) == len(values), 'the group must have as many keys as values'
+        self.keys[section, name] = keys
+        self.values[section, name] = values
+
+    def groups(self, section=None):
+        """
+        :string section: the section to list the groups of, all the groups are listed if it is None
+        :returns list<tuple>: the (section, name) ids of the groups
+        """
+        return [group_id for group_id in self.keys if section is None or group_id[0] == section]
+
+    def get_group(self, section, name):
+        """
+        :string section: the section of the group
+        :string name: the name of the group
+        :returns tuple<list, array>: the key table and the values of the group
+        """
+        return self.keys[section, name], self.values[section, name]
+
+    def get_value(self, section, name, key=None):
+        """
+        Looks up a single value. This searches the key table, so use get_group to read many values.
+        :string section: the section of the group
+        :string name: the name of the group
+        :object key: the key of the value in the group
+        :returns float: the value, or None if it is unknown
+        """
+        keys, values = self.get_group(section, name)
+        value = values[keys.index(key)]
+        return None if math.isnan(value) else value
+
+    def to_dict(self, section):
+        """
+        Builds the nested result dictionary of a section, structured like result_variables or constraint_results.
+        :string section: the section to convert
+        :returns dictionary: the values keyed by the group name, and by the key within the groups
+        """
+        results = {}
+        for section_name, name in self.groups(section):
+            keys, values = self.get_group(section_name, name)
+            values = [None if math.isnan(value) else value for value in values]
+            results[name] = values[0] if keys == [None] else OrderedDict(zip(keys, values))
+        return results
+
+    def __len__(self):
+        return sum(len(values) for values in self.values.values())
+
+    def iter_rows(self, batch_size=65536):
+        """
+        Generates the rows of the table in batches.
+        :int batch_size: the maximum number of rows in a batch
+        :returns generator<list<tuple>>: lists of (section, group, key, value) rows
+        """
+        for (section, name), keys in self.keys.items():
+            values = self.values[section, name]
+            for start in range(0, len(keys), batch_size):
+                end = start + batch_size
+                yield [(section, name, '' if key is None else str(key), value)
+                       for key, value in zip(keys[start:end], values[start:end])]
+
+    def write_csv(self, path, batch_size=65536):
+        """
+        Writes the table to a CSV file with a header row. Unknown values are written as empty fields.
+        :string path: the path of the file
+        :int batch_size: the number of rows written at a time
+        """
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(('section', 'group', 'key', 'value'))
+            for rows in self.iter_rows(batch_size):
+                writer.writerows((section, name, key, '' if math.isnan(value) else repr(value))
+                                 for section, name, key, value in rows)
+
+    def iter_batches(self, batch_size=65536):
+        """
+        Generates the table as Arrow record batches. The values are passed to Arrow without copying them. Unknown
+        values are NaN.
+        :int batch_size: the maximum number of rows in a batch
+        :returns generator<RecordBatch>: the record batches
+        """
+        _require_pyarrow()
+        for (section, name), keys in self.keys.items():
+            values = memoryview(self.values[section, name])
+            for start in range(0, len(keys), batch_size):
+                count = min(batch_size, len(keys) - start)
+                value_array = pa.Array.from_buffers(pa.float64(), count,
+                                                    [None, pa.py_buffer(values[start:start + batch_size])])
+                yield pa.RecordBatch.from_arrays([
+                    pa.repeat(section, count),
+                    pa.repeat(name, count),
+                    pa.array(['' if key is None else str(key) for key in keys[start:start + batch_size]],
+                             pa.string()),
+                    value_array
+                ], schema=self.schema())
+
+    @staticmethod
+    def schema():
+        """
+        :returns Schema: the Arrow schema of the exported rows
+        """
+        _require_pyarrow()
+        return pa.schema([('section', pa.string()), ('group', pa.string()), ('key', pa.string()),
+                          ('value', pa.float64())])
+
+    def write_arrow(self, path, batch_size=65536):
+        """
+        Writes the table to an Arrow IPC file, batch by batch. Requires pyarrow.
+        :string path: the path of the file
+        :int batch_size: the maximum number of rows in a batch
+        """
+        _require_pyarrow()
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, self.schema()) as writer:
+                for batch in self.iter_batches(batch_size):
+                    writer.write_batch(batch)
+
+    def write_parquet(self, path, batch_size=65536):
+        """
+        Writes the table to a Parquet file, batch by batch. Requires pyarrow.
+        :string path: the path of the file
+        :int batch_size: the maximum number of rows in a batch
+        """
+        _require_pyarrow()
+        with pq.ParquetWriter(path, self.schema()) as writer:
+            for batch in self.iter_batches(batch_size):
+                writer.write_table(pa.Table.from_batches([batch]))
+
+    def write(self, path, batch_size=65536):
+        """
+        Writes the table to a file, choosing the format by the extension of the path: .csv, .parquet, or .arrow or
+        .feather for the Arrow IPC format.
+        :string path: the path of the file
+        :int batch_size: the maximum number of rows in a batch
+        """
+        extension = str(path).rsplit('.', 1)[-1].lower()
+        if extension == 'csv':
+            self.write_csv(path, batch_size)
+        elif extension == 'parquet':
+            self.write_parquet(path, batch_size)
+        elif extension in ('arrow', 'feather'):
+            self.write_arrow(path, batch_size)
+        else:
+            raise ValueError('Unknown results file format: %s' % extension)
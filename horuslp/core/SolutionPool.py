@@ -0,0 +1,56 @@
+"""
+A compact container for several solutions of the same problem
+"""
+import math
+from array import array
+
+
+class SolutionPool:
+    """
+    Holds a number of solutions of a problem, best first. The values of each solution are kept in a flat array in
+    the order of the variable keys, rather than in a dictionary per solution.
+    """
+
+    def __init__(self, variable_keys):
+        """
+        :list<tuple> variable_keys: (variable name, key) pairs in the order of the values, the key being None for
+        variables that are not in a variable group
+        """
+        self.variable_keys = variable_keys
+        self.values = []
+        self.objectives = array('d')
+
+    def add(self, values, objective):
+        """
+        Adds a solution to the pool.
+        :list<float> values: the values of the variables in the order of the variable keys, None for unknown values
+        :float objective: the objective value of the solution
+        """
+        self.values.append(array('d', (float('nan') if value is None else value for value in values)))
+        self.objectives.append(objective)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        """
+        :int index: the rank of the solution
+        :returns tuple<float, array>: the objective value and the values of the solution
+        """
+        return self.objectives[index], self.values[index]
+
+    def get_result_variables(self, index):
+        """
+        Builds the result dictionary of a solution, structured like the result_variables of the problem.
+        :int index: the rank of the solution
+        :returns dictionary: the values of the variables keyed by the variable name, and by the key within the
+        variable groups
+        """
+        result_variables = {}
+        for (var_name, key), value in zip(self.variable_keys, self.values[index]):
+            value = None if math.isnan(value) else value
+            if key is None:
+                result_variables[var_name] = value
+            else:
+                result_variables.setdefault(var_name, {})[key] = value
+        return result_variables
@@ -0,0 +1,143 @@
+"""
+A pool of persistent solver worker processes that many problems can be solved in concurrently.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from horuslp.core.presolve import presolve_problem
+from horuslp.core.serialization import pack_model, unpack_model
+from horuslp.core.utils import get_model_rows
+
+
+def _solve_serialized(model, solve_args):
+    """
+    Solves a packed model inside of a worker process.
+    :bytes model: the model packed with pack_model
+    :dictionary solve_args: the arguments to pass into the PuLP solve function
+    :returns tuple: the PuLP status and solution status, the values and reduced costs of the columns in the packed
+    order, and the duals and slacks of the rows in the packed order
+    """
+    prob, variables, _ = unpack_model(model)
+    status = prob.solve(**solve_args)
+    rows = [(row.pi, row.slack) for row in get_model_rows(prob)]
+    return status, getattr(prob, 'sol_status', None), [var.varValue for var in variables], \
+        [var.dj for var in variables], rows
+
+
+class SolverPool:
+    """
+    Keeps a bounded number of warm worker processes alive and solves the built models of many problems in them.
+    The models are packed into the binary model format and sent to the workers over the pool's queue, and the
+    statuses and solutions are read back into the problems in the parent process.
+
+    with SolverPool(processes=4) as pool:
+        futures = [pool.submit(prob) for prob in problems]
+        statuses = [future.result() for future in futures]
+    """
+
+    def __init__(self, processes=None, solve_args=None):
+        """
+        :int processes: the maximum number of worker processes, defaults to the number of CPUs
+        :dictionary solve_args: the default arguments to pass into the PuLP solve function in the workers
+        """
+        self.processes = processes
+        self.solve_args = {} if solve_args is None else solve_args
+        self.executor = ProcessPoolExecutor(max_workers=processes)
+
+    def submit_model(self, model, solve_args=None):
+        """
+        Sends a built PuLP model to the pool to be solved. Once it is solved, the status, values, reduced costs, duals
+        and slacks are assigned to the model as if it had been solved in this process.
+
+        :LPProblem model: the model to solve
+        :dictionary solve_args: the arguments to pass into the PuLP solve function, overrides the pool's default
+        :returns Future: a future that resolves to the PuLP status of the model after the solve
+        """
+        solve_args = self.solve_args if solve_args is None else solve_args
+        variables = model.variables()
+        result = Future()
+
+        def apply_solution(solve_future):
+            try:
+                status, sol_status, values, reduced_costs, rows = solve_future.result()
+                for var, value, reduced_cost in zip(variables, values, reduced_costs):
+                    var.varValue = value
+                    var.dj = reduced_cost
+                for row, (pi, slack) in zip(get_model_rows(model), rows):
+                    row.pi = pi
+                    row.slack = slack
+                model.status = status
+                model.sol_status = sol_status
+                result.set_result(status)
+            except BaseException as err:
+                result.set_exception(err)
+
+        self.executor.submit(_solve_serialized, pack_model(model), solve_args).add_done_callback(apply_solution)
+        return result
+
+    def submit(self, problem, solve_args=None):
+        """
+        Builds the model of the problem and sends it to the pool to be solved, the same way as Problem.solve: the
+        termination limits of the problem are applied, and the model is scaled and reduced first if scaling and
+        presolve are set. Once it is solved, the solution is unscaled and read into the problem's result containers.
+
+        :Problem problem: the problem to solve
+        :dictionary solve_args: the arguments to pass into the PuLP solve function, overrides the pool's default
+        :returns Future: a future that resolves to the status of the problem after the solve, see Problem.get_status
+        """
+        problem.build_model()
+        solve_args = problem.get_solve_args(self.solve_args if solve_args is None else solve_args)
+        original = problem.prob if problem.scaled is None else problem.scaled.scale()
+        model = original
+        settled = None
+        if problem.presolve:
+            problem.presolved = presolve_problem(original)
+            model = problem.presolved.reduced
+            settled = problem.presolved.settle()
+        result = Future()
+
+        def read_solution(model_future):
+            try:
+                try:
+                    status = model_future.result()
+                finally:
+                    if model is not original:
+                        problem.presolved.postsolve()
+                    if original is not problem.prob:
+                        problem.scaled.unscale()
+                problem.status = status
+                problem.sol_status = getattr(model, 'sol_status', None)
+                problem.read_results()
+                result.set_result(problem.get_status())
+            except BaseException as err:
+                result.set_exception(err)
+
+        if settled is None:
+            self.submit_model(model, solve_args).add_done_callback(read_solution)
+        else:
+            settled_future = Future()
+            settled_future.set_result(settled)
+            read_solution(settled_future)
+        return result
+
+    def solve_all(self, problems, solve_args=None):
+        """
+        Solves all the problems in the pool and waits for them to finish.
+        :list<Problem> problems: the problems to solve
+        :dictionary solve_args: the arguments to pass into the PuLP solve function, overrides the pool's default
+        :returns list<string>: the statuses of the problems, in the same order
+        """
+        futures = [self.submit(problem, solve_args) for problem in problems]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait=True):
+        """
+        Stops the worker processes.
+        :boolean wait: whether to wait for the pending solves to finish
+        """
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
@@ -7,6 +7,9 @@ from collections import OrderedDict
 
 from horuslp.core.constants import BINARY, CONTINUOUS, INTEGER
 
+# the PuLP categories of the variable types
+PULP_TYPES = {BINARY: pl.LpBinary, CONTINUOUS: pl.LpContinuous, INTEGER: pl.LpInteger}
+
 
 class Variable:
     """Basic variable definition class. Essentially a data container class"""
@@ -95,6 +98,31 @@ class IntegerVariableGroup(VariableGroup):
         super(IntegerVariableGroup, self).__init__(group_name, var_names, lb, ub, INTEGER)
 
 
+class Column:
+    """
+    A new variable of a variable group, to be added to an already built problem by column generation. Holds the
+    objective cost of the variable and its coefficients in the constraint rows. Functions as a data container.
+    """
+    def __init__(self, group_name, key, cost, coefficients, lb=0, ub=None, var_type=CONTINUOUS):
+        """
+        :string group_name: the name of the variable group the variable is added to
+        :object key: the key of the variable in the group
+        :float cost: the coefficient of the variable in the objective
+        :dictionary coefficients: the coefficients of the variable in the constraint rows, keyed by the constraint
+        name, or by a (constraint name, row key) tuple for the rows of a constraint family
+        :float lb: lower bound
+        :float ub: upper bound
+        :constant var_type: variable type
+        """
+        self.group_name = group_name
+        self.key = key
+        self.cost = cost
+        self.coefficients = coefficients
+        self.lb = lb
+        self.ub = ub
+        self.var_type = var_type
+
+
 class VariableManager:
     """
     The variable manager class that contains the variable logic
@@ -125,7 +153,7 @@ class VariableManager:
         """
         for var in self.vars:
             assert isinstance(var, (Variable, VariableGroup))
-            pl_var_type = {BINARY: pl.LpBinary, CONTINUOUS: pl.LpContinuous, INTEGER: pl.LpInteger}[var.var_type]
+            pl_var_type = PULP_TYPES[var.var_type]
             if isinstance(var, Variable):
                 lp_var = pl.LpVariable(var.var_name, var.lb, var.ub, pl_var_type)
                 self.variables[var.var_name] = lp_var
@@ -1,7 +1,7 @@
 """
 The core library definition module that contains the commonly used classes
 """
-from horuslp.core.Constraint import Constraint
+from horuslp.core.Constraint import Constraint, ConstraintFamily, LazyConstraint
 from horuslp.core.Metric import Metric
 from horuslp.core.Objective import ObjectiveComponent, CombinedObjective
 from horuslp.core.Variables import VariableManager
@@ -7,3 +7,6 @@ CONTINUOUS = 'CONTINUOUS'
 INTEGER = 'INTEGER'
 MAXIMIZE = 'MAXIMIZE'
 MINIMIZE = 'MINIMIZE'
+THREAD = 'THREAD'
+PROCESS = 'PROCESS'
+FEASIBLE = 'Feasible'
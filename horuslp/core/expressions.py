@@ -0,0 +1,63 @@
+"""
+Helpers for building linear expressions in define functions. Adding up terms with the builtin sum creates a new
+expression for every term and copies the terms collected so far into it, which is quadratic in the length of the
+row. These helpers collect all the terms into a single expression in one pass instead.
+"""
+import pulp as pl
+
+
+def weighted_sum(terms, constant=0):
+    """
+    Builds the expression sum(coefficient * variable) over the terms. Terms of the same variable are added up, and
+    expressions can be used in place of variables.
+
+    :iterable<tuple> terms: (variable, coefficient) pairs
+    :float constant: the constant of the expression
+    :returns LPAffineExpression: the expression
+    """
+    expr = pl.LpAffineExpression(constant=constant)
+    for var, coef in terms:
+        if isinstance(var, pl.LpAffineExpression):
+            for inner_var, inner_coef in var.items():
+                expr[inner_var] = expr.get(inner_var, 0) + inner_coef * coef
+            expr.constant += var.constant * coef
+        elif var in expr:
+            expr[var] += coef
+        else:
+            expr[var] = coef
+    return expr
+
+
+def dot(variables, coefficients, constant=0):
+    """
+    Builds the dot product of variables and coefficients. The variables can be a variable group, in which case the
+    coefficients are either a dictionary keyed like the group, which may leave some of the keys out, or a sequence
+    in the order of the group. The variables can also be a sequence, with a sequence of coefficients. Zero
+    coefficients are left out of the expression.
+
+        return dot(bag, weights) <= capacity
+
+    :dictionary/list variables: the variables
+    :dictionary/list coefficients: the coefficients
+    :float constant: the constant of the expression
+    :returns LPAffineExpression: the expression
+    """
+    if isinstance(coefficients, dict):
+        terms = ((variables[key], coef) for key, coef in coefficients.items() if coef != 0)
+    else:
+        if isinstance(variables, dict):
+            variables = variables.values()
+        terms = ((var, coef) for var, coef in zip(variables, coefficients) if coef != 0)
+    return weighted_sum(terms, constant)
+
+
+def total(variables, constant=0):
+    """
+    Builds the sum of the variables.
+    :dictionary/list variables: a variable group or a sequence of variables
+    :float constant: the constant of the expression
+    :returns LPAffineExpression: the expression
+    """
+    if isinstance(variables, dict):
+        variables = variables.values()
+    return weighted_sum(((var, 1) for var in variables), constant)
@@ -0,0 +1,68 @@
+"""
+Helpers for writing conditional constraints in define functions. A constraint that only has to hold when a binary
+indicator is on is relaxed by a big-M term when it is off, and the smaller the M, the tighter the LP relaxation. The
+helpers derive the smallest valid M from the bounds of the variables, as they are declared in the VariableManager.
+
+    class OpenWarehouseConstraint(ConstraintFamily):
+        def define(self, shipments, open_warehouse):
+            for warehouse, shipment in shipments.items():
+                # nothing can be shipped from a closed warehouse, so shipment <= ub * open_warehouse
+                yield warehouse, implies(open_warehouse[warehouse], shipment <= 0, active=0)
+"""
+import pulp as pl
+
+from horuslp.core.expressions import weighted_sum
+from horuslp.core.presolve import INFINITY
+
+
+def expression_bounds(expr):
+    """
+    Computes the range of an expression from the bounds of its variables.
+    :LPAffineExpression expr: the expression
+    :returns tuple<float>: the lower and upper bound of the expression, None for the sides that are unbounded
+    """
+    lower = upper = expr.constant
+    for var, coef in expr.items():
+        if not coef:
+            continue
+        low, up = (var.lowBound, var.upBound) if coef > 0 else (var.upBound, var.lowBound)
+        if lower is not None:
+            lower = None if low is None or abs(low) >= INFINITY else lower + coef * low
+        if upper is not None:
+            upper = None if up is None or abs(up) >= INFINITY else upper + coef * up
+    return lower, upper
+
+
+def implies(indicator, constraint, active=1, big_m=None):
+    """
+    Builds the row that enforces the constraint when the indicator takes the active value, and relaxes it otherwise.
+    For a constraint expr <= rhs, the row is expr - rhs <= M * (1 - indicator), where M is the largest value that
+    expr - rhs can take given the bounds of its variables, and likewise for >= constraints. Equality constraints have
+    to be split into a <= and a >= implication.
+
+    :LpVariable indicator: a binary variable
+    :LPConstraint constraint: the <= or >= constraint to enforce
+    :int active: the value of the indicator for which the constraint is enforced, 1 or 0
+    :float big_m: the M to use if the variables of the constraint aren't bounded. If the bounds give a smaller M, that
+    one is used instead
+    :returns LPConstraint: the row
+    """
+    assert constraint.sense != pl.LpConstraintEQ, 'split an implied equality into a <= and a >= implication'
+    assert indicator.lowBound == 0 and indicator.upBound == 1 and indicator.cat != pl.LpContinuous, \
+        'the indicator must be a binary variable'
+    assert active in (0, 1), 'the indicator can only be active at 0 or 1'
+    expr = weighted_sum(constraint.items(), constraint.constant)
+    lower, upper = expression_bounds(expr)
+    bound = upper if constraint.sense == pl.LpConstraintLE else lower
+    if bound is None:
+        if big_m is None:
+            raise ValueError('the constraint is unbounded given the variable bounds, pass big_m')
+        bound = big_m if constraint.sense == pl.LpConstraintLE else -big_m
+    elif big_m is not None:
+        bound = min(bound, big_m) if constraint.sense == pl.LpConstraintLE else max(bound, -big_m)
+    # if the expression can't leave the feasible side, the constraint always holds and needs no relaxation
+    bound = max(bound, 0) if constraint.sense == pl.LpConstraintLE else min(bound, 0)
+    if not bound:
+        return pl.LpConstraint(expr, constraint.sense, rhs=0)
+    relaxation = weighted_sum([(indicator, -1)], 1) if active else weighted_sum([(indicator, 1)])
+    return pl.LpConstraint(weighted_sum([(expr, 1), (relaxation, -bound)]), constraint.sense, rhs=0)
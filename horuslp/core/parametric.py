@@ -0,0 +1,73 @@
+"""
+Parametric analysis of LP problems. The optimal objective value of an LP is a piecewise linear function of a single
+right hand side or objective coefficient, so the whole curve can be recovered from a few solves by following the
+slopes reported by the solver, rather than by solving on a grid of values.
+"""
+
+
+def piecewise_linear_curve(evaluate, lower, upper, tolerance=1e-7, max_evaluations=1000):
+    """
+    Finds the breakpoints of a convex or concave piecewise linear function on an interval. Starting from the two ends
+    of the interval, the tangent lines at the ends of each segment are intersected. If the function matches the
+    tangents at the intersection, it is the only breakpoint in the segment, otherwise the segment is split there
+    and both halves are searched. Every evaluation either confirms a breakpoint or finds a new linear piece.
+
+    :function evaluate: called with a parameter value, returns the (value, slope) of the function there
+    :float lower: the lower end of the interval
+    :float upper: the upper end of the interval
+    :float tolerance: the tolerance used to compare the values, slopes and parameters
+    :int max_evaluations: the maximum number of evaluations before giving up with a RuntimeError
+    :returns list<tuple>: the (parameter, value) breakpoints in increasing order, including both ends. The function
+    is linear between consecutive breakpoints.
+    """
+    assert lower <= upper, 'the lower end of the interval must not be greater than the upper end'
+    evaluations = [0]
+
+    def point(param):
+        evaluations[0] += 1
+        if evaluations[0] > max_evaluations:
+            raise RuntimeError('The breakpoints were not found within %d evaluations' % max_evaluations)
+        value, slope = evaluate(param)
+        return param, value, slope
+
+    left = point(lower)
+    breakpoints = [left[:2]]
+    if upper - lower <= tolerance:
+        return breakpoints
+    stack = [(left, point(upper))]
+    while stack:
+        (a, value_a, slope_a), (b, value_b, slope_b) = stack.pop()
+        if abs(slope_a - slope_b) <= tolerance or b - a <= tolerance:
+            breakpoints.append((b, value_b))
+            continue
+        param = (value_b - slope_b * b - value_a + slope_a * a) / (slope_a - slope_b)
+        if param - a <= tolerance or b - param <= tolerance:
+            breakpoints.append((b, value_b))
+            continue
+        middle = point(param)
+        tangent = value_a + slope_a * (param - a)
+        if abs(middle[1] - tangent) <= tolerance * max(1, abs(tangent)):
+            breakpoints.append(middle[:2])
+            breakpoints.append((b, value_b))
+            continue
+        stack.append((middle, (b, value_b, slope_b)))
+        stack.append(((a, value_a, slope_a), middle))
+    return _remove_collinear(breakpoints, tolerance)
+
+
+def _remove_collinear(points, tolerance):
+    """
+    Removes the points that the searched segments were split at but that turned out not to be breakpoints.
+    :list<tuple> points: the (parameter, value) points in increasing order
+    :float tolerance: the tolerance used to compare the slopes
+    :returns list<tuple>: the points where the slope changes, and both ends
+    """
+    kept = points[:2]
+    for param, value in points[2:]:
+        (param_a, value_a), (param_b, value_b) = kept[-2:]
+        slope_ab = (value_b - value_a) / (param_b - param_a)
+        slope_bc = (value - value_b) / (param - param_b)
+        if abs(slope_ab - slope_bc) <= tolerance * max(1, abs(slope_ab)):
+            kept.pop()
+        kept.append((param, value))
+    return kept
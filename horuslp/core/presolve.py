@@ -0,0 +1,354 @@
+"""
+Model reduction performed on the built model before it is handed off to the solver, and the matching postsolve
+that maps the solution back onto the original model.
+"""
+import math
+from collections import OrderedDict
+
+import pulp as pl
+
+from horuslp.core.utils import get_model_rows
+
+# bounds at or beyond this magnitude are treated as infinite, like the solvers do
+INFINITY = 1e30
+
+
+class PresolvedProblem:
+    """
+    The reduced model along with the information needed to map its solution back to the original model.
+    """
+
+    def __init__(self, original, tolerance=1e-9):
+        """
+        :LPProblem original: the built model to reduce
+        :float tolerance: the tolerance used when comparing bounds and coefficients
+        """
+        self.original = original
+        self.tolerance = tolerance
+        self.reduced = None
+        # the reduced rows and the removal reasons are keyed by the original rows
+        self.row_map = OrderedDict()
+        self.removed_rows = OrderedDict()
+        self.fixed_variables = OrderedDict()
+        self.original_bounds = OrderedDict()
+        self.dropped_variables = []
+        # set when a row or a bound can't be satisfied, in which case the reduced model isn't handed to the solver
+        self.infeasible = False
+        self.stats = OrderedDict([
+            ('empty_rows', 0),
+            ('free_rows', 0),
+            ('singleton_rows', 0),
+            ('duplicate_rows', 0),
+            ('fixed_variables', 0),
+            ('tightened_bounds', 0)
+        ])
+
+    def presolve(self, max_passes=10):
+        """
+        Reduces the model. Fixed variables are substituted out of the rows, empty and free rows are removed,
+        singleton rows are turned into variable bounds and duplicate rows are dropped in favour of the tightest one.
+        The passes are repeated until nothing changes, since tightened bounds can fix more variables. If a row or a
+        variable's bounds can't be satisfied, the model is marked as infeasible, and the offending rows are kept as
+        they are.
+
+        :int max_passes: the maximum number of reduction passes
+        :returns LPProblem: the reduced model
+        """
+        variables = self.original.variables()
+        bounds = OrderedDict(
+            (var, [-INFINITY if var.lowBound is None else var.lowBound,
+                   INFINITY if var.upBound is None else var.upBound])
+            for var in variables
+        )
+        if any(lb > ub + self.tolerance for lb, ub in bounds.values()):
+            self.infeasible = True
+        rows = [{
+            'row': row,
+            'terms': OrderedDict((var, coef) for var, coef in row.items()),
+            'sense': row.sense,
+            'rhs': -row.constant,
+            'active': True,
+            'kept': False
+        } for row in get_model_rows(self.original)]
+
+        for _ in range(max_passes):
+            changed = False
+            for row in rows:
+                if row['active'] and not row['kept']:
+                    changed = self._reduce_row(row, bounds) or changed
+            if not changed:
+                break
+        self._remove_duplicate_rows(rows)
+        self._build_reduced(rows, bounds, variables)
+        return self.reduced
+
+    def _reduce_row(self, row, bounds):
+        """
+        Applies the row level reductions to a single row.
+        :dictionary row: the working copy of the row
+        :OrderedDict bounds: the working bounds of the variables
+        :returns boolean: whether the row or the bounds changed
+        """
+        changed = False
+        for var, coef in list(row['terms'].items()):
+            lb, ub = bounds[var]
+            if coef == 0:
+                del row['terms'][var]
+                changed = True
+            elif abs(ub - lb) <= self.tolerance:
+                row['rhs'] -= coef * lb
+                del row['terms'][var]
+                changed = True
+        if len(row['terms']) == 0:
+            if self._satisfied(0, row['sense'], row['rhs']):
+                self._remove_row(row, 'empty_rows')
+                return True
+            row['kept'] = True
+            self.infeasible = True
+            return changed
+        if abs(row['rhs']) >= INFINITY and row['sense'] != pl.LpConstraintEQ:
+            if (row['rhs'] > 0) == (row['sense'] == pl.LpConstraintLE):
+                self._remove_row(row, 'free_rows')
+                return True
+        if len(row['terms']) == 1:
+            return self._tighten_bounds(row, bounds) or changed
+        return changed
+
+    def _tighten_bounds(self, row, bounds):
+        """
+        Turns a singleton row into bounds on its variable and removes the row. If the new bounds conflict with the
+        old ones, the row is kept and the model is marked as infeasible.
+        :dictionary row: the working copy of the singleton row
+        :OrderedDict bounds: the working bounds of the variables
+        :returns boolean: whether the row was turned into bounds
+        """
+        var, coef = next(iter(row['terms'].items()))
+        value = row['rhs'] / coef
+        lb, ub = bounds[var]
+        new_lb, new_ub = lb, ub
+        upper = row['sense'] == pl.LpConstraintEQ or ((row['sense'] == pl.LpConstraintLE) == (coef > 0))
+        lower = row['sense'] == pl.LpConstraintEQ or not upper
+        if upper:
+            new_ub = min(ub, value)
+        if lower:
+            new_lb = max(lb, value)
+        if var.cat == pl.LpInteger:
+            new_ub = math.floor(new_ub + self.tolerance) if abs(new_ub) < INFINITY else new_ub
+            new_lb = math.ceil(new_lb - self.tolerance) if abs(new_lb) < INFINITY else new_lb
+        if new_lb > new_ub + self.tolerance:
+            row['kept'] = True
+            self.infeasible = True
+            return False
+        if new_lb != lb or new_ub != ub:
+            self.stats['tightened_bounds'] += 1
+        bounds[var] = [new_lb, new_ub]
+        self._remove_row(row, 'singleton_rows')
+        return True
+
+    def _remove_duplicate_rows(self, rows):
+        """
+        Finds the rows that have the same coefficients up to a scaling factor and only keeps the tightest one.
+        :list<dictionary> rows: the working copies of the rows
+        """
+        seen = {}
+        for row in rows:
+            if not row['active'] or len(row['terms']) == 0:
+                continue
+            key, rhs, sense = self._normalize(row)
+            if key not in seen:
+                seen[key] = (row, rhs)
+                continue
+            other, other_rhs = seen[key]
+            if sense == pl.LpConstraintEQ:
+                if abs(rhs - other_rhs) <= self.tolerance:
+                    self._remove_row(row, 'duplicate_rows')
+            elif rhs < other_rhs:
+                self._remove_row(other, 'duplicate_rows')
+                seen[key] = (row, rhs)
+            else:
+                self._remove_row(row, 'duplicate_rows')
+
+    def _normalize(self, row):
+        """
+        Scales the row so that its first coefficient is 1 and it is a <= or == row, so duplicates compare equal.
+        :dictionary row: the working copy of the row
+        :returns tuple: the comparison key, the scaled right hand side and the normalized sense
+        """
+        items = sorted(row['terms'].items(), key=lambda term: term[0].name)
+        scale = abs(items[0][1])
+        sense = row['sense']
+        if sense == pl.LpConstraintGE or (sense == pl.LpConstraintEQ and items[0][1] < 0):
+            scale = -scale
+        if sense == pl.LpConstraintGE:
+            sense = pl.LpConstraintLE
+        key = (sense, tuple((var.name, round(coef / scale, 12)) for var, coef in items))
+        return key, row['rhs'] / scale, sense
+
+    def _remove_row(self, row, reason):
+        """
+        Marks the row as removed from the reduced model.
+        :dictionary row: the working copy of the row
+        :string reason: the stats key of the reduction that removed the row
+        """
+        row['active'] = False
+        self.removed_rows[row['row']] = reason
+        self.stats[reason] += 1
+
+    def _build_reduced(self, rows, bounds, variables):
+        """
+        Builds the reduced LPProblem from the remaining rows and applies the tightened bounds to the variables.
+        :list<dictionary> rows: the working copies of the rows
+        :OrderedDict bounds: the working bounds of the variables
+        :list<LpVariable> variables: the variables of the original model
+        """
+        for var in variables:
+            lb, ub = bounds[var]
+            if abs(ub - lb) <= self.tolerance:
+                self.fixed_variables[var] = lb
+        self.stats['fixed_variables'] = len(self.fixed_variables)
+
+        reduced = pl.LpProblem(self.original.name, self.original.sense)
+        if self.original.objective is not None:
+            objective = pl.LpAffineExpression(constant=self.original.objective.constant)
+            for var, coef in self.original.objective.items():
+                if var in self.fixed_variables:
+                    objective.constant += coef * self.fixed_variables[var]
+                else:
+                    objective[var] = coef
+            reduced += objective
+        for row in rows:
+            if not row['active']:
+                continue
+            expr = pl.LpAffineExpression(list(row['terms'].items()))
+            reduced_row = pl.LpConstraint(expr, row['sense'], row['row'].name, row['rhs'])
+            reduced += reduced_row
+            self.row_map[row['row']] = reduced_row
+
+        in_model = set(reduced.variables())
+        for var in variables:
+            lb, ub = bounds[var]
+            self.original_bounds[var] = (var.lowBound, var.upBound)
+            if var not in in_model and var not in self.fixed_variables:
+                self.dropped_variables.append(var)
+            var.lowBound = None if lb <= -INFINITY else lb
+            var.upBound = None if ub >= INFINITY else ub
+        self.reduced = reduced
+
+    def _satisfied(self, activity, sense, rhs):
+        """
+        Checks if the activity satisfies the row.
+        :float activity: the activity of the row
+        :int sense: the PuLP sense of the row
+        :float rhs: the right hand side of the row
+        :returns boolean: whether the row is satisfied
+        """
+        if sense == pl.LpConstraintLE:
+            return activity <= rhs + self.tolerance
+        if sense == pl.LpConstraintGE:
+            return activity >= rhs - self.tolerance
+        return abs(activity - rhs) <= self.tolerance
+
+    def settle(self):
+        """
+        Decides the reduced model without a solver when the presolve already did the work: if the model was found
+        infeasible, or if no rows are left, in which case every variable is set to the bound its objective
+        coefficient favours. The solvers can't be relied on in these cases, since they are handed a model without
+        the offending rows, or without any rows at all.
+        :returns int: the PuLP status of the reduced model, or None if it has to be solved
+        """
+        if self.infeasible:
+            status, sol_status = pl.LpStatusInfeasible, pl.LpSolutionInfeasible
+        elif get_model_rows(self.reduced):
+            return None
+        else:
+            status, sol_status = self._solve_bounds()
+        self.reduced.status = status
+        self.reduced.sol_status = sol_status
+        return status
+
+    def _solve_bounds(self):
+        """
+        Solves a reduced model without rows by setting every variable to the bound its objective coefficient favours,
+        or to the value closest to 0 if it has no cost.
+        :returns tuple<int>: the PuLP status and solution status
+        """
+        objective = self.reduced.objective if self.reduced.objective is not None else {}
+        direction = -1 if self.reduced.sense == pl.LpMaximize else 1
+        status, sol_status = pl.LpStatusOptimal, pl.LpSolutionOptimal
+        for var in self.reduced.variables():
+            coef = objective.get(var, 0)
+            lb = -INFINITY if var.lowBound is None else var.lowBound
+            ub = INFINITY if var.upBound is None else var.upBound
+            if var.cat == pl.LpInteger:
+                lb = math.ceil(lb - self.tolerance) if lb > -INFINITY else lb
+                ub = math.floor(ub + self.tolerance) if ub < INFINITY else ub
+            if coef * direction > 0:
+                value = lb
+            elif coef * direction < 0:
+                value = ub
+            else:
+                value = min(max(0, lb), ub)
+            if abs(value) >= INFINITY:
+                status, sol_status = pl.LpStatusUnbounded, pl.LpSolutionUnbounded
+                value = None
+            var.varValue = value
+            var.dj = coef
+        return status, sol_status
+
+    def solve(self, solve_args=None):
+        """
+        Solves the reduced model, unless the presolve already decided it, see settle.
+        :dictionary solve_args: the arguments to pass into the PuLP solve function
+        :returns int: the PuLP status of the reduced model
+        """
+        status = self.settle()
+        if status is None:
+            status = self.reduced.solve(**({} if solve_args is None else solve_args))
+        return status
+
+    def postsolve(self):
+        """
+        Maps the solution of the reduced model back onto the original model. The fixed variables get their fixed
+        value, the variables that were dropped from the model get a value within their bounds, and the original
+        bounds of the variables are restored. The duals and slacks of the kept rows are copied from the reduced rows.
+        The slacks of the removed rows are computed from the solution, and their duals are 0 for empty and free rows
+        and unknown (None) for the rows that were turned into bounds or merged into a duplicate. The reduced costs
+        of the fixed variables are unknown as well.
+        """
+        objective = self.original.objective if self.original.objective is not None else {}
+        for var, value in self.fixed_variables.items():
+            var.varValue = value
+            var.dj = None
+        for var in self.dropped_variables:
+            lb = -INFINITY if var.lowBound is None else var.lowBound
+            ub = INFINITY if var.upBound is None else var.upBound
+            var.varValue = min(max(0, lb), ub)
+            var.dj = objective.get(var, 0)
+        for row in get_model_rows(self.original):
+            reduced_row = self.row_map.get(row)
+            if reduced_row is not None:
+                row.pi, row.slack = reduced_row.pi, reduced_row.slack
+                continue
+            reason = self.removed_rows.get(row)
+            if reason is None:
+                continue
+            row.pi = 0 if reason in ('empty_rows', 'free_rows') else None
+            if all(var.varValue is not None for var in row.keys()):
+                row.slack = -(row.constant + sum(var.varValue * coef for var, coef in row.items()))
+        for var, (lb, ub) in self.original_bounds.items():
+            var.lowBound = lb
+            var.upBound = ub
+        self.original.status = self.reduced.status
+
+
+def presolve_problem(prob, tolerance=1e-9, max_passes=10):
+    """
+    Reduces the built model before it is handed off to the solver.
+    :LPProblem prob: the built model
+    :float tolerance: the tolerance used when comparing bounds and coefficients
+    :int max_passes: the maximum number of reduction passes
+    :returns PresolvedProblem: the presolved problem, holding the reduced model in the reduced attribute
+    """
+    presolved = PresolvedProblem(prob, tolerance)
+    presolved.presolve(max_passes)
+    return presolved
@@ -0,0 +1,163 @@
+"""
+Row and column scaling of the built model before it is handed off to the solver, and the matching unscaling that
+maps the solution back onto the original model. Scaling brings the coefficients of badly scaled models, which mix
+very small and very large numbers, closer to 1, which makes the solver more stable.
+"""
+import math
+from collections import OrderedDict
+
+import pulp as pl
+
+from horuslp.core.presolve import INFINITY
+from horuslp.core.utils import get_model_rows
+
+
+def _power_of_two(factor):
+    """
+    Rounds a scaling factor to the nearest power of two, so scaling doesn't introduce any rounding errors.
+    :float factor: the scaling factor
+    :returns float: the rounded factor
+    """
+    return 2.0 ** round(math.log(factor, 2))
+
+
+def _coefficient_ratio(entries, row_factors, column_factors):
+    """
+    :list<tuple> entries: the (row index, column, coefficient) entries of the matrix
+    :list<float> row_factors: the scaling factors of the rows
+    :dictionary column_factors: the scaling factors of the columns
+    :returns float: the ratio of the largest to the smallest magnitude of the scaled coefficients
+    """
+    magnitudes = [abs(coef) * row_factors[i] * column_factors[var] for i, var, coef in entries]
+    if not magnitudes:
+        return 1.0
+    return max(magnitudes) / min(magnitudes)
+
+
+class ScaledProblem:
+    """
+    The scaling factors of the rows and the columns of a model. Row i is multiplied by its factor r, and column j
+    is replaced by a scaled column x' = x / c, so the scaled coefficients are r * a * c. Only continuous columns
+    are scaled, to keep the integer columns integral. The factors are computed once, and a scaled copy of the model
+    is built from the current rows before every solve, so rows that are changed or added in between are accounted
+    for. Rows without a factor are left unscaled.
+    """
+
+    def __init__(self, original):
+        """
+        :LPProblem original: the built model to scale
+        """
+        self.original = original
+        # the factors of the rows are keyed by the rows of the original model
+        self.row_factors = {}
+        self.column_factors = {}
+        self.scaled = None
+        self.row_map = OrderedDict()
+        self.column_map = OrderedDict()
+        self.stats = OrderedDict([
+            ('scaled_rows', 0),
+            ('scaled_columns', 0),
+            ('ratio_before', 1.0),
+            ('ratio_after', 1.0)
+        ])
+
+    def compute(self, passes=4):
+        """
+        Computes the scaling factors with geometric mean scaling: in every pass, each row and then each column is
+        divided by the geometric mean of its smallest and largest coefficient magnitudes. The factors are then
+        rounded to powers of two. If the scaling doesn't reduce the ratio of the largest to the smallest
+        coefficient, the model is left unscaled.
+
+        :int passes: the number of scaling passes
+        """
+        rows = get_model_rows(self.original)
+        entries = [(i, var, coef) for i, row in enumerate(rows) for var, coef in row.items() if coef]
+        row_entries = [[] for _ in rows]
+        column_entries = OrderedDict()
+        for entry in entries:
+            row_entries[entry[0]].append(entry)
+            column_entries.setdefault(entry[1], []).append(entry)
+        row_factors = [1.0] * len(rows)
+        column_factors = dict.fromkeys(column_entries, 1.0)
+        self.stats['ratio_before'] = _coefficient_ratio(entries, row_factors, column_factors)
+        for _ in range(passes):
+            for i, row in enumerate(row_entries):
+                if row:
+                    magnitudes = [abs(coef) * column_factors[var] for _, var, coef in row]
+                    row_factors[i] = 1.0 / math.sqrt(min(magnitudes) * max(magnitudes))
+            for var, column in column_entries.items():
+                if var.cat == pl.LpContinuous:
+                    magnitudes = [abs(coef) * row_factors[i] for i, _, coef in column]
+                    column_factors[var] = 1.0 / math.sqrt(min(magnitudes) * max(magnitudes))
+        row_factors = [_power_of_two(factor) for factor in row_factors]
+        column_factors = {var: _power_of_two(factor) for var, factor in column_factors.items()}
+        ratio = _coefficient_ratio(entries, row_factors, column_factors)
+        if ratio >= self.stats['ratio_before']:
+            self.stats['ratio_after'] = self.stats['ratio_before']
+            return
+        self.stats['ratio_after'] = ratio
+        self.row_factors = {row: factor for row, factor in zip(rows, row_factors) if factor != 1}
+        self.column_factors = {var: factor for var, factor in column_factors.items() if factor != 1}
+        self.stats['scaled_rows'] = len(self.row_factors)
+        self.stats['scaled_columns'] = len(self.column_factors)
+
+    def scale(self):
+        """
+        Builds the scaled copy of the model from its current rows. The right hand sides of free rows, which are
+        infinite, are left as they are.
+        :returns LPProblem: the scaled model
+        """
+        self.column_map = OrderedDict()
+        for var, factor in self.column_factors.items():
+            self.column_map[var] = pl.LpVariable(var.name,
+                                                 None if var.lowBound is None else var.lowBound / factor,
+                                                 None if var.upBound is None else var.upBound / factor,
+                                                 var.cat)
+        scaled = pl.LpProblem(self.original.name, self.original.sense)
+        if self.original.objective is not None:
+            objective = pl.LpAffineExpression(constant=self.original.objective.constant)
+            for var, coef in self.original.objective.items():
+                objective[self.column_map.get(var, var)] = coef * self.column_factors.get(var, 1)
+            scaled += objective
+        self.row_map = OrderedDict()
+        for row in get_model_rows(self.original):
+            factor = self.row_factors.get(row, 1)
+            expr = pl.LpAffineExpression([
+                (self.column_map.get(var, var), coef * factor * self.column_factors.get(var, 1))
+                for var, coef in row.items()
+            ])
+            rhs = -row.constant
+            scaled_row = pl.LpConstraint(expr, row.sense, row.name, rhs if abs(rhs) >= INFINITY else rhs * factor)
+            scaled += scaled_row
+            self.row_map[row] = (row, scaled_row, factor)
+        self.scaled = scaled
+        return scaled
+
+    def unscale(self):
+        """
+        Maps the solution of the scaled model back onto the original model: the values of the scaled columns are
+        multiplied by their factors and their reduced costs divided by them, and the duals of the scaled rows are
+        multiplied by their factors and their slacks divided by them.
+        """
+        for var, scaled_var in self.column_map.items():
+            factor = self.column_factors[var]
+            var.varValue = None if scaled_var.varValue is None else scaled_var.varValue * factor
+            var.dj = None if scaled_var.dj is None else scaled_var.dj / factor
+        for row, scaled_row, factor in self.row_map.values():
+            row.pi = None if scaled_row.pi is None else scaled_row.pi * factor
+            row.slack = None if scaled_row.slack is None else scaled_row.slack / factor
+        self.original.status = self.scaled.status
+        if hasattr(self.scaled, 'sol_status'):
+            self.original.sol_status = self.scaled.sol_status
+
+
+def scale_problem(prob, passes=4):
+    """
+    Computes the scaling factors of the built model.
+    :LPProblem prob: the built model
+    :int passes: the number of scaling passes
+    :returns ScaledProblem: the scaled problem, call scale on it to build the scaled model
+    """
+    scaled = ScaledProblem(prob)
+    scaled.compute(passes)
+    return scaled
@@ -0,0 +1,206 @@
+"""
+Serialization of built PuLP models into a compact binary format, so they can be sent to other processes without
+pickling the PuLP objects themselves. The format holds the column bounds and types, the constraint matrix in
+compressed sparse row form, the right hand sides, the objective, a names table and an optional layout encoded as JSON.
+The packed model can be written to a file or placed in shared memory, and it is read back through memory views over
+the mapped buffer, so the numeric arrays are never copied before the model is rebuilt.
+"""
+import json
+import mmap
+import struct
+from array import array
+from multiprocessing import shared_memory
+
+import pulp as pl
+
+from horuslp.core.utils import get_model_rows
+
+_MAGIC = b'HLPM'
+_VERSION = 2
+# magic, version, sense, columns, rows, non zeros, objective non zeros, objective constant, names size, layout size
+_HEADER = struct.Struct('<4sHbxIIQIxxxxdQQ')
+_CATEGORIES = (pl.LpContinuous, pl.LpInteger)
+
+
+def _encode_layout(data):
+    """
+    Converts the layout into JSON compatible data. Tuples and dictionaries are tagged, so that tuple keys and
+    dictionaries with keys other than strings survive the round trip.
+    :object data: the layout, made of None, booleans, numbers, strings, lists, tuples and dictionaries
+    :returns object: the JSON compatible data
+    """
+    if data is None or isinstance(data, (bool, int, float, str)):
+        return data
+    if isinstance(data, list):
+        return [_encode_layout(item) for item in data]
+    if isinstance(data, tuple):
+        return {'tuple': [_encode_layout(item) for item in data]}
+    if isinstance(data, dict):
+        return {'dict': [[_encode_layout(key), _encode_layout(value)] for key, value in data.items()]}
+    raise TypeError('%s objects can not be stored in a model layout' % type(data).__name__)
+
+
+def _decode_layout(data):
+    """
+    Reverses _encode_layout.
+    :object data: the decoded JSON data
+    :returns object: the layout
+    """
+    if isinstance(data, list):
+        return [_decode_layout(item) for item in data]
+    if isinstance(data, dict):
+        if 'tuple' in data:
+            return tuple(_decode_layout(item) for item in data['tuple'])
+        return {_decode_layout(key): _decode_layout(value) for key, value in data['dict']}
+    return data
+
+
+def pack_model(prob, layout=None):
+    """
+    Packs the model into the binary model format. The columns are stored in the order of prob.variables(). All the
+    8 byte arrays come first so that every array in the buffer is aligned.
+
+    :LPProblem prob: the built model
+    :object layout: optional data stored along with the model, such as the mapping of the rows to the constraints
+    that created them. It can be made of None, booleans, numbers, strings, lists, tuples and dictionaries
+    :returns bytes: the packed model
+    """
+    variables = prob.variables()
+    index = {var.name: i for i, var in enumerate(variables)}
+    rows = get_model_rows(prob)
+    lower = array('d', (-float('inf') if var.lowBound is None else var.lowBound for var in variables))
+    upper = array('d', (float('inf') if var.upBound is None else var.upBound for var in variables))
+    categories = array('b', (_CATEGORIES.index(var.cat) for var in variables))
+    row_ptr = array('q', [0])
+    col_idx = array('i')
+    values = array('d')
+    rhs = array('d')
+    senses = array('b')
+    for row in rows:
+        for var, coef in row.items():
+            col_idx.append(index[var.name])
+            values.append(coef)
+        row_ptr.append(len(col_idx))
+        rhs.append(-row.constant)
+        senses.append(row.sense)
+    objective = prob.objective if prob.objective is not None else pl.LpAffineExpression()
+    obj_idx = array('i')
+    obj_values = array('d')
+    for var, coef in objective.items():
+        obj_idx.append(index[var.name])
+        obj_values.append(coef)
+    names = [prob.name] + [var.name for var in variables] + [row.name or '' for row in rows]
+    names = '\0'.join(names).encode('utf-8')
+    layout_data = b'' if layout is None else json.dumps(_encode_layout(layout)).encode('utf-8')
+    header = _HEADER.pack(_MAGIC, _VERSION, prob.sense, len(variables), len(rows), len(col_idx), len(obj_idx),
+                          objective.constant, len(names), len(layout_data))
+    parts = [lower, upper, rhs, values, obj_values, row_ptr, col_idx, obj_idx, categories, senses]
+    return b''.join([header] + [part.tobytes() for part in parts] + [names, layout_data])
+
+
+def unpack_model(buffer, var_lookup=None):
+    """
+    Rebuilds a PuLP model from a buffer holding a packed model. The arrays are read through memory views over the
+    buffer, so a memory mapped file or a shared memory block is read in place.
+
+    :bytes-like buffer: the packed model
+    :dictionary var_lookup: dictionary of existing LpVariables keyed by their name. Columns found in it are bound to
+    the existing variables, the others are created anew.
+    :returns tuple<LPProblem, list<LpVariable>, object>: the model, its variables in the packed column order and the
+    layout stored with the model
+    """
+    var_lookup = {} if var_lookup is None else var_lookup
+    views = [memoryview(buffer)]
+    try:
+        magic, version, sense, ncols, nrows, nnz, obj_nnz, obj_constant, names_size, layout_size = \
+            _HEADER.unpack_from(views[0])
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('The buffer does not hold a packed HorusLP model')
+        offset = _HEADER.size
+
+        def read_array(type_code, count):
+            nonlocal offset
+            size = array(type_code).itemsize * count
+            views.append(views[0][offset:offset + size].cast(type_code))
+            offset += size
+            return views[-1]
+
+        lower, upper = read_array('d', ncols), read_array('d', ncols)
+        rhs, values, obj_values = read_array('d', nrows), read_array('d', nnz), read_array('d', obj_nnz)
+        row_ptr, col_idx, obj_idx = read_array('q', nrows + 1), read_array('i', nnz), read_array('i', obj_nnz)
+        categories, senses = read_array('b', ncols), read_array('b', nrows)
+        name, *names = bytes(views[0][offset:offset + names_size]).decode('utf-8').split('\0')
+        offset += names_size
+        layout_data = bytes(views[0][offset:offset + layout_size]).decode('utf-8')
+        layout = _decode_layout(json.loads(layout_data)) if layout_size else None
+
+        variables = []
+        for i in range(ncols):
+            var = var_lookup.get(names[i])
+            if var is None:
+                var = pl.LpVariable(names[i], None if lower[i] == -float('inf') else lower[i],
+                                    None if upper[i] == float('inf') else upper[i], _CATEGORIES[categories[i]])
+            variables.append(var)
+        prob = pl.LpProblem(name, sense)
+        prob += pl.LpAffineExpression([(variables[i], coef) for i, coef in zip(obj_idx, obj_values)], obj_constant)
+        for r in range(nrows):
+            start, end = row_ptr[r], row_ptr[r + 1]
+            terms = zip(col_idx[start:end], values[start:end])
+            expr = pl.LpAffineExpression([(variables[i], coef) for i, coef in terms])
+            prob += pl.LpConstraint(expr, senses[r], names[ncols + r] or None, rhs[r])
+        return prob, variables, layout
+    finally:
+        for view in reversed(views):
+            view.release()
+
+
+def save_model(prob, path, layout=None):
+    """
+    Packs the model and writes it to a file.
+    :LPProblem prob: the built model
+    :string path: the path of the file
+    :object layout: optional data stored along with the model, see pack_model
+    """
+    with open(path, 'wb') as model_file:
+        model_file.write(pack_model(prob, layout))
+
+
+def load_model(path, var_lookup=None):
+    """
+    Memory maps a file written by save_model and rebuilds the model from it.
+    :string path: the path of the file
+    :dictionary var_lookup: dictionary of existing LpVariables keyed by their name, see unpack_model
+    :returns tuple<LPProblem, list<LpVariable>, object>: the model, its variables and its layout
+    """
+    with open(path, 'rb') as model_file:
+        with mmap.mmap(model_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return unpack_model(mapped, var_lookup)
+
+
+def share_model(prob, layout=None):
+    """
+    Packs the model into a new shared memory block, which other processes can attach to by its name. The caller
+    owns the block and has to close and unlink it once the other processes are done with it.
+
+    :LPProblem prob: the built model
+    :object layout: optional data stored along with the model, see pack_model
+    :returns SharedMemory: the shared memory block holding the packed model
+    """
+    data = pack_model(prob, layout)
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    block.buf[:len(data)] = data
+    return block
+
+
+def attach_model(name, var_lookup=None):
+    """
+    Rebuilds the model from a shared memory block created by share_model.
+    :string name: the name of the shared memory block
+    :dictionary var_lookup: dictionary of existing LpVariables keyed by their name, see unpack_model
+    :returns tuple<LPProblem, list<LpVariable>, object>: the model, its variables and its layout
+    """
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return unpack_model(block.buf, var_lookup)
+    finally:
+        block.close()
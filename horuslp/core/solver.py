@@ -0,0 +1,319 @@
+"""
+Utilities for running the CBC solver directly rather than through the PuLP solve function, for the solve paths that
+need to follow the solver output while it runs.
+"""
+import copy
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+
+import pulp as pl
+
+# CBC prints this as the objective when there is no incumbent yet
+NO_SOLUTION = 1e50
+
+_NODE_LINE = re.compile(r'Cbc0010I After (\d+) nodes, \d+ on tree, (\S+) best solution, best possible (\S+) '
+                        r'\(([\d.]+) seconds\)')
+_SOLUTION_LINE = re.compile(r'Cbc00\d\dI Integer solution of (\S+) found .*?(\d+) nodes \(([\d.]+) seconds\)')
+_COMPLETED_LINE = re.compile(r'Cbc0001I Search completed - best objective (\S+), took \d+ iterations and (\d+) nodes '
+                             r'\(([\d.]+) seconds\)')
+_RELAXATION_LINE = re.compile(r'Continuous objective value is (\S+) - ([\d.]+) seconds')
+
+
+class ProgressEvent:
+    """
+    A structured progress report parsed from the solver log. Values that haven't been reported yet are None.
+    """
+
+    def __init__(self, elapsed, incumbent, bound, nodes, line):
+        """
+        :float elapsed: the solve time reported by the solver, in seconds
+        :float incumbent: the objective value of the best solution found so far
+        :float bound: the best possible objective value
+        :int nodes: the number of branch and bound nodes explored
+        :string line: the log line the event was parsed from
+        """
+        self.elapsed = elapsed
+        self.incumbent = incumbent
+        self.bound = bound
+        self.nodes = nodes
+        self.line = line
+
+    @property
+    def gap(self):
+        """
+        :returns float: the relative gap between the incumbent and the bound, or None if either is unknown
+        """
+        if self.incumbent is None or self.bound is None:
+            return None
+        return abs(self.incumbent - self.bound) / max(abs(self.incumbent), 1e-10)
+
+    def __repr__(self):
+        return 'ProgressEvent(elapsed=%r, incumbent=%r, bound=%r, gap=%r, nodes=%r)' % (
+            self.elapsed, self.incumbent, self.bound, self.gap, self.nodes)
+
+
+class CbcLogParser:
+    """
+    Turns the lines of the CBC log into progress events. CBC minimizes internally, so the objective values in the
+    branch and bound lines are flipped back for maximization problems.
+    """
+
+    def __init__(self, maximize=False):
+        """
+        :boolean maximize: whether the problem is a maximization problem
+        """
+        self.sign = -1 if maximize else 1
+        self.incumbent = None
+        self.bound = None
+        self.nodes = 0
+        self.elapsed = 0.0
+
+    def _objective(self, value, internal=True):
+        """
+        :string value: the objective value as printed by CBC
+        :boolean internal: whether the value is in the internal minimization sense of CBC
+        :returns float: the objective value in the sense of the problem, or None if there is no solution
+        """
+        value = float(value)
+        if abs(value) >= NO_SOLUTION:
+            return None
+        return self.sign * value if internal else value
+
+    def parse(self, line):
+        """
+        Parses a single line of the log.
+        :string line: the log line
+        :returns ProgressEvent: the progress event, or None if the line doesn't report progress
+        """
+        line = line.strip()
+        match = _NODE_LINE.search(line)
+        if match:
+            self.nodes = int(match.group(1))
+            self.incumbent = self._objective(match.group(2))
+            self.bound = self._objective(match.group(3))
+            self.elapsed = float(match.group(4))
+            return self.event(line)
+        match = _SOLUTION_LINE.search(line) or _COMPLETED_LINE.search(line)
+        if match:
+            self.incumbent = self._objective(match.group(1))
+            self.nodes = int(match.group(2))
+            self.elapsed = float(match.group(3))
+            return self.event(line)
+        match = _RELAXATION_LINE.search(line)
+        if match:
+            self.bound = self._objective(match.group(1), internal=False)
+            self.elapsed = float(match.group(2))
+            return self.event(line)
+        return None
+
+    def event(self, line):
+        """
+        :string line: the log line the event is created from
+        :returns ProgressEvent: an event holding the latest known values
+        """
+        return ProgressEvent(self.elapsed, self.incumbent, self.bound, self.nodes, line)
+
+
+def default_cbc_solver():
+    """
+    :returns COIN_CMD: the PuLP CBC command solver used when none is given
+    """
+    if isinstance(pl.LpSolverDefault, pl.COIN_CMD):
+        return pl.LpSolverDefault
+    return pl.PULP_CBC_CMD(msg=0)
+
+
+def apply_limits(solver=None, time_limit=None, rel_gap=None, abs_gap=None, node_limit=None):
+    """
+    Sets the termination limits on a copy of a PuLP solver. The limits are passed as the standard PuLP solver
+    options, so any solver that supports them applies them. The solver stops at the first limit that is reached and
+    reports the best solution found so far.
+
+    :LpSolver solver: the solver to set the limits on, defaults to the bundled CBC
+    :float time_limit: the maximum number of seconds to solve for
+    :float rel_gap: the relative gap between the incumbent and the bound to stop at
+    :float abs_gap: the absolute gap between the incumbent and the bound to stop at
+    :int node_limit: the maximum number of branch and bound nodes
+    :returns LpSolver: the solver with the limits
+    """
+    solver = copy.copy(default_cbc_solver() if solver is None else solver)
+    options = dict(getattr(solver, 'optionsDict', {}))
+    for option, value in (('gapRel', rel_gap), ('gapAbs', abs_gap), ('maxNodes', node_limit)):
+        if value is not None:
+            options[option] = value
+    solver.optionsDict = options
+    if time_limit is not None:
+        solver.timeLimit = time_limit
+    return solver
+
+
+class CbcRun:
+    """
+    A single run of the CBC executable on a PuLP model. Writes the model and builds the command line the same way as
+    the PuLP CBC solver, so that the caller can start the process itself and follow its output, then reads the
+    solution back into the model.
+    """
+
+    def __init__(self, lp, solver=None):
+        """
+        :LPProblem lp: the model to solve
+        :COIN_CMD solver: the PuLP CBC solver holding the path and options, defaults to the bundled CBC
+        """
+        self.lp = lp
+        self.solver = default_cbc_solver() if solver is None else solver
+        assert isinstance(self.solver, pl.COIN_CMD), 'solver must be a PuLP CBC command solver'
+        self.files = None
+        self.model_names = None
+        self.objective_fix = None
+        self.start_time = None
+
+    def prepare(self):
+        """
+        Writes the model to a temporary MPS file.
+        :returns list<string>: the command line arguments to start the solver with
+        """
+        tmp_mps, tmp_sol = self.solver.create_tmp_files(self.lp.name, 'mps', 'sol')
+        self.files = (tmp_mps, tmp_sol)
+        self.objective_fix = self.lp.fixObjective()
+        self.model_names = self.lp.writeMPS(tmp_mps, rename=1)[:3]
+        args = [self.solver.path, tmp_mps]
+        if self.lp.sense == pl.LpMaximize:
+            args.append('-max')
+        time_limit = getattr(self.solver, 'timeLimit', None)
+        if time_limit is not None:
+            args.extend(['-sec', str(time_limit)])
+        options = list(self.solver.options)
+        if hasattr(self.solver, 'getOptions'):
+            options.extend(self.solver.getOptions())
+        for option in options:
+            args.extend(('-' + option).split())
+        args.append('-solve' if self.solver.mip else '-initialSolve')
+        args.extend(['-printingOptions', 'all', '-solution', tmp_sol])
+        self.start_time = time.time()
+        return args
+
+    def read_solution(self):
+        """
+        Reads the solution file written by the solver and assigns the values, duals and status to the model.
+        :returns int: the PuLP status of the model
+        """
+        tmp_mps, tmp_sol = self.files
+        try:
+            if not os.path.exists(tmp_sol):
+                raise pl.PulpSolverError('Pulp: Error while executing ' + self.solver.path)
+            variables, variable_names, constraint_names = self.model_names
+            solution = self.solver.readsol_MPS(tmp_sol, self.lp, variables, variable_names, constraint_names)
+            status, values, reduced_costs, shadow_prices, slacks = solution[:5]
+            self.lp.assignVarsVals(values)
+            self.lp.assignVarsDj(reduced_costs)
+            self.lp.assignConsPi(shadow_prices)
+            self.lp.assignConsSlack(slacks, activity=True)
+            if len(solution) > 5:
+                self.lp.assignStatus(status, solution[5])
+            else:
+                self.lp.assignStatus(status)
+            self.lp.solutionTime = time.time() - self.start_time
+            return status
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """
+        Removes the temporary files and restores the objective of the model.
+        """
+        if self.objective_fix is not None:
+            self.lp.restoreObjective(*self.objective_fix)
+            self.objective_fix = None
+        if self.files is not None:
+            for tmp_file in self.files:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+            self.files = None
+
+
+def check_log_solve_args(solve_args):
+    """
+    Checks that the solve arguments can be applied when CBC is run by a CbcProcess. The other arguments of the PuLP
+    solve function, such as warmStart, are passed to the PuLP solver classes and can't be applied to a run of the
+    executable.
+    :dictionary solve_args: the arguments of the solve
+    """
+    unsupported = sorted(set(solve_args) - {'solver'})
+    assert not unsupported, 'only the solver argument is supported when following the solver log, got %s' % \
+        ', '.join(unsupported)
+
+
+class CbcProcess:
+    """
+    Runs CBC on a model and follows its log, parsing the lines into progress events as they are written. This is the
+    run loop shared by the blocking and the asyncio solve paths: run blocks until the solver exits, so the asyncio
+    path calls it in an executor thread, and interrupt and kill can be called from any thread while it runs.
+    """
+
+    def __init__(self, lp, solver=None, maximize=False):
+        """
+        :LPProblem lp: the model to solve
+        :COIN_CMD solver: the PuLP CBC solver holding the path and options, defaults to the bundled CBC
+        :boolean maximize: whether the problem is a maximization problem, for the objective values of the log
+        """
+        self.cbc_run = CbcRun(lp, solver)
+        self.parser = CbcLogParser(maximize)
+        self.process = None
+        self.killed = False
+        self.interrupted = False
+        self.lock = threading.Lock()
+
+    def run(self, on_event=None):
+        """
+        Starts the solver, passes the progress events to on_event while it runs and reads the solution back into the
+        model once it exits. If on_event returns True, the solver is interrupted, after which it stops and writes out
+        the best solution found.
+        :function on_event: called with every ProgressEvent
+        :returns int: the PuLP status of the model
+        """
+        process = None
+        try:
+            args = self.cbc_run.prepare()
+            with self.lock:
+                if self.killed:
+                    raise pl.PulpSolverError('Pulp: the solver was stopped before it started')
+                process = self.process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                                          universal_newlines=True, errors='replace')
+            for line in process.stdout:
+                event = self.parser.parse(line)
+                if event is not None and on_event is not None and on_event(event):
+                    self.interrupt()
+            if process.wait() != 0 or self.killed:
+                raise pl.PulpSolverError('Pulp: Error while trying to execute ' + args[0])
+            return self.cbc_run.read_solution()
+        except BaseException:
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()
+            self.cbc_run.cleanup()
+            raise
+        finally:
+            if process is not None:
+                process.stdout.close()
+
+    def interrupt(self):
+        """
+        Asks the solver to stop and write out the best solution found.
+        """
+        with self.lock:
+            if self.process is not None and not self.interrupted and self.process.poll() is None:
+                self.process.send_signal(signal.SIGINT)
+                self.interrupted = True
+
+    def kill(self):
+        """
+        Stops the solver without a solution, run then raises a PulpSolverError.
+        """
+        with self.lock:
+            self.killed = True
+            if self.process is not None and self.process.poll() is None:
+                self.process.kill()
@@ -0,0 +1,270 @@
+"""
+Detection of interchangeable columns in the variable groups of a built model, and the ordering constraints that break
+the symmetry between them. Models of interchangeable resources, such as identical temp workers, have many equivalent
+optimal solutions, which makes branch and bound explore the same subtrees over and over.
+"""
+from collections import Counter, OrderedDict
+
+import pulp as pl
+
+from horuslp.core.utils import get_model_rows
+
+
+def _key_positions(keys):
+    """
+    :list keys: the keys of a variable group
+    :returns list: the positions of the key tuples, or [None] if the keys aren't tuples of the same length, in which
+    case the keys are swapped whole
+    """
+    lengths = set(len(key) if isinstance(key, tuple) else None for key in keys)
+    if len(lengths) != 1 or None in lengths:
+        return [None]
+    return list(range(lengths.pop()))
+
+
+def _key_part(key, position):
+    """
+    :object key: the key of a variable
+    :int position: the position in the key tuple, None for the whole key
+    :returns object: the part of the key at the position
+    """
+    return key if position is None else key[position]
+
+
+def _replace_key_part(key, position, value):
+    """
+    :object key: the key of a variable
+    :int position: the position in the key tuple, None for the whole key
+    :object value: the new part of the key
+    :returns object: the key with the part at the position replaced
+    """
+    return value if position is None else key[:position] + (value,) + key[position + 1:]
+
+
+class SymmetryClass:
+    """
+    A set of interchangeable values of a position of the keys of a variable group, for instance the ids of identical
+    workers. Exchanging any two of the values in the keys of the group, and in the keys of the linked groups, maps the
+    model onto itself, so the columns of the values can be put into any order without losing an optimal solution.
+    """
+
+    def __init__(self, group, position, values, columns, linked):
+        """
+        :string group: the name of the variable group
+        :int position: the position of the values in the key tuples, None if the values are the keys themselves
+        :list values: the interchangeable values, in key order
+        :dictionary columns: the variables of the group with each value in the position, keyed by the value
+        :list<tuple> linked: the (group, position) of the other groups whose keys are exchanged along with the values
+        """
+        self.group = group
+        self.position = position
+        self.values = values
+        self.columns = columns
+        self.linked = linked
+
+    def ordering_rows(self):
+        """
+        Orders the values by the sum of their columns, from the largest to the smallest. For single columns, this is
+        the order of the columns themselves.
+        :returns list<LPConstraint>: the ordering rows between consecutive values
+        """
+        sums = [pl.lpSum(self.columns[value]) for value in self.values]
+        return [first >= second for first, second in zip(sums, sums[1:])]
+
+    def __repr__(self):
+        return 'SymmetryClass(group=%r, position=%r, values=%r, linked=%r)' % (
+            self.group, self.position, self.values, self.linked)
+
+
+class SymmetryFinder:
+    """
+    Finds the symmetry classes of the variable groups of a built model. The values of a key position are first
+    bucketed by the types, bounds, costs and row coefficients of their columns, and the exchange of two values in the
+    same bucket is then verified against the rows of the model: every affected row has to be mapped onto a row with
+    the same coefficients, sense and right hand side. An exchange that is verified against a representative of a class
+    joins the class, and since these exchanges generate every reordering of the class, the class as a whole is
+    interchangeable.
+
+    Other groups that share rows with the group and whose keys range over the same values at a single position, such
+    as a group of hiring decisions keyed by the workers of an assignment group, are exchanged along with the values.
+    Every group position is broken at most once, either on its own or linked to an earlier one, so that the ordering
+    rows of the classes stay compatible with one another.
+    """
+
+    def __init__(self, prob, variables):
+        """
+        :LPProblem prob: the built model
+        :dictionary variables: the variables dictionary of the problem, the variable groups are searched for symmetries
+        """
+        self.groups = OrderedDict((name, group) for name, group in variables.items()
+                                  if isinstance(group, dict) and len(group) > 1)
+        objective = prob.objective if prob.objective is not None else {}
+        self.costs = {var.name: coef for var, coef in objective.items()}
+        self.rows = []
+        self.column_rows = {}
+        for row in get_model_rows(prob):
+            terms = {var.name: coef for var, coef in row.items() if coef}
+            self.rows.append((row.sense, row.constant, terms))
+            for name in terms:
+                self.column_rows.setdefault(name, []).append(len(self.rows) - 1)
+        self.value_keys = OrderedDict()
+        for name, group in self.groups.items():
+            for position in _key_positions(list(group.keys())):
+                keys = OrderedDict()
+                for key in group.keys():
+                    keys.setdefault(_key_part(key, position), []).append(key)
+                if len(keys) > 1:
+                    self.value_keys[name, position] = keys
+
+    def column_invariant(self, var):
+        """
+        :LpVariable var: a column of the model
+        :returns tuple: the properties of the column that an exchange has to preserve
+        """
+        rows = Counter((self.rows[i][0], self.rows[i][1], self.rows[i][2][var.name])
+                       for i in self.column_rows.get(var.name, []))
+        return var.cat, var.lowBound, var.upBound, self.costs.get(var.name, 0), frozenset(rows.items())
+
+    def exchange(self, domains, first, second):
+        """
+        Builds the column mapping of the exchange of two values.
+        :list<tuple> domains: the (group, position) to exchange the values in
+        :object first: the first value
+        :object second: the second value
+        :returns dictionary: the names of the columns mapped to the names of their images, None if some of the keys
+        have no image
+        """
+        mapping = {}
+        for group_name, position in domains:
+            group = self.groups[group_name]
+            keys = self.value_keys[group_name, position]
+            for value, image in ((first, second), (second, first)):
+                for key in keys[value]:
+                    image_key = _replace_key_part(key, position, image)
+                    if image_key not in group:
+                        return None
+                    mapping[group[key].name] = group[image_key].name
+        return mapping
+
+    def is_symmetry(self, domains, first, second):
+        """
+        :list<tuple> domains: the (group, position) to exchange the values in
+        :object first: the first value
+        :object second: the second value
+        :returns boolean: whether exchanging the values maps the model onto itself
+        """
+        mapping = self.exchange(domains, first, second)
+        if mapping is None:
+            return False
+        columns = {var.name: var for group_name, _ in domains for var in self.groups[group_name].values()}
+        for name, image in mapping.items():
+            var, image_var = columns[name], columns[image]
+            if (var.cat, var.lowBound, var.upBound, self.costs.get(name, 0)) != \
+                    (image_var.cat, image_var.lowBound, image_var.upBound, self.costs.get(image, 0)):
+                return False
+        affected = set(i for name in mapping for i in self.column_rows.get(name, []))
+        rows = Counter()
+        images = Counter()
+        for i in affected:
+            sense, constant, terms = self.rows[i]
+            rows[sense, constant, frozenset(terms.items())] += 1
+            images[sense, constant, frozenset((mapping.get(name, name), coef) for name, coef in terms.items())] += 1
+        return rows == images
+
+    def linkable_domains(self, domain, processed):
+        """
+        :tuple domain: the (group, position) whose values are exchanged
+        :set<tuple> processed: the group positions that have already been broken, which can't be linked
+        :returns list<tuple>: the (group, position) of the other groups that share rows with the group, and have the
+        same values at a single position
+        """
+        values = set(self.value_keys[domain].keys())
+        neighbours = set(name for var in self.groups[domain[0]].values()
+                         for i in self.column_rows.get(var.name, []) for name in self.rows[i][2])
+        candidates = OrderedDict()
+        for other_domain, keys in self.value_keys.items():
+            if other_domain[0] == domain[0] or other_domain in processed or set(keys.keys()) != values:
+                continue
+            if any(var.name in neighbours for var in self.groups[other_domain[0]].values()):
+                candidates.setdefault(other_domain[0], []).append(other_domain)
+        return [domains[0] for domains in candidates.values() if len(domains) == 1]
+
+    def find_classes(self, domain, processed):
+        """
+        Finds the symmetry classes of a group position.
+        :tuple domain: the (group, position) to search
+        :set<tuple> processed: the group positions that have already been broken
+        :returns list<SymmetryClass>: the classes with more than one value
+        """
+        group_name, position = domain
+        group = self.groups[group_name]
+        keys = self.value_keys[domain]
+        linked = self.linkable_domains(domain, processed)
+        buckets = OrderedDict()
+        for value, value_keys in keys.items():
+            invariant = frozenset(Counter(self.column_invariant(group[key]) for key in value_keys).items())
+            buckets.setdefault(invariant, []).append(value)
+        classes = []
+        for values in buckets.values():
+            bucket_classes = []
+            for value in values:
+                for value_class in bucket_classes:
+                    if linked and self.is_symmetry([domain] + linked, value_class[0][0], value):
+                        value_class[0].append(value)
+                        value_class[1].update(linked)
+                        break
+                    if self.is_symmetry([domain], value_class[0][0], value):
+                        value_class[0].append(value)
+                        break
+                else:
+                    bucket_classes.append(([value], set()))
+            classes.extend(bucket_classes)
+        symmetries = []
+        for values, used_links in classes:
+            if len(values) > 1:
+                columns = OrderedDict((value, [group[key] for key in keys[value]]) for value in values)
+                symmetries.append(SymmetryClass(group_name, position, values, columns,
+                                                [link for link in linked if link in used_links]))
+        return symmetries
+
+    def find(self):
+        """
+        :returns list<SymmetryClass>: the symmetry classes of all the group positions
+        """
+        symmetries = []
+        processed = set()
+        for domain in self.value_keys:
+            if domain in processed:
+                continue
+            processed.add(domain)
+            classes = self.find_classes(domain, processed)
+            for symmetry in classes:
+                processed.update(symmetry.linked)
+            symmetries.extend(classes)
+        return symmetries
+
+
+def find_symmetries(prob, variables):
+    """
+    Finds the interchangeable values of the keys of the variable groups of a built model, see SymmetryFinder.
+    :LPProblem prob: the built model
+    :dictionary variables: the variables dictionary of the problem
+    :returns list<SymmetryClass>: the symmetry classes
+    """
+    return SymmetryFinder(prob, variables).find()
+
+
+def add_symmetry_breaking(prob, symmetries):
+    """
+    Adds the ordering rows of the symmetry classes to the model.
+    :LPProblem prob: the built model
+    :list<SymmetryClass> symmetries: the symmetry classes to break
+    :returns list<LPConstraint>: the added rows
+    """
+    rows = []
+    for symmetry in symmetries:
+        for row in symmetry.ordering_rows():
+            row.name = 'symmetry_breaking_%d' % len(rows)
+            prob += row
+            rows.append(row)
+    return rows
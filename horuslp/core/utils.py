@@ -2,7 +2,22 @@
 Utility functions for the library to support some syntax sugar and reporting functionality
 """
 import inspect
+import re
+import warnings
 import pulp as pl
+from collections import OrderedDict
+
+_NAME_CHARS = re.compile(r'\W')
+
+
+class SparseValues(dict):
+    """
+    The values of a variable group that are stored sparsely. Only the nonzero values are held, and looking up any
+    other key returns zero. Iterating over the dictionary only visits the nonzero values.
+    """
+
+    def __missing__(self, key):
+        return 0
 
 
 def get_constraints_value(constr):
@@ -32,3 +47,121 @@ def call_with_required_args(func, arg_dict):
     else:
         required_args = arg_dict
     return func(**required_args)
+
+
+def iterate_variables(variables):
+    """
+    Walks through the variables dictionary and yields every individual LpVariable, including the ones inside of
+    variable groups.
+
+    :dictionary variables: the variables dictionary as created by the VariableManager
+    :returns generator<LpVariable>: the individual variables
+    """
+    for var in variables.values():
+        if isinstance(var, dict):
+            for group_var in var.values():
+                yield group_var
+        else:
+            yield var
+
+
+def serialize_constraint(constr):
+    """
+    Converts a constraint expression into a plain coefficient block so that it can be sent between processes without
+    pickling the PuLP objects.
+
+    :LPConstraint constr: The constraint expression. True and None are passed through untouched, and the rows of a
+    constraint family are serialized one by one.
+    :returns tuple: (terms, sense, constant), where terms is a list of (variable name, coefficient) tuples
+    """
+    if constr is True or constr is None:
+        return constr
+    if is_constraint_group(constr):
+        return OrderedDict((key, serialize_constraint(row)) for key, row in constr.items())
+    return [(var.name, weight) for var, weight in constr.items()], constr.sense, constr.constant
+
+
+def deserialize_constraint(block, var_lookup):
+    """
+    Rebuilds the constraint expression from a coefficient block created by serialize_constraint.
+
+    :tuple block: the (terms, sense, constant) coefficient block, or a dictionary of them for constraint families
+    :dictionary var_lookup: dictionary of the LpVariables keyed by their name
+    :returns LPConstraint: the constraint expression bound to the variables in var_lookup
+    """
+    if block is True or block is None:
+        return block
+    if isinstance(block, dict):
+        return OrderedDict((key, deserialize_constraint(row, var_lookup)) for key, row in block.items())
+    terms, sense, constant = block
+    expr = pl.LpAffineExpression([(var_lookup[var_name], weight) for var_name, weight in terms], constant)
+    return pl.LpConstraint(expr, sense)
+
+
+def is_constraint_group(constr):
+    """
+    Checks whether an implemented constraint is the group of rows of a constraint family rather than a single row.
+    :object constr: the implemented constraint
+    :returns boolean: True if the constraint is a group of rows
+    """
+    return isinstance(constr, dict) and not isinstance(constr, pl.LpAffineExpression)
+
+
+def collect_rows(rows):
+    """
+    Collects the rows yielded by a constraint family into an ordered dictionary keyed by the row keys. Rows that
+    are True are trivially satisfied and are left out.
+    :iterable<tuple>/dictionary rows: the (key, expression) pairs, or a dictionary of the expressions
+    :returns OrderedDict: the rows of the family
+    """
+    if isinstance(rows, dict):
+        rows = rows.items()
+    return OrderedDict((key, row) for key, row in rows if row is not True and row is not None)
+
+
+def add_family_row(prob, name, key, row):
+    """
+    Adds a row of a constraint family to a PuLP model, named after the family and the row key, so the row can be
+    found in the written model files and in the solver logs. The row is named <name>_<key>_: the parts of a tuple key
+    are joined with underscores, and the characters of the key other than letters, digits and underscores are
+    replaced by underscores. If two keys end up with the same name, a counter is appended, as in <name>_<key>_1_.
+    For instance, the key (1, 'a b') of the family Family gives the row Family_1_a_b_.
+    :LPProblem prob: the PuLP model
+    :string name: the name of the constraint family
+    :object key: the key of the row
+    :LPConstraint row: the row
+    """
+    key_name = _NAME_CHARS.sub('_', '_'.join(str(part) for part in key) if isinstance(key, tuple) else str(key))
+    row_name = '%s_%s_' % (name, key_name)
+    duplicates = 0
+    while True:
+        try:
+            prob.addConstraint(row, row_name)
+            return
+        except pl.PulpError:
+            duplicates += 1
+            row_name = '%s_%s_%d_' % (name, key_name, duplicates)
+
+
+def get_model_rows(prob):
+    """
+    Lists the constraint rows of a PuLP model.
+    :LPProblem prob: the PuLP model
+    :returns list<LPConstraint>: the rows of the model
+    """
+    return prob.constraints()
+
+
+def remove_model_row(prob, name):
+    """
+    Removes a constraint row from a PuLP model by its name. PuLP still supports deleting from the constraints
+    mapping, although it deprecates it, so an error is raised once a version of PuLP drops it.
+    :LPProblem prob: the PuLP model
+    :string name: the name of the row
+    """
+    constraints = prob.constraints
+    if not hasattr(constraints, '__delitem__'):
+        raise NotImplementedError('this version of PuLP does not support removing rows from a model')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        del constraints[name]
@@ -1,6 +1,6 @@
 import pytest
 
-from horuslp.core.Constraint import Constraint
+from horuslp.core.Constraint import Constraint, ConstraintFamily, LazyConstraint
 
 
 def test_constraint_initialization():
@@ -10,6 +10,7 @@ def test_constraint_initialization():
     constr = TestConstraint()
     assert constr.name == 'TestConstraint'
     assert constr.dependent_constraints == []
+    assert constr.block is None
     assert constr.define()
 
 
@@ -37,3 +38,27 @@ def test_add_constraint():
 
     constr.add_dependent_constraint(DependentConstraint)
     assert constr.dependent_constraints == [DependentConstraint]
+
+
+def test_constraint_family_initialization():
+    class TestFamily(ConstraintFamily):
+        pass
+
+    family = TestFamily()
+    assert family.name == 'TestFamily'
+    assert family.dependent_constraints == []
+    with pytest.raises(NotImplementedError):
+        family.define()
+
+
+def test_lazy_constraint():
+    class TestLazyConstraint(LazyConstraint):
+        pass
+
+    constr = TestLazyConstraint()
+    assert constr.name == 'TestLazyConstraint'
+    assert dict(constr.define()) == {}
+    with pytest.raises(NotImplementedError):
+        constr.separate()
+    with pytest.raises(NotImplementedError):
+        constr.define_row('key')
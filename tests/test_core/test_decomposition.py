@@ -0,0 +1,147 @@
+import pulp as pl
+import pytest
+
+from horuslp.core import Constraint, ObjectiveComponent, VariableManager, Problem
+from horuslp.core.Decomposition import LagrangianRelaxation
+from horuslp.core.SolverPool import SolverPool
+from horuslp.core.Variables import BinaryVariableGroup, VariableGroup
+from horuslp.core.constants import MAXIMIZE
+
+ITEMS = {'figurine': (7, 4), 'horn': (10, 10), 'leatherman': (10, 3), 'camera': (5, 2)}
+SOLVE_ARGS = {'solver': pl.PULP_CBC_CMD(msg=0)}
+
+
+class TwoBagVariables(VariableManager):
+    vars = [
+        BinaryVariableGroup('suitcase', list(ITEMS)),
+        BinaryVariableGroup('bag', list(ITEMS))
+    ]
+
+
+class SuitcaseCapacity(Constraint):
+    block = 'suitcase'
+
+    def define(self, suitcase):
+        return sum(suitcase[name] * weight for name, (value, weight) in ITEMS.items()) <= 12
+
+
+class BagCapacity(Constraint):
+    block = 'bag'
+
+    def define(self, bag):
+        return sum(bag[name] * weight for name, (value, weight) in ITEMS.items()) <= 9
+
+
+class Uniqueness(Constraint):
+    def define(self, suitcase, bag):
+        return sum(suitcase[name] + bag[name] for name in ITEMS) <= 4
+
+
+class TwoBagObjective(ObjectiveComponent):
+    def define(self, suitcase, bag):
+        return sum((suitcase[name] + bag[name]) * value for name, (value, weight) in ITEMS.items())
+
+
+class TwoBagProblem(Problem):
+    variables = TwoBagVariables
+    objective = TwoBagObjective
+    constraints = [SuitcaseCapacity, BagCapacity, Uniqueness]
+    sense = MAXIMIZE
+
+
+class CoverVariables(VariableManager):
+    vars = [
+        VariableGroup('a', ['x', 'y'], 0, 10),
+        VariableGroup('b', ['x', 'y'], 0, 10)
+    ]
+
+
+class ALimit(Constraint):
+    block = 'a'
+
+    def define(self, a):
+        return a['x'] + 2 * a['y'] <= 8
+
+
+class BLimit(Constraint):
+    block = 'b'
+
+    def define(self, b):
+        return 2 * b['x'] + b['y'] <= 8
+
+
+class Cover(Constraint):
+    def define(self, a, b):
+        return a['x'] + a['y'] + b['x'] + b['y'] >= 6
+
+
+class CoverObjective(ObjectiveComponent):
+    def define(self, a, b):
+        return 2 * a['x'] + 3 * a['y'] + 3 * b['x'] + 2 * b['y']
+
+
+class CoverProblem(Problem):
+    variables = CoverVariables
+    objective = CoverObjective
+    constraints = [ALimit, BLimit, Cover]
+
+
+class SharedBlockConstraint(Constraint):
+    block = 'b'
+
+    def define(self, a, b):
+        return a['x'] + b['x'] <= 4
+
+
+class SharedBlockProblem(CoverProblem):
+    constraints = [ALimit, BLimit, SharedBlockConstraint]
+
+
+def test_partition():
+    relaxation = LagrangianRelaxation(TwoBagProblem())
+    assert [row_id for row_id, row in relaxation.linking_rows] == [('Uniqueness', None)]
+    assert list(relaxation.block_rows.keys()) == ['suitcase', 'bag']
+    assert [var.name for var in relaxation.block_variables['bag']] == ['bag_camera_', 'bag_figurine_', 'bag_horn_',
+                                                                      'bag_leatherman_']
+    assert relaxation.multipliers == [0.0]
+
+
+def test_partition_shared_variable():
+    with pytest.raises(ValueError):
+        LagrangianRelaxation(SharedBlockProblem())
+
+
+def test_solve_lagrangian():
+    expected = TwoBagProblem()
+    expected.solve(SOLVE_ARGS)
+    optimum = pl.value(expected.prob.objective)
+    prob = TwoBagProblem()
+    relaxation = prob.solve_lagrangian(30, solve_args=SOLVE_ARGS)
+    assert relaxation.iterations[0]['bound'] == 44
+    assert all(iteration['dual_bound'] >= optimum - 1e-6 for iteration in relaxation.iterations)
+    assert relaxation.primal_bound is not None
+    assert relaxation.primal_bound <= optimum + 1e-6
+    if relaxation.gap() <= 1e-6:
+        assert prob.status == pl.LpStatusOptimal
+    assert sum(prob.result_variables['suitcase'].values()) + sum(prob.result_variables['bag'].values()) <= 4
+
+
+def test_solve_lagrangian_minimize():
+    expected = CoverProblem()
+    expected.solve(SOLVE_ARGS)
+    optimum = pl.value(expected.prob.objective)
+    prob = CoverProblem()
+    relaxation = prob.solve_lagrangian(100, solve_args=SOLVE_ARGS, tolerance=1e-4)
+    assert relaxation.iterations[0]['bound'] == 0
+    assert all(iteration['dual_bound'] <= optimum + 1e-6 for iteration in relaxation.iterations)
+    assert relaxation.dual_bound == pytest.approx(optimum, rel=1e-3)
+    assert relaxation.multipliers[0] <= 0
+
+
+def test_solve_lagrangian_pool():
+    sequential = TwoBagProblem().solve_lagrangian(5, solve_args=SOLVE_ARGS)
+    with SolverPool(processes=2, solve_args=SOLVE_ARGS) as pool:
+        prob = TwoBagProblem()
+        relaxation = prob.solve_lagrangian(5, pool=pool)
+    assert [iteration['bound'] for iteration in relaxation.iterations] == \
+        [iteration['bound'] for iteration in sequential.iterations]
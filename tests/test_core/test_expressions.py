@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+import pulp as pl
+import pytest
+
+from horuslp.core.expressions import weighted_sum, dot, total
+
+
+@pytest.fixture
+def group():
+    return OrderedDict((key, pl.LpVariable('x_%s' % key)) for key in 'abc')
+
+
+def test_weighted_sum(group):
+    expr = weighted_sum([(group['a'], 2), (group['b'], 3), (group['a'], 1)], constant=4)
+    assert dict(expr) == {group['a']: 3, group['b']: 3}
+    assert expr.constant == 4
+
+
+def test_weighted_sum_expressions(group):
+    expr = weighted_sum([(group['a'] + 2 * group['b'] + 1, 2), (group['b'], 1)])
+    assert dict(expr) == {group['a']: 2, group['b']: 5}
+    assert expr.constant == 2
+
+
+def test_weighted_sum_matches_sum(group):
+    terms = [(group[key], coef) for key, coef in zip('abcab', [1, -2, 3.5, 4, 0.5])]
+    expected = sum(var * coef for var, coef in terms)
+    expr = weighted_sum(terms)
+    assert dict(expr) == dict(expected)
+    assert (expr <= 5).sense == pl.LpConstraintLE
+
+
+def test_weighted_sum_empty():
+    expr = weighted_sum([])
+    assert len(expr) == 0
+    assert expr.constant == 0
+
+
+def test_dot_dictionary(group):
+    expr = dot(group, {'a': 2, 'c': 5, 'b': 0})
+    assert dict(expr) == {group['a']: 2, group['c']: 5}
+
+
+def test_dot_sequence(group):
+    assert dict(dot(group, [1, 0, 3])) == {group['a']: 1, group['c']: 3}
+    assert dict(dot(list(group.values()), (4, 5, 6), constant=1)) == {group['a']: 4, group['b']: 5, group['c']: 6}
+
+
+def test_total(group):
+    expr = total(group, constant=-1)
+    assert dict(expr) == {var: 1 for var in group.values()}
+    assert expr.constant == -1
+    assert dict(total(list(group.values()))) == dict(expr)
@@ -0,0 +1,114 @@
+import pulp as pl
+import pytest
+
+from horuslp.core import Constraint, ConstraintFamily, ObjectiveComponent, Problem, VariableManager
+from horuslp.core.Variables import BinaryVariableGroup, VariableGroup
+from horuslp.core.constants import MINIMIZE
+from horuslp.core.indicators import expression_bounds, implies
+
+
+@pytest.fixture
+def variables():
+    return pl.LpVariable('x', 0, 4), pl.LpVariable('y', -1, 2), pl.LpVariable('z', 0, 1, pl.LpBinary)
+
+
+def test_expression_bounds(variables):
+    x, y, _ = variables
+    assert expression_bounds(x + 2 * y - 5) == (-7, 3)
+    assert expression_bounds(x - 3 * y) == (-6, 7)
+    assert expression_bounds(x + pl.LpVariable('free', 0, None)) == (0, None)
+    assert expression_bounds(x - pl.LpVariable('huge', -1e30, 0)) == (0, None)
+    assert expression_bounds(pl.LpAffineExpression([(x, 1), (pl.LpVariable('unused'), 0)])) == (0, 4)
+
+
+def test_implies(variables):
+    x, y, z = variables
+    row = implies(z, x + 2 * y <= 5)
+    assert dict(row.items()) == {x: 1, y: 2, z: 3}
+    assert (row.sense, row.constant) == (pl.LpConstraintLE, -8)
+    row = implies(z, x + y >= 3)
+    assert dict(row.items()) == {x: 1, y: 1, z: -4}
+    assert (row.sense, row.constant) == (pl.LpConstraintGE, 1)
+
+
+def test_implies_inactive(variables):
+    x, _, z = variables
+    row = implies(z, x <= 0, active=0)
+    assert dict(row.items()) == {x: 1, z: -4}
+    assert row.constant == 0
+
+
+def test_implies_redundant(variables):
+    x, y, z = variables
+    row = implies(z, x - 2 * y <= 100)
+    assert dict(row.items()) == {x: 1, y: -2}
+
+
+def test_implies_big_m(variables):
+    x, _, z = variables
+    free = pl.LpVariable('free', 0, None)
+    with pytest.raises(ValueError):
+        implies(z, free <= 1)
+    assert dict(implies(z, free <= 1, big_m=9).items()) == {free: 1, z: 9}
+    assert dict(implies(z, x <= 1, big_m=9).items()) == {x: 1, z: 3}
+    with pytest.raises(AssertionError):
+        implies(z, x == 1)
+    with pytest.raises(AssertionError):
+        implies(x, x <= 1)
+
+
+class WarehouseVariables(VariableManager):
+    vars = [
+        VariableGroup('shipment', list(range(3)), 0, 40),
+        BinaryVariableGroup('open_warehouse', list(range(3)))
+    ]
+
+
+class DemandConstraint(Constraint):
+    def define(self, shipment):
+        return pl.lpSum(shipment.values()) >= 50
+
+
+class ClosedWarehouseFamily(ConstraintFamily):
+    def define(self, shipment, open_warehouse):
+        for warehouse, var in shipment.items():
+            yield warehouse, implies(open_warehouse[warehouse], var <= 0, active=0)
+
+
+class LooseClosedWarehouseFamily(ConstraintFamily):
+    def define(self, shipment, open_warehouse):
+        for warehouse, var in shipment.items():
+            yield warehouse, var <= 1000 * open_warehouse[warehouse]
+
+
+class WarehouseObjective(ObjectiveComponent):
+    def define(self, shipment, open_warehouse):
+        return pl.lpSum(shipment.values()) + 100 * pl.lpSum(open_warehouse.values())
+
+
+class WarehouseProblem(Problem):
+    variables = WarehouseVariables
+    objective = WarehouseObjective
+    constraints = [DemandConstraint, ClosedWarehouseFamily]
+    sense = MINIMIZE
+
+
+class LooseWarehouseProblem(WarehouseProblem):
+    constraints = [DemandConstraint, LooseClosedWarehouseFamily]
+
+
+def relaxation_bound(prob):
+    prob.build_model()
+    relaxed = prob.prob.deepcopy()
+    for var in relaxed.variables():
+        var.cat = pl.LpContinuous
+    relaxed.solve(pl.PULP_CBC_CMD(msg=0))
+    return pl.value(relaxed.objective)
+
+
+def test_implies_problem():
+    prob = WarehouseProblem()
+    assert prob.solve() == 'Optimal'
+    assert pl.value(prob.prob.objective) == 250
+    assert sum(prob.result_variables['open_warehouse'].values()) == 2
+    assert relaxation_bound(WarehouseProblem()) > relaxation_bound(LooseWarehouseProblem())
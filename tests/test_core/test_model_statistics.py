@@ -0,0 +1,41 @@
+import io
+from collections import OrderedDict
+
+from horuslp.core.ModelStatistics import ModelStatistics
+from horuslp.core.Report import Report
+from tests.test_core.test_problem import LPProblem, BusyKnapsackProblem
+
+
+def test_model_statistics():
+    prob = LPProblem()
+    stats = prob.get_model_statistics()
+    assert prob.model_built
+    assert (stats.columns, stats.rows, stats.nonzeros) == (4, 4, 5)
+    assert stats.density == 5 / 16.
+    assert stats.coefficient_range == (1, 1)
+    assert stats.variables['z'] == OrderedDict([('columns', 2), ('binary', 0), ('integer', 0), ('continuous', 2)])
+    assert stats.constraints['LPZFamily'] == OrderedDict([
+        ('class', 'LPZFamily'), ('rows', 2), ('nonzeros', 2), ('largest_row', 1),
+        ('min_coef', 1), ('max_coef', 1), ('min_rhs', 5), ('max_rhs', 5)
+    ])
+    assert stats.constraints['LPCapacityConstraint']['nonzeros'] == 2
+    assert stats.objective == OrderedDict([('nonzeros', 4), ('min_coef', 1), ('max_coef', 3)])
+    assert stats.dense_columns == [(('x', None), 2)]
+    assert ModelStatistics(prob, dense_fraction=0.5).dense_columns == []
+
+
+def test_model_statistics_render():
+    stats = BusyKnapsackProblem().get_model_statistics()
+    assert stats.variables['pick']['binary'] == 120
+    assert stats.coefficient_range[1] <= 1000
+    assert len(stats.dense_columns) == 120
+    report = Report(stream=io.StringIO())
+    stats.render(report, max_dense_columns=2)
+    lines = report.stream.getvalue().splitlines()
+    assert lines[0] == 'columns: 120, rows: 20, nonzeros: 2400, density: 1, coefficients: [%d, %d]' % \
+        stats.coefficient_range
+    assert lines[2].split() == ['variable', 'columns', 'binary', 'integer', 'continuous']
+    assert lines[3].split() == ['pick', '120', '120', '0', '0']
+    assert lines[5].split()[:4] == ['BusyKnapsackConstraints', 'BusyKnapsackConstraints', '20', '2400']
+    assert lines[-4:-1] == ['dense column  rows', 'pick[0]         20', 'pick[1]         20']
+    assert lines[-1] == '... 118 more dense columns'
@@ -0,0 +1,38 @@
+import pytest
+
+from horuslp.core.parametric import piecewise_linear_curve
+
+
+def concave(param):
+    pieces = [(2, 0), (1, 3), (0, 10)]
+    value, slope = min((a * param + b, a) for a, b in pieces)
+    return value, slope
+
+
+def test_piecewise_linear_curve():
+    assert piecewise_linear_curve(concave, -5, 20) == [(-5, -10), (3, 6), (7, 10), (20, 10)]
+
+
+def test_piecewise_linear_curve_convex():
+    def convex(param):
+        return abs(param), -1 if param < 0 else 1
+    assert piecewise_linear_curve(convex, -2, 4) == [(-2, 2), (0, 0), (4, 4)]
+
+
+def test_piecewise_linear_curve_linear():
+    calls = []
+
+    def linear(param):
+        calls.append(param)
+        return 3 * param + 1, 3
+    assert piecewise_linear_curve(linear, 0, 10) == [(0, 1), (10, 31)]
+    assert calls == [0, 10]
+
+
+def test_piecewise_linear_curve_single_point():
+    assert piecewise_linear_curve(concave, 4, 4) == [(4, 7)]
+
+
+def test_piecewise_linear_curve_max_evaluations():
+    with pytest.raises(RuntimeError):
+        piecewise_linear_curve(concave, -5, 20, max_evaluations=3)
@@ -0,0 +1,241 @@
+import random
+
+import pulp as pl
+import pytest
+
+from horuslp.core.presolve import presolve_problem, PresolvedProblem, INFINITY
+from horuslp.core.utils import get_model_rows
+
+
+def build_prob():
+    x = pl.LpVariable('x', 0, 10)
+    y = pl.LpVariable('y', 0, 10)
+    z = pl.LpVariable('z', 2, 2)
+    n = pl.LpVariable('n', 0, 10, pl.LpInteger)
+    prob = pl.LpProblem('test', pl.LpMaximize)
+    prob += x + y + z + n
+    return prob, x, y, z, n
+
+
+def test_presolve_fixed_variables():
+    prob, x, y, z, n = build_prob()
+    prob += x + y + z <= 8
+    presolved = presolve_problem(prob)
+    rows = get_model_rows(presolved.reduced)
+    assert len(rows) == 1
+    assert dict(rows[0].items()) == {x: 1, y: 1}
+    assert -rows[0].constant == 6
+    assert presolved.fixed_variables[z] == 2
+    assert presolved.reduced.objective.constant == 2
+    assert z not in presolved.reduced.objective
+
+
+def test_presolve_empty_rows():
+    prob, x, y, z, n = build_prob()
+    prob += 2 * z <= 5
+    presolved = presolve_problem(prob)
+    assert len(get_model_rows(presolved.reduced)) == 0
+    assert presolved.stats['empty_rows'] == 1
+
+
+def test_presolve_infeasible_empty_row_kept():
+    prob, x, y, z, n = build_prob()
+    prob += 2 * z >= 5
+    presolved = presolve_problem(prob)
+    assert len(get_model_rows(presolved.reduced)) == 1
+    assert presolved.stats['empty_rows'] == 0
+    assert presolved.infeasible
+
+
+def test_presolve_free_rows():
+    prob, x, y, z, n = build_prob()
+    prob += x + y <= INFINITY
+    prob += x - y >= -INFINITY
+    presolved = presolve_problem(prob)
+    assert len(get_model_rows(presolved.reduced)) == 0
+    assert presolved.stats['free_rows'] == 2
+
+
+def test_presolve_singleton_rows():
+    prob, x, y, z, n = build_prob()
+    prob += 2 * x <= 8
+    prob += -y <= -3
+    prob += 2 * n <= 7
+    prob += x + y + n <= 100
+    presolved = presolve_problem(prob)
+    assert len(get_model_rows(presolved.reduced)) == 1
+    assert presolved.stats['singleton_rows'] == 3
+    assert presolved.stats['tightened_bounds'] == 3
+    assert (x.lowBound, x.upBound) == (0, 4)
+    assert (y.lowBound, y.upBound) == (3, 10)
+    assert (n.lowBound, n.upBound) == (0, 3)
+    presolved.postsolve()
+    assert (x.lowBound, x.upBound) == (0, 10)
+    assert (y.lowBound, y.upBound) == (0, 10)
+    assert (n.lowBound, n.upBound) == (0, 10)
+
+
+def test_presolve_singleton_fixes_variable():
+    prob, x, y, z, n = build_prob()
+    prob += x == 3
+    prob += x + y <= 5
+    presolved = presolve_problem(prob)
+    assert len(get_model_rows(presolved.reduced)) == 0
+    assert presolved.fixed_variables[x] == 3
+    assert presolved.stats['singleton_rows'] == 2
+    assert y.upBound == 2
+
+
+def test_presolve_conflicting_singleton_kept():
+    prob, x, y, z, n = build_prob()
+    prob += x >= 11
+    presolved = presolve_problem(prob)
+    assert len(get_model_rows(presolved.reduced)) == 1
+    assert presolved.stats['singleton_rows'] == 0
+    assert (x.lowBound, x.upBound) == (0, 10)
+    assert presolved.infeasible
+
+
+def test_presolve_duplicate_rows():
+    prob, x, y, z, n = build_prob()
+    prob += x + y <= 6
+    prob += 2 * x + 2 * y <= 10
+    prob += -x - y >= -8
+    prob += x - y == 1
+    prob += 3 * y - 3 * x == -3
+    presolved = presolve_problem(prob)
+    rows = get_model_rows(presolved.reduced)
+    assert len(rows) == 2
+    assert presolved.stats['duplicate_rows'] == 3
+    assert dict(rows[0].items()) == {x: 2, y: 2}
+    assert -rows[0].constant == 10
+
+
+def test_presolve_row_map():
+    prob, x, y, z, n = build_prob()
+    row_1 = x + y <= 6
+    row_2 = x <= 4
+    prob += row_1
+    prob += row_2
+    presolved = presolve_problem(prob)
+    assert list(presolved.row_map.keys()) == [row_1]
+    assert presolved.removed_rows == {row_2: 'singleton_rows'}
+
+
+def test_postsolve():
+    prob, x, y, z, n = build_prob()
+    w = pl.LpVariable('w', 1, 5)
+    prob += x + y <= 6
+    prob += w <= 3
+    presolved = presolve_problem(prob)
+    assert presolved.dropped_variables == [w]
+    presolved.reduced.solve(pl.PULP_CBC_CMD(msg=0))
+    presolved.postsolve()
+    assert z.varValue == 2
+    assert w.varValue == 1
+    assert (w.lowBound, w.upBound) == (1, 5)
+    assert prob.status == presolved.reduced.status
+
+
+def test_presolved_problem_defaults():
+    prob, x, y, z, n = build_prob()
+    presolved = PresolvedProblem(prob)
+    assert presolved.reduced is None
+    assert presolved.original is prob
+    assert all(count == 0 for count in presolved.stats.values())
+
+
+def test_postsolve_sensitivity():
+    prob, x, y, z, n = build_prob()
+    kept = x + y + n <= 6
+    singleton = -y <= -1
+    free = x - y <= INFINITY
+    prob += kept
+    prob += singleton
+    prob += free
+    presolved = presolve_problem(prob)
+    presolved.reduced.solve(pl.PULP_CBC_CMD(msg=0))
+    presolved.postsolve()
+    assert kept.pi == presolved.row_map[kept].pi
+    assert kept.slack == presolved.row_map[kept].slack
+    assert singleton.pi is None
+    assert singleton.slack == -1 + y.varValue
+    assert free.pi == 0
+    assert z.dj is None
+
+
+def test_solve_infeasible_empty_row():
+    prob, x, y, z, n = build_prob()
+    prob += x + y <= 6
+    prob += 2 * z == -4
+    presolved = presolve_problem(prob)
+    assert presolved.solve({'solver': pl.PULP_CBC_CMD(msg=0)}) == pl.LpStatusInfeasible
+    assert presolved.reduced.sol_status == pl.LpSolutionInfeasible
+    presolved.postsolve()
+    assert prob.status == pl.LpStatusInfeasible
+
+
+def test_solve_conflicting_singleton():
+    prob, x, y, z, n = build_prob()
+    prob += x + y <= 6
+    prob += x >= 3
+    prob += x <= 2
+    presolved = presolve_problem(prob)
+    assert presolved.settle() == pl.LpStatusInfeasible
+
+
+def test_solve_without_rows():
+    prob, x, y, z, n = build_prob()
+    w = pl.LpVariable('w', -3, 5)
+    prob += x <= 4
+    prob += n <= 2.5
+    prob += w >= -1
+    presolved = presolve_problem(prob)
+    assert get_model_rows(presolved.reduced) == []
+    assert presolved.solve() == pl.LpStatusOptimal
+    presolved.postsolve()
+    assert prob.status == pl.LpStatusOptimal
+    assert (x.varValue, y.varValue, z.varValue, n.varValue, w.varValue) == (4, 10, 2, 2, 0)
+    assert pl.value(prob.objective) == 18
+
+
+def test_solve_without_rows_unbounded():
+    x = pl.LpVariable('x', 0, None)
+    prob = pl.LpProblem('test', pl.LpMaximize)
+    prob += x
+    prob += x >= 1
+    presolved = presolve_problem(prob)
+    assert presolved.solve() == pl.LpStatusUnbounded
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_presolve_matches_solver(seed):
+    random_state = random.Random(seed)
+    variables = [pl.LpVariable('x%d' % i, random_state.choice([0, 1, 2]), random_state.choice([2, 3, 5]),
+                               random_state.choice([pl.LpContinuous, pl.LpInteger])) for i in range(4)]
+
+    def build():
+        row_state = random.Random(seed)
+        prob = pl.LpProblem('random', pl.LpMaximize)
+        prob += pl.lpSum(row_state.randint(-3, 3) * var for var in variables)
+        for _ in range(row_state.randint(1, 4)):
+            terms = row_state.sample(variables, row_state.randint(1, 2))
+            expr = pl.lpSum(row_state.randint(-2, 2) * var for var in terms)
+            rhs = row_state.randint(-6, 8)
+            prob += row_state.choice([expr <= rhs, expr >= rhs, expr == rhs])
+        return prob
+
+    solver = pl.PULP_CBC_CMD(msg=0)
+    expected = build()
+    expected_status = expected.solve(solver)
+    expected_objective = pl.value(expected.objective)
+    prob = build()
+    presolved = presolve_problem(prob)
+    status = presolved.solve({'solver': solver})
+    presolved.postsolve()
+    assert status == expected_status
+    if status == pl.LpStatusOptimal:
+        assert pl.value(prob.objective) == pytest.approx(expected_objective, abs=1e-6)
+        for row in get_model_rows(prob):
+            assert row.valid(1e-6)
+        assert all(var.lowBound - 1e-6 <= var.varValue <= var.upBound + 1e-6 for var in prob.variables())
@@ -1,12 +1,21 @@
+import asyncio
+import io
+import itertools
+import sys
 import pulp as pl
 import pytest
 from collections import OrderedDict
-from horuslp.core import ObjectiveComponent, Constraint, Metric, VariableManager, CombinedObjective
-from horuslp.core.Variables import BinaryVariable, IntegerVariable
-from horuslp.core.constants import MAXIMIZE
-from unittest.mock import patch, Mock
+from horuslp.core import ObjectiveComponent, Constraint, ConstraintFamily, LazyConstraint, Metric, VariableManager, \
+    CombinedObjective
+from horuslp.core.Variables import Variable, VariableGroup, BinaryVariable, IntegerVariable, BinaryVariableGroup, \
+    Column
+from horuslp.core.constants import MAXIMIZE, THREAD, PROCESS, INTEGER
+from unittest.mock import patch, Mock, MagicMock
 
 from horuslp.core.ProblemClass import Problem
+from horuslp.core.presolve import INFINITY
+from horuslp.core.Report import Report
+from horuslp.core.utils import get_model_rows, SparseValues
 
 
 class TestProblem(Problem):
@@ -14,6 +23,69 @@ class TestProblem(Problem):
     constraints = []
     variables = VariableManager
 
+class ParallelVariables(VariableManager):
+    vars = [
+        BinaryVariable('x'),
+        BinaryVariable('y')
+    ]
+
+
+class ParallelConstraint1(Constraint):
+    def define(self, x, y):
+        return 2 * x + 3 * y <= 4
+
+
+class ParallelConstraint2(Constraint):
+    def define(self, x):
+        return x >= 1
+
+
+class ParallelContainer(Constraint):
+    pass
+
+
+class ParallelObjective(ObjectiveComponent):
+    def define(self, x, y):
+        return x + y
+
+
+class ParallelProblem(Problem):
+    variables = ParallelVariables
+    objective = ParallelObjective
+    constraints = [ParallelConstraint1, ParallelContainer, ParallelConstraint2]
+    sense = MAXIMIZE
+
+
+class FamilyVariables(VariableManager):
+    vars = [
+        BinaryVariableGroup('picks', [(item, slot) for item in 'abc' for slot in range(2)])
+    ]
+
+
+class OnePerSlotFamily(ConstraintFamily):
+    def define(self, picks):
+        for slot in range(2):
+            yield slot, sum(var for key, var in picks.items() if key[1] == slot) <= 1
+
+
+class PickOnceFamily(ConstraintFamily):
+    def define(self, picks):
+        for item in 'abc':
+            yield item, picks[item, 0] + picks[item, 1] <= 1
+
+
+class PicksObjective(ObjectiveComponent):
+    def define(self, picks):
+        return sum(picks.values())
+
+
+class FamilyProblem(Problem):
+    variables = FamilyVariables
+    objective = PicksObjective
+    constraints = [OnePerSlotFamily, PickOnceFamily]
+    sense = MAXIMIZE
+
+
 def test_prob_no_name():
     prob = TestProblem()
     assert prob.name == 'TestProblem'
@@ -153,11 +225,127 @@ def test_non_flattening():
     combined_init_mock.assert_called()
 
 
+def test_constraint_flattening_shared_dependents():
+    shared_init_mock = Mock()
+
+    class SharedConstraint(Constraint):
+        def __init__(self):
+            super(SharedConstraint, self).__init__()
+            shared_init_mock()
+
+    class ParentConstraint1(Constraint):
+        dependent_constraints = [SharedConstraint]
+
+    class ParentConstraint2(Constraint):
+        dependent_constraints = [SharedConstraint]
+
+    class TestProblem(Problem):
+        objective = ObjectiveComponent
+        constraints = [ParentConstraint1, ParentConstraint2, SharedConstraint]
+        variables = VariableManager
+
+    prob = TestProblem()
+    assert [c.__class__ for c in prob.flattened_constraints] == [ParentConstraint1, SharedConstraint,
+                                                                 ParentConstraint2]
+    assert prob.flattened_constraints[1] is prob.constraint_objs[2]
+    assert shared_init_mock.call_count == 1
+    assert prob.constraint_children == OrderedDict([
+        ('ParentConstraint1', ['SharedConstraint']),
+        ('SharedConstraint', []),
+        ('ParentConstraint2', ['SharedConstraint'])
+    ])
+    assert prob.constraint_parents['SharedConstraint'] == ['ParentConstraint1', 'ParentConstraint2']
+    assert prob.constraint_parents['ParentConstraint1'] == []
+
+
+def test_constraint_flattening_cycle():
+    class CycleConstraint1(Constraint):
+        pass
+
+    class CycleConstraint2(Constraint):
+        dependent_constraints = [CycleConstraint1]
+
+    CycleConstraint1.dependent_constraints = [CycleConstraint2]
+
+    class TestProblem(Problem):
+        objective = ObjectiveComponent
+        constraints = [CycleConstraint1]
+        variables = VariableManager
+
+    with pytest.raises(ValueError) as err:
+        TestProblem()
+    assert 'CycleConstraint1 -> CycleConstraint2 -> CycleConstraint1' in str(err.value)
+
+
+def test_constraint_flattening_deep():
+    chain = [Constraint]
+    for i in range(3 * sys.getrecursionlimit()):
+        chain.append(type('Chain%d' % i, (Constraint,), {'dependent_constraints': [chain[-1]]}))
+
+    class TestProblem(Problem):
+        objective = ObjectiveComponent
+        constraints = [chain[-1]]
+        variables = VariableManager
+
+    prob = TestProblem()
+    assert len(prob.flattened_constraints) == len(chain)
+    assert prob.flattened_constraints[-1].__class__ == Constraint
+
+
+def test_constraint_flattening_cached():
+    constraint_init_mock = Mock()
+
+    class TestConstraint(Constraint):
+        def __init__(self):
+            super(TestConstraint, self).__init__()
+            constraint_init_mock()
+
+    class CombinedConstraint(Constraint):
+        dependent_constraints = [TestConstraint]
+
+    class TestProblem(Problem):
+        objective = ObjectiveComponent
+        constraints = [CombinedConstraint]
+        variables = VariableManager
+
+    TestProblem()
+    TestProblem()
+    assert constraint_init_mock.call_count == 2
+
+    class CachedProblem(TestProblem):
+        cache_constraints = True
+
+    prob_1 = CachedProblem()
+    prob_2 = CachedProblem()
+    assert constraint_init_mock.call_count == 3
+    assert prob_2.flattened_constraints == prob_1.flattened_constraints
+    assert prob_2.constraint_children == prob_1.constraint_children
+    prob_1.flattened_constraints.pop()
+    prob_1.constraint_children['CombinedConstraint'].append('Other')
+    prob_1.constraint_parents.clear()
+    assert [c.name for c in CachedProblem().flattened_constraints] == ['CombinedConstraint', 'TestConstraint']
+    assert prob_2.constraint_children['CombinedConstraint'] == ['TestConstraint']
+    assert prob_2.constraint_parents['TestConstraint'] == ['CombinedConstraint']
+
+
+def test_get_constraint_descendants():
+    prob = TestProblem()
+    prob.constraint_children = {
+        'a': ['b', 'c'],
+        'b': ['d'],
+        'c': ['d'],
+        'd': []
+    }
+    assert prob.get_constraint_descendants('a') == ['b', 'd', 'c']
+    assert prob.get_constraint_descendants('c') == ['d']
+    assert prob.get_constraint_descendants('d') == []
+
+
 def test_implement_constraint():
     with patch('horuslp.core.ProblemClass.call_with_required_args') as cwra:
         prob = TestProblem()
         prob.vars = 'test_vars'
-        lp_prob_mock = ''
+        lp_prob_mock = MagicMock()
         constraint_mock = Mock()
         constraint_mock.name = 'test_constraint_name'
         constraint_mock.define = 'test_define'
@@ -165,6 +353,7 @@ def test_implement_constraint():
         prob.implement_constraint(lp_prob_mock, constraint_mock)
         cwra.assert_called_with('test_define', 'test_vars')
         assert prob.implemented_constraints['test_constraint_name'] == 'constraint_def'
+        lp_prob_mock.__iadd__.assert_called_once_with(('constraint_def', 'test_constraint_name'))
 
 
 def test_implement_constraints():
@@ -178,6 +367,70 @@ def test_implement_constraints():
     implement_constraint_mock.assert_any_call('prob', 'constr_2')
 
 
+def test_implement_constraints_parallel():
+    prob = TestProblem()
+    prob.parallel_define = THREAD
+    prob.add_constraint_spec = Mock()
+    prob.define_constraints_parallel = Mock()
+    prob.define_constraints_parallel.return_value = ['spec_1', 'spec_2']
+    prob.flattened_constraints = ['constr_1', 'constr_2']
+    prob.implement_constraints('prob')
+    prob.define_constraints_parallel.assert_called_once_with(['constr_1', 'constr_2'])
+    assert prob.add_constraint_spec.call_args_list[0][0] == ('prob', 'constr_1', 'spec_1')
+    assert prob.add_constraint_spec.call_args_list[1][0] == ('prob', 'constr_2', 'spec_2')
+
+
+@pytest.mark.parametrize('parallel', [THREAD, PROCESS])
+def test_build_model_parallel(parallel):
+    sequential = ParallelProblem()
+    sequential.build_model()
+    prob = ParallelProblem()
+    prob.build_model(parallel=parallel, max_workers=2)
+    assert prob.parallel_define == parallel
+    assert prob.parallel_workers == 2
+    assert list(prob.implemented_constraints.keys()) == list(sequential.implemented_constraints.keys())
+    for name, constr in sequential.implemented_constraints.items():
+        parallel_constr = prob.implemented_constraints[name]
+        if constr is True:
+            assert parallel_constr is True
+            continue
+        assert list(parallel_constr.items()) == list(constr.items())
+        assert parallel_constr.sense == constr.sense
+        assert parallel_constr.constant == constr.constant
+    assert prob.solve() == 'Optimal'
+    assert prob.result_variables == {'x': 1.0, 'y': 0.0}
+
+
+def test_implement_constraint_family():
+    prob = FamilyProblem()
+    lp_prob = pl.LpProblem('test', pl.LpMaximize)
+    family = OnePerSlotFamily()
+    prob.implement_constraint(lp_prob, family)
+    rows = prob.implemented_constraints['OnePerSlotFamily']
+    assert isinstance(rows, OrderedDict)
+    assert list(rows.keys()) == [0, 1]
+    assert len(rows[0]) == 3
+    assert lp_prob.numConstraints() == 2
+    assert [row.name for row in get_model_rows(lp_prob)] == ['OnePerSlotFamily_0_', 'OnePerSlotFamily_1_']
+
+
+def test_solve_constraint_family():
+    prob = FamilyProblem()
+    assert prob.solve() == 'Optimal'
+    assert prob.constraint_results['OnePerSlotFamily'] == OrderedDict([(0, 1.0), (1, 1.0)])
+    assert sum(prob.constraint_results['PickOnceFamily'].values()) == 2.0
+    assert list(prob.constraint_results['PickOnceFamily'].keys()) == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('parallel', [THREAD, PROCESS])
+def test_build_model_parallel_family(parallel):
+    prob = FamilyProblem()
+    prob.build_model(parallel=parallel)
+    rows = prob.implemented_constraints['PickOnceFamily']
+    assert list(rows.keys()) == ['a', 'b', 'c']
+    assert set(rows['a'].keys()) == {prob.vars['picks']['a', 0], prob.vars['picks']['a', 1]}
+
+
 def test_implement_objective():
     with patch('horuslp.core.ProblemClass.call_with_required_args') as cwra:
         cwra.return_value = 'test_cwra_return'
@@ -368,6 +621,87 @@ def test_solve():
         prob.read_constraint_values.assert_called_once()
         prob.read_metric_values.assert_called_once()
 
+def test_solve_presolve():
+    expected = FamilyProblem()
+    expected.solve()
+
+    class PresolveProblem(FamilyProblem):
+        presolve = True
+
+    prob = PresolveProblem()
+    assert prob.solve() == 'Optimal'
+    assert prob.presolved is not None
+    assert prob.result_variables == expected.result_variables
+    assert prob.constraint_results == expected.constraint_results
+    assert prob.prob.status == prob.status
+
+
+def test_solve_presolved():
+    with patch('horuslp.core.ProblemClass.presolve_problem') as pp:
+        presolved = Mock()
+        presolved.solve.return_value = 'reduced_status'
+        pp.return_value = presolved
+        prob = TestProblem()
+        prob.prob = 'test_prob'
+        assert prob.solve_presolved({'test_arg': 'test_arg_val'}) == 'reduced_status'
+        pp.assert_called_once_with('test_prob')
+        presolved.solve.assert_called_once_with({'test_arg': 'test_arg_val'})
+        presolved.postsolve.assert_called_once()
+
+
+def test_solve_async():
+    solve_args = {'solver': pl.PULP_CBC_CMD(msg=0, options=['cuts off'])}
+    expected = KnapsackProblem()
+    assert expected.solve(solve_args) == 'Optimal'
+    prob = KnapsackProblem()
+    events = []
+
+    async def run():
+        with patch('horuslp.core.solver.CbcProcess.interrupt') as interrupt:
+            async for event in prob.solve_progress(solve_args):
+                events.append(event)
+            interrupt.assert_not_called()
+        return prob.get_status()
+
+    assert asyncio.run(run()) == 'Optimal'
+    assert prob.result_variables == expected.result_variables
+    assert prob.constraint_results == expected.constraint_results
+    assert max(event.nodes for event in events) > 0
+    assert events[-1].incumbent == pl.value(expected.prob.objective)
+
+    expected = FamilyProblem()
+    expected.solve()
+
+    prob = FamilyProblem()
+    assert asyncio.run(prob.solve_async()) == 'Optimal'
+    assert prob.result_variables == expected.result_variables
+
+
+def test_solve_async_timeout():
+    with patch('horuslp.core.solver.CbcRun.prepare') as prepare:
+        prepare.return_value = [sys.executable, '-c', 'import time; time.sleep(30)']
+        prob = FamilyProblem()
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(prob.solve_async(timeout=0.5))
+        assert prob.status is None
+
+
+def test_solve_async_cancel():
+    with patch('horuslp.core.solver.CbcRun.prepare') as prepare:
+        prepare.return_value = [sys.executable, '-c', 'import time; time.sleep(30)']
+        prob = FamilyProblem()
+
+        async def run():
+            task = asyncio.ensure_future(prob.solve_async())
+            await asyncio.sleep(0.5)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run())
+        assert prob.status is None
+
+
 #<TODO: Infeasible constraints and infeasible constraint groups tests>
 def test_build_subproblem():
     prob = TestProblem()
@@ -388,13 +722,56 @@ def test_build_subproblem():
     sub_prob, constr_names = prob.build_subproblem([TestConstraint1(), TestConstraint2()], flatten_boolean)
     assert constr_names == ('TestConstraint1', 'TestConstraint2')
     assert sub_prob.variables == prob.variables
-    prob.variables.assert_called_once()
+    prob.variables.assert_not_called()
+    prob.objective.assert_not_called()
     assert sub_prob.constraints == [TestConstraint1, TestConstraint2]
     assert sub_prob.sense == prob.sense
     assert sub_prob.objective == prob.objective
     assert sub_prob.name == "TestProblem[('TestConstraint1', 'TestConstraint2')]"
     assert sub_prob._flatten_constraints == 'flatten_boolean'
-    assert sub_prob.vars == 'vars'
+    assert sub_prob.vars is prob.vars
+    assert sub_prob.variables_obj is prob.variables_obj
+    assert sub_prob.objective_obj is prob.objective_obj
+    assert sub_prob.constraint_specs is prob.constraint_specs
+
+
+class CountingConstraint(Constraint):
+    define_calls = 0
+
+    def define(self, x, y):
+        CountingConstraint.define_calls += 1
+        return x + y <= 1
+
+
+class InfeasibleCountingProblem(Problem):
+    variables = ParallelVariables
+    objective = ParallelObjective
+    constraints = [CountingConstraint, ParallelConstraint1, ParallelConstraint2]
+    sense = MAXIMIZE
+
+
+def test_subproblem_shares_constraint_specs():
+    CountingConstraint.define_calls = 0
+    prob = InfeasibleCountingProblem()
+    prob.build_model()
+    row = prob.implemented_constraints['CountingConstraint']
+    sub_prob, constr_names = prob.build_subproblem(prob.constraint_objs[:2], False)
+    assert sub_prob.solve() == 'Optimal'
+    assert CountingConstraint.define_calls == 1
+    assert sub_prob.implemented_constraints['CountingConstraint'] is row
+    assert sum(sub_prob.result_variables.values()) == 1
+    assert prob.prob.numConstraints() == 3
+
+
+def test_subproblem_defines_missing_specs():
+    CountingConstraint.define_calls = 0
+    prob = InfeasibleCountingProblem()
+    sub_prob, constr_names = prob.build_subproblem(prob.constraint_objs[:2], False)
+    sub_prob.build_model()
+    other_sub_prob, constr_names = prob.build_subproblem(prob.constraint_objs[::2], False)
+    other_sub_prob.build_model()
+    assert CountingConstraint.define_calls == 1
+    assert set(prob.constraint_specs.keys()) == {'CountingConstraint', 'ParallelConstraint1', 'ParallelConstraint2'}
 
 
 def test_find_infeasible_constraints_no_others():
@@ -558,75 +935,91 @@ def test_find_incompatibility_no_infeasibles():
     prob.find_infeasible_constraints.assert_not_called()
 
 
-def test_print_result_variables():
-    with patch('horuslp.core.ProblemClass.print') as prnt:
+def test_print_result_variables(capsys):
+    prob = TestProblem()
+    prob.result_variables = Mock()
+    prob.result_variables.items = Mock()
+    prob.result_variables.items.return_value = [
+        ('var_name_1', 'var_val_1'),
+        ('var_name_2', {
+            'subscript1': 'var_val_2_1',
+            'subscript2': 'var_val_2_2'
+        })
+    ]
+    prob.print_result_variables()
+    prob.result_variables.items.assert_called_once()
+    assert capsys.readouterr().out.splitlines() == [
+        'var_name_1 var_val_1',
+        'var_name_2[subscript1] var_val_2_1',
+        'var_name_2[subscript2] var_val_2_2'
+    ]
+
+
+def test_print_result_objectives(capsys):
+    with patch('horuslp.core.ProblemClass.call_with_required_args') as cwra:
+        cwra.return_value = 0.01
         prob = TestProblem()
-        prob.result_variables = Mock()
-        prob.result_variables.items = Mock()
-        prob.result_variables.items.return_value = [
-            ('var_name_1', 'var_val_1'),
-            ('var_name_2', {
-                'subscript1': 'var_val_2_1',
-                'subscript2': 'var_val_2_2'
-            })
-        ]
-        prob.print_result_variables()
-        prob.result_variables.items.assert_called_once()
-        prnt.assert_any_call('var_name_1', 'var_val_1')
-        prnt.assert_any_call('var_name_2[subscript1]', 'var_val_2_1')
-        prnt.assert_any_call('var_name_2[subscript2]', 'var_val_2_2')
-
-
-def test_print_result_objectives():
-    with patch('horuslp.core.ProblemClass.print') as prnt:
-        with patch('horuslp.core.ProblemClass.call_with_required_args') as cwra:
-            cwra.return_value = 0.01
-            prob = TestProblem()
-            prob.objective_obj = Mock()
-            prob.objective_obj.name = 'Mock'
-            prob.objective_obj.define = 'objective_define'
-            prob.result_variables = 'result_variables'
-            prob.print_result_objectives()
-            prnt.assert_called_once_with('Mock: 0.01')
-            cwra.assert_called_once_with('objective_define', 'result_variables')
+        prob.objective_obj = Mock()
+        prob.objective_obj.name = 'Mock'
+        prob.objective_obj.define = 'objective_define'
+        prob.result_variables = 'result_variables'
+        prob.print_result_objectives()
+        assert capsys.readouterr().out == 'Mock: 0.01\n'
+        cwra.assert_called_once_with('objective_define', 'result_variables')
 
 
 def test_print_result_objectives_combined_obj():
-    with patch('horuslp.core.ProblemClass.print') as prnt:
-        with patch('horuslp.core.ProblemClass.call_with_required_args') as cwra:
-            cwra.return_value = 0.01
+    with patch('horuslp.core.ProblemClass.call_with_required_args') as cwra:
+        cwra.return_value = 0.01
 
-            class CombObj(CombinedObjective):
-                name = 'CombObj'
-                define = 'comb_obj'
+        class CombObj(CombinedObjective):
+            name = 'CombObj'
+            define = 'comb_obj'
 
-            class TestProblem(Problem):
-                objective = CombObj
-                constraints = []
-                variables = VariableManager
+        class TestProblem(Problem):
+            objective = CombObj
+            constraints = []
+            variables = VariableManager
 
-            prob = TestProblem()
-            prob.objective_obj.define = 'comb_obj_def'
-            prob.result_variables = 'result_variables'
+        prob = TestProblem()
+        prob.objective_obj.define = 'comb_obj_def'
+        prob.result_variables = 'result_variables'
 
-            class ObjComp1(ObjectiveComponent):
-                define = 'obj1_define_mock'
+        class ObjComp1(ObjectiveComponent):
+            define = 'obj1_define_mock'
 
-            class ObjComp2(ObjectiveComponent):
-                define = 'obj2_define_mock'
+        class ObjComp2(ObjectiveComponent):
+            define = 'obj2_define_mock'
 
-            prob.objective_obj.objectives = [
-                (ObjComp1, 2),
-                (ObjComp2, 3)
-            ]
-            prob.print_result_objectives()
+        prob.objective_obj.objectives = [
+            (ObjComp1, 2),
+            (ObjComp2, 3)
+        ]
+        report = Report(stream=io.StringIO())
+        prob.print_result_objectives(report)
 
-            cwra.assert_any_call('obj1_define_mock', 'result_variables')
-            cwra.assert_any_call('obj2_define_mock', 'result_variables')
-            cwra.assert_any_call('comb_obj_def', 'result_variables')
-            prnt.assert_any_call('CombObj: 0.01')
-            prnt.assert_any_call('ObjComp1: 0.01 * 2')
-            prnt.assert_any_call('ObjComp2: 0.01 * 3')
+        cwra.assert_any_call('obj1_define_mock', 'result_variables')
+        cwra.assert_any_call('obj2_define_mock', 'result_variables')
+        cwra.assert_any_call('comb_obj_def', 'result_variables')
+        assert report.stream.getvalue().splitlines() == ['CombObj: 0.01', 'ObjComp1: 0.01 * 2', 'ObjComp2: 0.01 * 3']
+
+
+def test_print_result_constraints():
+    prob = TestProblem()
+    prob.constraint_results = OrderedDict([
+        ('constr_1', 1.0),
+        ('family', OrderedDict([('a', 2.0), ('b', 3.0)]))
+    ])
+    report = Report(stream=io.StringIO())
+    prob.print_result_constraints(report)
+    assert report.stream.getvalue().splitlines() == ['constr_1: 1.00', 'family[a]: 2.00', 'family[b]: 3.00']
+
+
+def test_print_result_metrics(capsys):
+    prob = TestProblem()
+    prob.metrics_results = OrderedDict([('metric_1', 1.5), ('metric_2', 2)])
+    prob.print_result_metrics()
+    assert capsys.readouterr().out.splitlines() == ['metric_1: 1.50', 'metric_2: 2.00']
 
 
 def test_print_optimal_results():
@@ -635,67 +1028,807 @@ def test_print_optimal_results():
     prob.print_result_objectives = Mock()
     prob.print_result_constraints = Mock()
     prob.print_result_metrics = Mock()
-    prob.print_optimal_results()
-    prob.print_result_variables.assert_called_once()
-    prob.print_result_objectives.assert_called_once()
-    prob.print_result_constraints.assert_called_once()
-    prob.print_result_metrics.assert_called_once()
+    report = Report()
+    prob.print_optimal_results(report)
+    prob.print_result_variables.assert_called_once_with(report)
+    prob.print_result_objectives.assert_called_once_with(report)
+    prob.print_result_constraints.assert_called_once_with(report)
+    prob.print_result_metrics.assert_called_once_with(report)
 
 
 def test_print_infeasible_results():
-    with patch('horuslp.core.ProblemClass.print') as prnt:
-        prob = TestProblem()
-        prob.find_incompatibility = Mock()
-        prob.find_incompatibility.return_value = 'find_incompat_ret'
-        prob.print_infeasible_results('deep_infeas_search_boolean')
-        prob.find_incompatibility.assert_called_once_with(flatten='deep_infeas_search_boolean')
-        prnt.assert_any_call('Finding incompatible constraints...')
-        prnt.assert_any_call("Incompatible Constraints:", 'find_incompat_ret')
+    prob = TestProblem()
+    report = Report(stream=Mock())
+    prob.find_incompatibility = Mock()
+    prob.find_incompatibility.side_effect = lambda flatten: report.stream.write.assert_called_once_with(
+        'Finding incompatible constraints...\n'
+    ) or 'find_incompat_ret'
+    prob.print_infeasible_results('deep_infeas_search_boolean', report)
+    prob.find_incompatibility.assert_called_once_with(flatten='deep_infeas_search_boolean')
+    report.stream.write.assert_called_with('Incompatible Constraints: find_incompat_ret\n')
+
 
 def test_print_results_optimal():
     with patch('horuslp.core.ProblemClass.pl.LpStatus') as stat:
-        with patch('horuslp.core.ProblemClass.print') as prnt:
-            stat.__getitem__ = Mock()
-            stat.__getitem__.return_value = 'Optimal'
-            prob = TestProblem()
-            prob.status = 'test_status'
-            prob.print_optimal_results = Mock()
-            prob.print_infeasible_results = Mock()
-            prob.print_results()
-            stat.__getitem__.assert_called_with('test_status')
-            prob.print_optimal_results.assert_called_once()
-            prnt.assert_called_with('TestProblem: Optimal')
+        stat.__getitem__ = Mock()
+        stat.__getitem__.return_value = 'Optimal'
+        prob = TestProblem()
+        prob.status = 'test_status'
+        prob.print_optimal_results = Mock()
+        prob.print_infeasible_results = Mock()
+        stream = io.StringIO()
+        prob.print_results(stream=stream)
+        stat.__getitem__.assert_called_with('test_status')
+        prob.print_optimal_results.assert_called_once()
+        assert stream.getvalue() == 'TestProblem: Optimal\n'
 
 
 def test_print_results_infeasible_nofind():
     with patch('horuslp.core.ProblemClass.pl.LpStatus') as stat:
-        with patch('horuslp.core.ProblemClass.print') as prnt:
-            stat.__getitem__ = Mock()
-            stat.__getitem__.return_value = 'Infeasible'
-            prob = TestProblem()
-            prob.status = 'test_status'
-            prob.print_optimal_results = Mock()
-            prob.print_infeasible_results = Mock()
-            prob.print_results()
-            stat.__getitem__.assert_called_with('test_status')
-            prob.print_optimal_results.assert_not_called()
-            prob.print_infeasible_results.assert_not_called()
-            prnt.assert_called_with('TestProblem: Infeasible')
+        stat.__getitem__ = Mock()
+        stat.__getitem__.return_value = 'Infeasible'
+        prob = TestProblem()
+        prob.status = 'test_status'
+        prob.print_optimal_results = Mock()
+        prob.print_infeasible_results = Mock()
+        stream = io.StringIO()
+        prob.print_results(stream=stream)
+        stat.__getitem__.assert_called_with('test_status')
+        prob.print_optimal_results.assert_not_called()
+        prob.print_infeasible_results.assert_not_called()
+        assert stream.getvalue() == 'TestProblem: Infeasible\n'
 
 
 def test_print_results_infeasible_find():
     with patch('horuslp.core.ProblemClass.pl.LpStatus') as stat:
-        with patch('horuslp.core.ProblemClass.print') as prnt:
-            stat.__getitem__ = Mock()
-            stat.__getitem__.return_value = 'Infeasible'
-            prob = TestProblem()
-            prob.status = 'test_status'
-            prob.print_optimal_results = Mock()
-            prob.print_infeasible_results = Mock()
-            prob.print_results(True)
-            stat.__getitem__.assert_called_with('test_status')
-            prob.print_optimal_results.assert_not_called()
-            prob.print_infeasible_results.assert_called_once()
-            prnt.assert_called_with('TestProblem: Infeasible')
+        stat.__getitem__ = Mock()
+        stat.__getitem__.return_value = 'Infeasible'
+        prob = TestProblem()
+        prob.status = 'test_status'
+        prob.print_optimal_results = Mock()
+        prob.print_infeasible_results = Mock()
+        stream = io.StringIO()
+        prob.print_results(True, stream=stream)
+        stat.__getitem__.assert_called_with('test_status')
+        prob.print_optimal_results.assert_not_called()
+        prob.print_infeasible_results.assert_called_once()
+        assert stream.getvalue() == 'TestProblem: Infeasible\n'
+
+
+def test_print_results_filters():
+    prob = LPProblem()
+    prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)})
+    stream = io.StringIO()
+    prob.print_results(stream=stream, nonzero=True, groups=['z', 'LPZFamily'])
+    assert stream.getvalue().splitlines() == ['LPProblem: Optimal', 'z[a] 5.0', 'LPObjective: 16.00', 'LPZFamily[a]: 5.00']
+
+
+def test_print_results_summary():
+    prob = LPProblem()
+    prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)})
+    stream = io.StringIO()
+    prob.print_results(stream=stream, summary=True, groups=['x', 'z'])
+    assert stream.getvalue().splitlines() == [
+        'LPProblem: Optimal',
+        'name  count  nonzero   min   max  total',
+        'x         1        1  3.00  3.00   3.00',
+        'z         2        1  0.00  5.00   5.00',
+        'LPObjective: 16.00'
+    ]
+
+
+def test_save_load_model(tmp_path):
+    path = str(tmp_path / 'model.hlp')
+    prob = FamilyProblem()
+    prob.save_model(path)
+    prob.solve()
+    loaded = FamilyProblem()
+    with patch.object(loaded, 'implement_constraints') as implement_mock:
+        loaded.load_model(path)
+        assert loaded.solve() == 'Optimal'
+        implement_mock.assert_not_called()
+    assert loaded.prob.numConstraints() == prob.prob.numConstraints()
+    assert loaded.result_variables == prob.result_variables
+    assert loaded.constraint_results == prob.constraint_results
+    assert list(loaded.implemented_constraints['OnePerSlotFamily'].keys()) == [0, 1]
+
+
+def test_share_attach_model():
+    prob = ParallelProblem()
+    block = prob.share_model()
+    try:
+        attached = ParallelProblem()
+        attached.attach_model(block.name)
+    finally:
+        block.close()
+        block.unlink()
+    prob.solve()
+    attached.solve()
+    assert attached.result_variables == prob.result_variables
+    assert attached.constraint_results == prob.constraint_results
+
+
+class ToggleContainer(Constraint):
+    dependent_constraints = [ParallelConstraint2]
+
+
+class XZeroConstraint(Constraint):
+    def define(self, x):
+        return x == 0
+
+
+class ToggleProblem(Problem):
+    variables = ParallelVariables
+    objective = ParallelObjective
+    constraints = [ParallelConstraint1, ToggleContainer, XZeroConstraint]
+    sense = MAXIMIZE
+
+
+def test_disable_enable_constraint():
+    prob = ToggleProblem()
+    assert prob.solve() == 'Infeasible'
+    row = prob.implemented_constraints['XZeroConstraint']
+    prob.disable_constraint('XZeroConstraint')
+    assert prob.disabled_rows == {('XZeroConstraint', None): (pl.LpConstraintEQ, 0)}
+    assert row.sense == pl.LpConstraintLE
+    assert prob.solve() == 'Optimal'
+    assert prob.result_variables == {'x': 1, 'y': 0}
+    prob.disable_constraint('ParallelConstraint1')
+    assert prob.solve() == 'Optimal'
+    assert prob.result_variables == {'x': 1, 'y': 1}
+    prob.enable_constraint('XZeroConstraint')
+    assert row.sense == pl.LpConstraintEQ
+    assert -row.constant == 0
+    assert list(prob.disabled_rows.keys()) == [('ParallelConstraint1', None)]
+    assert prob.solve() == 'Infeasible'
+
+
+def test_disable_constraint_dependents():
+    prob = ToggleProblem()
+    prob.disable_constraint('ToggleContainer')
+    assert list(prob.disabled_rows.keys()) == [('ParallelConstraint2', None)]
+    assert prob.implemented_constraints['ParallelConstraint2'].constant == INFINITY
+    assert prob.solve() == 'Optimal'
+    assert prob.result_variables['x'] == 0
+    prob.enable_constraint('ToggleContainer', dependents=False)
+    assert len(prob.disabled_rows) == 1
+    prob.enable_constraint('ToggleContainer')
+    assert len(prob.disabled_rows) == 0
+    assert prob.solve() == 'Infeasible'
+
+
+def test_disable_constraint_family_row():
+    prob = FamilyProblem()
+    prob.disable_constraint('PickOnceFamily', key='a')
+    assert list(prob.disabled_rows.keys()) == [('PickOnceFamily', 'a')]
+    assert prob.solve() == 'Optimal'
+    prob.disable_constraint('OnePerSlotFamily')
+    assert list(prob.disabled_rows.keys()) == [('PickOnceFamily', 'a'), ('OnePerSlotFamily', 0),
+                                               ('OnePerSlotFamily', 1)]
+    assert prob.solve() == 'Optimal'
+    assert prob.result_variables['picks'][('a', 0)] == prob.result_variables['picks'][('a', 1)] == 1
+    assert sum(prob.result_variables['picks'].values()) == 4
+
+
+def test_disable_constraint_presolve():
+    prob = ToggleProblem()
+    prob.presolve = True
+    prob.disable_constraint('XZeroConstraint')
+    assert prob.solve() == 'Optimal'
+    row = prob.implemented_constraints['XZeroConstraint']
+    assert row in prob.presolved.removed_rows
+
+
+def test_disable_constraint_unknown():
+    prob = ToggleProblem()
+    with pytest.raises(KeyError):
+        prob.disable_constraint('NotAConstraint')
+    with pytest.raises(KeyError):
+        prob.enable_constraint('NotAConstraint')
+
+
+class LPVariables(VariableManager):
+    vars = [
+        Variable('x', 0, None),
+        Variable('y', 0, None),
+        VariableGroup('z', ['a', 'b'], 0, 10)
+    ]
+
+
+class LPCapacityConstraint(Constraint):
+    def define(self, x, y):
+        return x + y <= 4
+
+
+class LPLimitConstraint(Constraint):
+    def define(self, x):
+        return x <= 3
+
+
+class LPZFamily(ConstraintFamily):
+    def define(self, z):
+        for key, var in z.items():
+            yield key, var <= 5
+
+
+class LPObjective(ObjectiveComponent):
+    def define(self, x, y, z):
+        return 3 * x + 2 * y + z['a'] - z['b']
+
+
+class LPZMetric(Metric):
+    def define(self, z):
+        return z['a'] + z['b']
+
+
+class LPProblem(Problem):
+    variables = LPVariables
+    objective = LPObjective
+    constraints = [LPCapacityConstraint, LPLimitConstraint, LPZFamily]
+    sense = MAXIMIZE
+
+
+def test_read_sensitivity():
+    prob = LPProblem()
+    assert prob.solve() == 'Optimal'
+    assert prob.constraint_duals == {'LPCapacityConstraint': 2, 'LPLimitConstraint': 1,
+                                     'LPZFamily': OrderedDict([('a', 1), ('b', 0)])}
+    assert prob.constraint_slacks == {'LPCapacityConstraint': 0, 'LPLimitConstraint': 0,
+                                      'LPZFamily': OrderedDict([('a', 0), ('b', 5)])}
+    assert prob.reduced_costs == {'x': 0, 'y': 0, 'z': {'a': 0, 'b': -1}}
+
+
+def test_read_sensitivity_presolve():
+    prob = LPProblem()
+    prob.presolve = True
+    assert prob.solve() == 'Optimal'
+    assert prob.constraint_duals['LPCapacityConstraint'] == 2
+    assert prob.constraint_duals['LPLimitConstraint'] is None
+    assert prob.constraint_slacks['LPLimitConstraint'] == 0
+    assert prob.constraint_slacks['LPZFamily'] == OrderedDict([('a', 0), ('b', 5)])
+
+
+def test_read_results_sensitivity():
+    prob = TestProblem()
+    prob.read_result_variables = Mock()
+    prob.read_constraint_values = Mock()
+    prob.read_sensitivity = Mock()
+    prob.read_metric_values = Mock()
+    prob.read_results()
+    prob.read_sensitivity.assert_called_once()
+
+
+def test_parametric_rhs():
+    prob = LPProblem()
+    solve_args = {'solver': pl.PULP_CBC_CMD(msg=0)}
+    assert prob.parametric_rhs('LPCapacityConstraint', 0, 10, solve_args=solve_args) == [(0, 5), (3, 14), (10, 28)]
+    assert prob.parametric_rhs('LPZFamily', 0, 12, key='a', solve_args=solve_args) == [(0, 11), (10, 21), (12, 21)]
+    assert -prob.implemented_constraints['LPCapacityConstraint'].constant == 4
+    assert -prob.implemented_constraints['LPZFamily']['a'].constant == 5
+    with pytest.raises(AssertionError):
+        prob.parametric_rhs('LPZFamily', 0, 12)
+
+
+def test_parametric_cost():
+    prob = LPProblem()
+    solve_args = {'solver': pl.PULP_CBC_CMD(msg=0)}
+    assert prob.parametric_cost('x', 0, 5, solve_args=solve_args) == [(0, 13), (2, 13), (5, 22)]
+    assert prob.parametric_cost('z', -2, 2, key='b', solve_args=solve_args) == [(-2, 16), (0, 16), (2, 26)]
+    assert dict(prob.prob.objective) == {prob.vars['x']: 3, prob.vars['y']: 2, prob.vars['z']['a']: 1,
+                                         prob.vars['z']['b']: -1}
+
+
+def test_parametric_infeasible():
+    prob = LPProblem()
+    with pytest.raises(ValueError):
+        prob.parametric_rhs('LPCapacityConstraint', -2, 4, solve_args={'solver': pl.PULP_CBC_CMD(msg=0)})
+    assert -prob.implemented_constraints['LPCapacityConstraint'].constant == 4
+
+
+def test_parametric_mip():
+    prob = FamilyProblem()
+    with pytest.raises(AssertionError):
+        prob.parametric_rhs('OnePerSlotFamily', 0, 2, key=0)
+
+
+def test_solve_pool():
+    prob = FamilyProblem()
+    pool = prob.solve_pool(8, {'solver': pl.PULP_CBC_CMD(msg=0)})
+    assert len(pool) == 8
+    assert list(pool.objectives) == [2] * 6 + [1] * 2
+    assert len(set(tuple(values) for values in pool.values)) == 8
+    assert prob.prob.numConstraints() == 5
+    assert prob.status == pl.LpStatusOptimal
+    assert prob.result_variables == pool.get_result_variables(0)
+    assert sum(prob.result_variables['picks'].values()) == 2
+
+
+def test_solve_pool_exhausted():
+    prob = FamilyProblem()
+    pool = prob.solve_pool(20, {'solver': pl.PULP_CBC_CMD(msg=0)})
+    assert len(pool) == 13
+    assert prob.prob.numConstraints() == 5
+
+
+class UnusedBinaryVariables(VariableManager):
+    vars = [
+        BinaryVariableGroup('picks', [(item, slot) for item in 'abc' for slot in range(2)]),
+        BinaryVariable('unused')
+    ]
+
+
+class UnusedBinaryProblem(FamilyProblem):
+    variables = UnusedBinaryVariables
+
+
+def test_solve_pool_unused_binary():
+    prob = UnusedBinaryProblem()
+    pool = prob.solve_pool(3, {'solver': pl.PULP_CBC_CMD(msg=0)})
+    assert len(pool) == 3
+    assert prob.result_variables['unused'] is None
+
+
+def test_solve_pool_resets_sol_status():
+    prob = FamilyProblem()
+    prob.sol_status = pl.LpSolutionIntegerFeasible
+    prob.solve_pool(2, {'solver': pl.PULP_CBC_CMD(msg=0)})
+    assert prob.get_status() == 'Optimal'
+
+
+def test_solve_pool_no_binaries():
+    prob = LPProblem()
+    with pytest.raises(AssertionError):
+        prob.solve_pool(2)
+
+
+ROLL_WIDTH = 10
+ROLL_ITEMS = OrderedDict([('s', (3, 4)), ('m', (4, 3)), ('l', (5, 2))])
+
+
+class RollVariables(VariableManager):
+    vars = [
+        VariableGroup('patterns', [(('s', 3),), (('m', 2),), (('l', 2),)], 0, None, INTEGER)
+    ]
+
+
+class RollDemandFamily(ConstraintFamily):
+    def define(self, patterns):
+        for item, (width, demand) in ROLL_ITEMS.items():
+            yield item, sum(dict(key).get(item, 0) * var for key, var in patterns.items()) >= demand
+
+
+class RollObjective(ObjectiveComponent):
+    def define(self, patterns):
+        return sum(patterns.values())
+
+
+class RollProblem(Problem):
+    variables = RollVariables
+    objective = RollObjective
+    constraints = [RollDemandFamily]
+
+
+def roll_pricing(duals):
+    best_value, best_pattern = 1 + 1e-9, None
+    for counts in itertools.product(*[range(ROLL_WIDTH // width + 1) for width, demand in ROLL_ITEMS.values()]):
+        if sum(count * width for count, (width, demand) in zip(counts, ROLL_ITEMS.values())) > ROLL_WIDTH:
+            continue
+        value = sum(count * duals['RollDemandFamily'][item] for count, item in zip(counts, ROLL_ITEMS))
+        if value > best_value:
+            best_value, best_pattern = value, tuple((item, count) for item, count in zip(ROLL_ITEMS, counts) if count)
+    if best_pattern is None:
+        return []
+    coefficients = {('RollDemandFamily', item): count for item, count in best_pattern}
+    return [Column('patterns', best_pattern, 1, coefficients, 0, None, INTEGER)]
+
+
+def test_add_column():
+    prob = RollProblem()
+    var = prob.add_column(Column('patterns', (('s', 1), ('m', 1)), 2, {('RollDemandFamily', 's'): 1,
+                                                                       ('RollDemandFamily', 'm'): 1}))
+    assert prob.vars['patterns'][(('s', 1), ('m', 1))] is var
+    assert var.cat == pl.LpContinuous
+    assert prob.prob.objective[var] == 2
+    assert prob.implemented_constraints['RollDemandFamily']['s'][var] == 1
+    assert var not in prob.implemented_constraints['RollDemandFamily']['l'].keys()
+    with pytest.raises(AssertionError):
+        prob.add_column(Column('patterns', (('s', 1), ('m', 1)), 2, {}))
+
+
+def test_generate_columns():
+    solve_args = {'solver': pl.PULP_CBC_CMD(msg=0)}
+    prob = RollProblem()
+    log = prob.generate_columns(roll_pricing, solve_args=solve_args)
+    assert [entry['columns'] for entry in log] == [1, 0]
+    assert log[-1]['objective'] == pytest.approx(3.5)
+    assert len(prob.vars['patterns']) == 4
+    assert all(var.cat == pl.LpInteger for var in prob.vars['patterns'].values())
+    assert prob.solve(solve_args) == 'Optimal'
+    assert pl.value(prob.prob.objective) == 4
+    assert prob.result_variables['patterns'][(('s', 2), ('m', 1))] == 2
+
+
+def test_generate_columns_pricing_args():
+    pricing = Mock()
+    pricing.return_value = []
+    prob = RollProblem()
+    prob.build_model()
+    with patch('horuslp.core.ProblemClass.call_with_required_args') as cwra:
+        cwra.return_value = []
+        prob.generate_columns(pricing, solve_args={'solver': pl.PULP_CBC_CMD(msg=0)})
+        args = cwra.call_args_list[-1][0]
+    assert args[0] is pricing
+    assert set(args[1].keys()) == {'duals', 'reduced_costs', 'result_variables', 'problem'}
+
+
+BANNED_PAIRS = [('a', 'b'), ('b', 'c'), ('a', 'c'), ('d', 'e')]
+
+
+class BanVariables(VariableManager):
+    vars = [
+        BinaryVariableGroup('picks', list('abcde'))
+    ]
+
+
+class BanLazyConstraint(LazyConstraint):
+    def separate(self, picks):
+        return [pair for pair in BANNED_PAIRS if picks[pair[0]] + picks[pair[1]] > 1.5]
+
+    def define_row(self, key, picks):
+        return picks[key[0]] + picks[key[1]] <= 1
+
+
+class BanFamily(ConstraintFamily):
+    def define(self, picks):
+        for pair in BANNED_PAIRS:
+            yield pair, picks[pair[0]] + picks[pair[1]] <= 1
+
+
+class BanObjective(ObjectiveComponent):
+    def define(self, picks):
+        return sum(picks.values())
+
+
+class LazyBanProblem(Problem):
+    variables = BanVariables
+    objective = BanObjective
+    constraints = [BanLazyConstraint]
+    sense = MAXIMIZE
+
+
+class FullBanProblem(LazyBanProblem):
+    constraints = [BanFamily]
+
+
+def test_solve_lazy():
+    solve_args = {'solver': pl.PULP_CBC_CMD(msg=0)}
+    full = FullBanProblem()
+    full.solve(solve_args)
+    prob = LazyBanProblem()
+    prob.build_model()
+    assert prob.prob.numConstraints() == 0
+    assert prob.solve_lazy(solve_args=solve_args) == 'Optimal'
+    assert pl.value(prob.prob.objective) == pl.value(full.prob.objective) == 2
+    rows = prob.implemented_constraints['BanLazyConstraint']
+    assert 0 < len(rows) <= len(BANNED_PAIRS)
+    assert prob.prob.numConstraints() == len(rows)
+    assert all(prob.result_variables['picks'][a] + prob.result_variables['picks'][b] <= 1 for a, b in BANNED_PAIRS)
+    assert list(prob.constraint_results['BanLazyConstraint'].keys()) == list(rows.keys())
+    assert [row.name for row in get_model_rows(prob.prob)] == ['BanLazyConstraint_%s_%s_' % key for key in rows]
+
+
+def test_solve_lazy_columnar():
+    prob = LazyBanProblem()
+    prob.columnar_results = True
+    assert prob.solve_lazy(solve_args={'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Optimal'
+    assert pl.value(prob.prob.objective) == 2
+    assert prob.result_variables == {}
+
+
+class AtMostThree(Constraint):
+    def define(self, picks):
+        return pl.lpSum(picks.values()) <= 3
+
+
+class LazyBanLimitProblem(LazyBanProblem):
+    constraints = [BanLazyConstraint, AtMostThree]
+
+
+def test_save_load_lazy_model(tmp_path):
+    path = str(tmp_path / 'model.hlp')
+    prob = LazyBanLimitProblem()
+    assert prob.solve_lazy(solve_args={'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Optimal'
+    prob.save_model(path)
+    loaded = LazyBanLimitProblem()
+    loaded.load_model(path)
+    for key, row in prob.implemented_constraints['BanLazyConstraint'].items():
+        loaded_row = loaded.implemented_constraints['BanLazyConstraint'][key]
+        assert loaded_row.name == row.name
+        assert [(var.name, coef) for var, coef in loaded_row.items()] == [(var.name, coef) for var, coef in row.items()]
+    assert loaded.implemented_constraints['AtMostThree'].name == 'AtMostThree'
+    assert loaded.solve() == 'Optimal'
+    assert loaded.constraint_results == prob.constraint_results
+
+
+def test_solve_lazy_key_variable():
+    class KeyVariables(VariableManager):
+        vars = [BinaryVariableGroup('picks', list('abcde')), BinaryVariable('key')]
+
+    class KeyProblem(LazyBanProblem):
+        variables = KeyVariables
+
+    with pytest.raises(AssertionError, match="named 'key'"):
+        KeyProblem().solve_lazy(solve_args={'solver': pl.PULP_CBC_CMD(msg=0)})
+
+
+def test_solve_lazy_max_rounds():
+    prob = LazyBanProblem()
+    assert prob.solve_lazy(max_rounds=1, solve_args={'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Not Solved'
+    assert prob.get_status() == 'Not Solved'
+    assert sum(prob.result_variables['picks'].values()) == 5
+    assert len(prob.implemented_constraints['BanLazyConstraint']) == len(BANNED_PAIRS)
+    prob = LazyBanProblem()
+    assert prob.solve_lazy(max_rounds=0) == 'Not Solved'
+    assert prob.result_variables == {}
+
+
+def test_add_violated_rows_skips_existing():
+    prob = LazyBanProblem()
+    prob.build_model()
+    prob.result_variables = {'picks': {'a': 1, 'b': 1, 'c': 0, 'd': 0, 'e': 0}}
+    lazy = prob.flattened_constraints
+    assert prob.add_violated_rows(lazy) == 1
+    assert prob.add_violated_rows(lazy) == 0
+    assert list(prob.implemented_constraints['BanLazyConstraint'].keys()) == [('a', 'b')]
+
+
+def test_read_result_table():
+    prob = LPProblem()
+    prob.metrics = [LPZMetric]
+    assert prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Optimal'
+    table = prob.read_result_table()
+    assert table.to_dict('variable') == prob.result_variables
+    assert table.to_dict('constraint') == prob.constraint_results
+    assert table.to_dict('metric') == prob.metrics_results == {'LPZMetric': 5}
+
+
+def test_columnar_results(tmp_path):
+    prob = LPProblem()
+    prob.columnar_results = True
+    assert prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Optimal'
+    assert prob.result_variables == {}
+    assert prob.constraint_results == {}
+    assert prob.result_table.get_value('variable', 'z', 'a') == 5
+    assert prob.result_table.get_value('constraint', 'LPCapacityConstraint') == 4
+    path = str(tmp_path / 'results.csv')
+    prob.export_results(path)
+    with open(path) as csv_file:
+        assert csv_file.read().splitlines()[:2] == ['section,group,key,value', 'variable,x,,3.0']
+
+
+def test_columnar_results_print():
+    expected = LPProblem()
+    expected.metrics = [LPZMetric]
+    expected.solve({'solver': pl.PULP_CBC_CMD(msg=0)})
+    expected_stream = io.StringIO()
+    expected.print_results(stream=expected_stream)
+    prob = LPProblem()
+    prob.metrics = [LPZMetric]
+    prob.columnar_results = True
+    prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)})
+    stream = io.StringIO()
+    prob.print_results(stream=stream)
+    assert stream.getvalue() == expected_stream.getvalue()
+    assert 'LPObjective: 16.00' in stream.getvalue()
+
+
+def test_sparse_results():
+    prob = LPProblem()
+    prob.sparse_results = True
+    prob.metrics = [LPZMetric]
+    assert prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Optimal'
+    assert prob.result_variables['z'] == {'a': 5}
+    assert prob.result_variables['z']['b'] == 0
+    assert prob.result_variables['x'] == 3
+    assert prob.metrics_results == {'LPZMetric': 5}
+    assert isinstance(prob.reduced_costs['z'], SparseValues)
+    assert prob.reduced_costs['z'] == {'b': -1}
+    assert prob.reduced_costs['z']['a'] == 0
+    assert prob.reduced_costs['x'] == 0
+
+
+def test_sparse_results_groups():
+    prob = LPProblem()
+    prob.sparse_results = ['other']
+    assert prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Optimal'
+    assert prob.result_variables['z'] == {'a': 5, 'b': 0}
+    assert prob.reduced_costs['z'] == {'a': 0, 'b': -1}
+    prob.sparse_results = ['z']
+    prob.sparse_threshold = 10
+    prob.read_result_variables()
+    assert prob.result_variables['z'] == {}
+
+
+class KnapsackVariables(VariableManager):
+    vars = [BinaryVariableGroup('pick', list(range(60)))]
+
+
+def knapsack_data():
+    random = __import__('random').Random(3)
+    weights = [random.randint(100, 1000) for _ in range(60)]
+    values = [weight + random.randint(-5, 5) for weight in weights]
+    return weights, values, [random.randint(1, 50) for _ in range(60)]
+
+
+class KnapsackWeightConstraint(Constraint):
+    def define(self, pick):
+        weights, _, _ = knapsack_data()
+        return pl.lpDot(weights, list(pick.values())) <= sum(weights) // 2 + 7
+
+
+class KnapsackVolumeConstraint(Constraint):
+    def define(self, pick):
+        _, _, volumes = knapsack_data()
+        return pl.lpDot(volumes, list(pick.values())) <= 600
+
+
+class KnapsackObjective(ObjectiveComponent):
+    def define(self, pick):
+        _, values, _ = knapsack_data()
+        return sum(value * pick[i] for i, value in enumerate(values))
+
+
+class KnapsackProblem(Problem):
+    variables = KnapsackVariables
+    objective = KnapsackObjective
+    constraints = [KnapsackWeightConstraint, KnapsackVolumeConstraint]
+    sense = MAXIMIZE
+
+
+def test_solve_node_limit():
+    prob = KnapsackProblem()
+    solver = pl.PULP_CBC_CMD(msg=0, options=['cuts off'])
+    assert prob.solve({'solver': solver}, node_limit=1) == 'Feasible'
+    assert prob.sol_status == pl.LpSolutionIntegerFeasible
+    _, values, _ = knapsack_data()
+    incumbent = sum(value * prob.result_variables['pick'][i] for i, value in enumerate(values))
+    assert incumbent == pl.value(prob.prob.objective)
+    assert solver.optionsDict.get('maxNodes') is None
+    stream = io.StringIO()
+    prob.print_results(stream=stream, summary=True)
+    assert stream.getvalue().startswith('KnapsackProblem: Feasible\n')
+    assert prob.solve({'solver': solver}) == 'Optimal'
+    assert pl.value(prob.prob.objective) > incumbent
+
+
+def test_get_solve_args():
+    prob = TestProblem()
+    solve_args = {'solver': pl.PULP_CBC_CMD(msg=0), 'other': 1}
+    assert prob.get_solve_args(solve_args) is solve_args
+    prob.time_limit = 5
+    limited = prob.get_solve_args(solve_args, rel_gap=0.1)
+    assert limited['other'] == 1
+    assert (limited['solver'].timeLimit, limited['solver'].optionsDict['gapRel']) == (5, 0.1)
+    assert prob.get_solve_args(solve_args, time_limit=2)['solver'].timeLimit == 2
+
+
+def test_progress_callbacks():
+    prob = KnapsackProblem()
+    events = []
+    prob.add_progress_callback(events.append)
+    assert prob.solve({'solver': pl.PULP_CBC_CMD(msg=0)}) == 'Optimal'
+    assert events
+    assert events[-1].incumbent == pl.value(prob.prob.objective)
+    assert all(event.bound is not None for event in events)
+    prob.remove_progress_callback(events.append)
+    assert prob.progress_callbacks == []
+
+
+def test_progress_callbacks_unsupported_args():
+    prob = KnapsackProblem()
+    prob.add_progress_callback(Mock())
+    with pytest.raises(AssertionError, match='warmStart'):
+        prob.solve({'solver': pl.PULP_CBC_CMD(msg=0), 'warmStart': True})
+    with pytest.raises(AssertionError, match='warmStart'):
+        asyncio.run(KnapsackProblem().solve_async({'warmStart': True}))
+
+
+class BusyKnapsackVariables(VariableManager):
+    vars = [BinaryVariableGroup('pick', list(range(120)))]
+
+
+class BusyKnapsackConstraints(ConstraintFamily):
+    def define(self, pick):
+        random = __import__('random').Random(1)
+        for resource in range(20):
+            yield resource, pl.lpSum(random.randint(1, 1000) * var for var in pick.values()) <= 6000
+
+
+class BusyKnapsackObjective(ObjectiveComponent):
+    def define(self, pick):
+        random = __import__('random').Random(2)
+        return pl.lpSum(random.randint(1, 1000) * var for var in pick.values())
+
+
+class BusyKnapsackProblem(Problem):
+    variables = BusyKnapsackVariables
+    objective = BusyKnapsackObjective
+    constraints = [BusyKnapsackConstraints]
+    sense = MAXIMIZE
+
+
+def test_progress_callback_stop():
+    prob = BusyKnapsackProblem()
+    events = []
+
+    def stop_at_first_solution(event):
+        events.append(event)
+        return event.incumbent is not None
+
+    prob.add_progress_callback(stop_at_first_solution)
+    prob.add_progress_callback(Mock(return_value=None))
+    assert prob.solve({'solver': pl.PULP_CBC_CMD(msg=0, timeLimit=30)}) == 'Feasible'
+    first_solution = next(event for event in events if event.incumbent is not None)
+    assert pl.value(prob.prob.objective) >= first_solution.incumbent
+    assert prob.progress_callbacks[1].call_count == len(events)
+
+
+class BadlyScaledVariables(VariableManager):
+    vars = [
+        Variable('x', 0, None),
+        Variable('y', 0, 1e5),
+        IntegerVariable('n', 0, 10)
+    ]
 
 
+class BadlyScaledBudget(Constraint):
+    def define(self, x, y):
+        return 1e-4 * x + 2e3 * y <= 5e2
+
+
+class BadlyScaledCapacity(Constraint):
+    def define(self, x, n):
+        return 1e7 * x + 1e4 * n <= 3e11
+
+
+class BadlyScaledObjective(ObjectiveComponent):
+    def define(self, x, y, n):
+        return 3e-4 * x + 2e3 * y + n
+
+
+class BadlyScaledProblem(Problem):
+    variables = BadlyScaledVariables
+    objective = BadlyScaledObjective
+    constraints = [BadlyScaledBudget, BadlyScaledCapacity]
+    sense = MAXIMIZE
+
+
+@pytest.mark.parametrize('presolve', [False, True])
+def test_solve_scaling(presolve):
+    expected = BadlyScaledProblem()
+    assert expected.solve() == 'Optimal'
+    prob = BadlyScaledProblem()
+    prob.scaling = True
+    prob.presolve = presolve
+    assert prob.solve() == 'Optimal'
+    assert prob.scaled.stats['ratio_after'] < prob.scaled.stats['ratio_before']
+    assert prob.result_variables == pytest.approx(expected.result_variables, rel=1e-6)
+    assert prob.constraint_duals == pytest.approx(expected.constraint_duals, rel=1e-6)
+    assert prob.reduced_costs['x'] == pytest.approx(expected.reduced_costs['x'], abs=1e-9)
+    assert prob.constraint_results['BadlyScaledBudget'] == pytest.approx(
+        expected.constraint_results['BadlyScaledBudget'], rel=1e-6)
+    assert prob.prob.objective.value() == pytest.approx(expected.prob.objective.value(), rel=1e-6)
+
+
+def test_load_model_scaling(tmp_path):
+    path = str(tmp_path / 'model.hlp')
+    expected = BadlyScaledProblem()
+    expected.save_model(path)
+    assert expected.solve() == 'Optimal'
+    loaded = BadlyScaledProblem()
+    loaded.scaling = True
+    loaded.load_model(path)
+    assert loaded.scaled is not None
+    assert loaded.solve() == 'Optimal'
+    assert loaded.scaled.stats['ratio_after'] < loaded.scaled.stats['ratio_before']
+    assert loaded.result_variables == pytest.approx(expected.result_variables, rel=1e-6)
@@ -0,0 +1,54 @@
+import io
+from collections import OrderedDict
+
+import pytest
+
+from horuslp.core.Report import Report
+
+
+def test_report_flushes_once():
+    report = Report(stream=io.StringIO())
+    with report:
+        report.line('first', 1)
+        with report:
+            report.line('second')
+        assert report.stream.getvalue() == ''
+    assert report.stream.getvalue() == 'first 1\nsecond\n'
+    assert report.lines == []
+
+
+def test_report_values():
+    report = Report(stream=io.StringIO())
+    report.add_values(OrderedDict([('x', 0), ('group', OrderedDict([('a', 1), (('b', 2), 0)]))]), '%s %s')
+    assert report.lines == ['x 0', 'group[a] 1', "group[('b', 2)] 0"]
+    report.lines = []
+    report.add_values({'100%': {'a': 1.234}}, '%s: %.2f')
+    assert report.lines == ['100%[a]: 1.23']
+
+
+def test_report_nonzero():
+    report = Report(nonzero=True, tolerance=0.1)
+    report.add_values(OrderedDict([('x', 0.05), ('y', None), ('group', {'a': 1, 'b': -0.01, 'c': None})]), '%s %s')
+    assert report.lines == ['group[a] 1']
+
+
+def test_report_top_and_groups():
+    report = Report(top=2, groups={'group'})
+    report.add_values(OrderedDict([('x', 5), ('group', OrderedDict([('a', 1), ('b', -3), ('c', None), ('d', 2)]))]),
+                      '%s: %s')
+    assert report.lines == ['group[b]: -3', 'group[d]: 2']
+    with pytest.raises(AssertionError):
+        Report(top=-1)
+
+
+def test_report_summary():
+    report = Report(summary=True)
+    report.add_values(OrderedDict([('x', 1.5), ('long_name', {'a': 0, 'b': None, 'c': -2})]), '%s %s')
+    assert report.lines == [
+        'name       count  nonzero    min   max  total',
+        'x              1        1   1.50  1.50   1.50',
+        'long_name      3        1  -2.00  0.00  -2.00'
+    ]
+    report.lines = []
+    report.add_values(OrderedDict([('y', None)]), '%s %s')
+    assert report.lines[1] == 'y         1        0    -    -      -'
@@ -0,0 +1,79 @@
+import csv
+import math
+from array import array
+from collections import OrderedDict
+
+import pytest
+
+from horuslp.core.ResultTable import ResultTable, VARIABLE, CONSTRAINT
+
+
+@pytest.fixture
+def table():
+    table = ResultTable()
+    table.add_group(VARIABLE, 'x', None, [1.5])
+    table.add_group(VARIABLE, 'group', ['a', 'b', ('c', 1)], [0, None, 2])
+    table.add_group(CONSTRAINT, 'capacity', None, array('d', [4]))
+    return table
+
+
+def test_add_group(table):
+    keys, values = table.get_group(VARIABLE, 'group')
+    assert keys == ['a', 'b', ('c', 1)]
+    assert isinstance(values, array)
+    assert math.isnan(values[1])
+    assert len(table) == 5
+    assert table.groups(VARIABLE) == [(VARIABLE, 'x'), (VARIABLE, 'group')]
+    assert table.groups() == [(VARIABLE, 'x'), (VARIABLE, 'group'), (CONSTRAINT, 'capacity')]
+    with pytest.raises(AssertionError):
+        table.add_group(VARIABLE, 'bad', ['a'], [1, 2])
+
+
+def test_get_value(table):
+    assert table.get_value(VARIABLE, 'x') == 1.5
+    assert table.get_value(VARIABLE, 'group', ('c', 1)) == 2
+    assert table.get_value(VARIABLE, 'group', 'b') is None
+
+
+def test_to_dict(table):
+    assert table.to_dict(VARIABLE) == {'x': 1.5, 'group': OrderedDict([('a', 0), ('b', None), (('c', 1), 2)])}
+    assert table.to_dict(CONSTRAINT) == {'capacity': 4}
+
+
+def test_iter_rows(table):
+    batches = list(table.iter_rows(batch_size=2))
+    assert [len(batch) for batch in batches] == [1, 2, 1, 1]
+    assert batches[2] == [(VARIABLE, 'group', "('c', 1)", 2)]
+
+
+def test_write_csv(table, tmp_path):
+    path = str(tmp_path / 'results.csv')
+    table.write(path, batch_size=2)
+    with open(path, newline='') as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert rows == [
+        ['section', 'group', 'key', 'value'],
+        ['variable', 'x', '', '1.5'],
+        ['variable', 'group', 'a', '0.0'],
+        ['variable', 'group', 'b', ''],
+        ['variable', 'group', "('c', 1)", '2.0'],
+        ['constraint', 'capacity', '', '4.0'],
+    ]
+
+
+def test_write_unknown_format(table):
+    with pytest.raises(ValueError):
+        table.write('results.xlsx')
+
+
+def test_write_arrow_parquet(table, tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    table.write(str(tmp_path / 'results.arrow'), batch_size=2)
+    arrow_table = pa.ipc.open_file(str(tmp_path / 'results.arrow')).read_all()
+    assert arrow_table.column('key').to_pylist() == ['', 'a', 'b', "('c', 1)", '']
+    table.write(str(tmp_path / 'results.parquet'))
+    parquet_table = pq.read_table(str(tmp_path / 'results.parquet'))
+    values = parquet_table.column('value').to_pylist()
+    assert (values[0], values[1], values[3], values[4]) == (1.5, 0, 2, 4)
+    assert parquet_table.column('group').to_pylist() == ['x', 'group', 'group', 'group', 'capacity']
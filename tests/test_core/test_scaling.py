@@ -0,0 +1,76 @@
+import math
+
+import pulp as pl
+import pytest
+
+from horuslp.core.presolve import INFINITY
+from horuslp.core.scaling import scale_problem, ScaledProblem
+from horuslp.core.utils import get_model_rows
+
+
+def build_model():
+    x = pl.LpVariable('x', 0, None)
+    y = pl.LpVariable('y', 0, 1e5)
+    n = pl.LpVariable('n', 0, 10, pl.LpInteger)
+    prob = pl.LpProblem('test', pl.LpMaximize)
+    prob += 3e-4 * x + 2e3 * y + n
+    prob += 1e-4 * x + 2e3 * y <= 5e2, 'budget'
+    prob += 1e7 * x + 1e4 * n <= 3e11, 'capacity'
+    prob += 2e-3 * y + n >= 1, 'minimum'
+    return prob, x, y, n
+
+
+def solve_values(prob):
+    assert prob.solve(pl.PULP_CBC_CMD(msg=0)) == pl.LpStatusOptimal
+    rows = {row.name: (row.pi, row.slack) for row in get_model_rows(prob)}
+    return {var.name: (var.varValue, var.dj) for var in prob.variables()}, rows
+
+
+def test_compute():
+    prob, x, y, n = build_model()
+    scaled = scale_problem(prob)
+    assert scaled.stats['ratio_before'] == 1e7 / 1e-4
+    assert scaled.stats['ratio_after'] < scaled.stats['ratio_before'] / 1e4
+    assert scaled.stats['scaled_rows'] == len(scaled.row_factors) > 0
+    assert n not in scaled.column_factors
+    for factor in list(scaled.row_factors.values()) + list(scaled.column_factors.values()):
+        assert factor == 2.0 ** round(math.log(factor, 2))
+
+
+def test_compute_well_scaled():
+    x = pl.LpVariable('x', 0)
+    prob = pl.LpProblem('test', pl.LpMinimize)
+    prob += x
+    prob += x >= 1
+    scaled = scale_problem(prob)
+    assert scaled.row_factors == {} and scaled.column_factors == {}
+    assert scaled.stats['ratio_after'] == scaled.stats['ratio_before'] == 1
+
+
+def test_scale_unscale():
+    expected_vars, expected_rows = solve_values(build_model()[0])
+    prob, x, y, n = build_model()
+    scaled = scale_problem(prob)
+    model = scaled.scale()
+    assert model.solve(pl.PULP_CBC_CMD(msg=0)) == pl.LpStatusOptimal
+    scaled.unscale()
+    assert prob.status == pl.LpStatusOptimal
+    for var in (x, y, n):
+        value, dj = expected_vars[var.name]
+        assert var.varValue == pytest.approx(value, rel=1e-6)
+        assert var.dj == pytest.approx(dj, rel=1e-6, abs=1e-9)
+    for row in get_model_rows(prob):
+        pi, slack = expected_rows[row.name]
+        assert row.pi == pytest.approx(pi, rel=1e-6, abs=1e-9)
+        # the activities in the solution file are rounded, relative to the right hand side
+        assert row.slack == pytest.approx(slack, abs=1e-6 * max(1, abs(row.constant)))
+    assert x.upBound is None and y.upBound == 1e5
+
+
+def test_scale_free_row():
+    prob, x, y, n = build_model()
+    scaled = ScaledProblem(prob)
+    scaled.compute()
+    prob.constraints['budget'].changeRHS(INFINITY)
+    model = scaled.scale()
+    assert -model.constraints['budget'].constant == INFINITY
@@ -0,0 +1,75 @@
+import pulp as pl
+import pytest
+
+from horuslp.core.serialization import pack_model, unpack_model, save_model, load_model, share_model, attach_model
+from horuslp.core.utils import get_model_rows
+
+
+def build_prob():
+    x = pl.LpVariable('x', 0, 4, pl.LpInteger)
+    y = pl.LpVariable('y', None, 3)
+    prob = pl.LpProblem('test', pl.LpMaximize)
+    prob += 3 * x + 2 * y + 1
+    prob += x + y <= 5
+    prob += x - y >= -2, 'named_row'
+    return prob, x, y
+
+
+def check_unpacked(unpacked, prob):
+    new_prob, variables, layout = unpacked
+    assert new_prob.name == 'test'
+    assert new_prob.sense == pl.LpMaximize
+    assert [(var.name, var.lowBound, var.upBound, var.cat) for var in variables] == \
+        [('x', 0, 4, pl.LpInteger), ('y', None, 3, pl.LpContinuous)]
+    rows = get_model_rows(new_prob)
+    assert [(row.name, row.sense, -row.constant) for row in rows] == \
+        [(None, pl.LpConstraintLE, 5), ('named_row', pl.LpConstraintGE, -2)]
+    assert [(var.name, coef) for var, coef in rows[1].items()] == [('x', 1), ('y', -1)]
+    assert new_prob.objective.constant == 1
+    assert layout == {'layout': [1, 2]}
+    new_prob.solve(pl.PULP_CBC_CMD(msg=0))
+    prob.solve(pl.PULP_CBC_CMD(msg=0))
+    assert [var.varValue for var in variables] == [var.varValue for var in prob.variables()]
+
+
+def test_pack_model():
+    prob, x, y = build_prob()
+    check_unpacked(unpack_model(pack_model(prob, {'layout': [1, 2]})), prob)
+
+
+def test_unpack_model_var_lookup():
+    prob, x, y = build_prob()
+    new_prob, variables, layout = unpack_model(pack_model(prob), {'x': x})
+    assert variables[0] is x
+    assert variables[1] is not y
+    assert layout is None
+
+
+def test_pack_model_layout():
+    prob, x, y = build_prob()
+    layout = [('family', [(0, 'a'), (1, 'b')]), ('single', None), ('empty', True), ('lookup', {1: 2.5, (1, 2): 'c'})]
+    assert unpack_model(pack_model(prob, layout))[2] == layout
+    with pytest.raises(TypeError):
+        pack_model(prob, [object()])
+
+
+def test_unpack_model_invalid():
+    with pytest.raises(ValueError):
+        unpack_model(b'not a model' * 10)
+
+
+def test_save_load_model(tmp_path):
+    prob, x, y = build_prob()
+    path = str(tmp_path / 'model.hlp')
+    save_model(prob, path, {'layout': [1, 2]})
+    check_unpacked(load_model(path), prob)
+
+
+def test_share_attach_model():
+    prob, x, y = build_prob()
+    block = share_model(prob, {'layout': [1, 2]})
+    try:
+        check_unpacked(attach_model(block.name), prob)
+    finally:
+        block.close()
+        block.unlink()
@@ -0,0 +1,18 @@
+import math
+
+from horuslp.core.SolutionPool import SolutionPool
+
+
+def test_solution_pool():
+    pool = SolutionPool([('x', None), ('group', 'a'), ('group', 'b')])
+    assert len(pool) == 0
+    pool.add([1, 0, None], 5)
+    pool.add([0, 1, 2.5], 3)
+    assert len(pool) == 2
+    objective, values = pool[1]
+    assert objective == 3
+    assert list(values) == [0, 1, 2.5]
+    assert math.isnan(pool[0][1][2])
+    assert list(pool.objectives) == [5, 3]
+    assert pool.get_result_variables(0) == {'x': 1, 'group': {'a': 0, 'b': None}}
+    assert pool.get_result_variables(1) == {'x': 0, 'group': {'a': 1, 'b': 2.5}}
@@ -0,0 +1,121 @@
+import os
+import subprocess
+import pulp as pl
+import pytest
+
+from horuslp.core.solver import CbcLogParser, CbcProcess, CbcRun, ProgressEvent, apply_limits, check_log_solve_args
+
+
+def test_progress_event_gap():
+    assert ProgressEvent(0, None, 10, 0, '').gap is None
+    assert ProgressEvent(0, 8, None, 0, '').gap is None
+    assert ProgressEvent(0, 8, 10, 0, '').gap == 0.25
+
+
+def test_parse_minimize():
+    parser = CbcLogParser()
+    assert parser.parse('Coin0008I MODEL read with 0 errors') is None
+    event = parser.parse('Continuous objective value is 330 - 0.01 seconds')
+    assert (event.bound, event.incumbent, event.elapsed) == (330, None, 0.01)
+    event = parser.parse('Cbc0010I After 0 nodes, 1 on tree, 1e+50 best solution, best possible 331.5 (0.02 seconds)')
+    assert (event.bound, event.incumbent, event.nodes, event.elapsed) == (331.5, None, 0, 0.02)
+    event = parser.parse('Cbc0012I Integer solution of 335 found by feasibility pump after 0 iterations and 3 nodes '
+                         '(0.03 seconds)')
+    assert (event.bound, event.incumbent, event.nodes, event.elapsed) == (331.5, 335, 3, 0.03)
+    event = parser.parse('Cbc0001I Search completed - best objective 333, took 10 iterations and 7 nodes '
+                         '(0.05 seconds)')
+    assert (event.incumbent, event.nodes, event.elapsed) == (333, 7, 0.05)
+    assert event.line.startswith('Cbc0001I')
+
+
+def test_parse_maximize():
+    parser = CbcLogParser(maximize=True)
+    event = parser.parse('Continuous objective value is 576.829 - 0.00 seconds')
+    assert event.bound == 576.829
+    event = parser.parse('Cbc0010I After 0 nodes, 1 on tree, 1e+50 best solution, best possible -576.82944 '
+                         '(0.00 seconds)')
+    assert event.bound == 576.82944
+    event = parser.parse('Cbc0004I Integer solution of -516 found after 32 iterations and 23 nodes (0.00 seconds)')
+    assert event.incumbent == 516
+    assert event.nodes == 23
+
+
+def test_cbc_run():
+    x = pl.LpVariable('x', 0, 3, pl.LpInteger)
+    y = pl.LpVariable('y', 0, 3, pl.LpInteger)
+    prob = pl.LpProblem('test', pl.LpMaximize)
+    prob += 2 * x + y
+    prob += x + y <= 4
+    run = CbcRun(prob)
+    args = run.prepare()
+    assert '-max' in args
+    assert os.path.exists(run.files[0])
+    subprocess.run(args, stdout=subprocess.DEVNULL, check=True)
+    assert run.read_solution() == pl.LpStatusOptimal
+    assert run.files is None
+    assert (x.varValue, y.varValue) == (3, 1)
+    assert prob.status == pl.LpStatusOptimal
+
+
+def test_cbc_run_options():
+    x = pl.LpVariable('x', 0, 3)
+    prob = pl.LpProblem('test', pl.LpMinimize)
+    prob += x
+    run = CbcRun(prob, pl.PULP_CBC_CMD(msg=0, timeLimit=5, mip=False, options=['presolve off']))
+    args = run.prepare()
+    run.cleanup()
+    assert args[args.index('-sec') + 1] == '5'
+    assert '-initialSolve' in args
+    assert args[args.index('-presolve') + 1] == 'off'
+
+
+def test_cbc_run_solver_type():
+    with pytest.raises(AssertionError):
+        CbcRun(pl.LpProblem('test'), 'not_a_solver')
+
+
+def test_cbc_process():
+    x = pl.LpVariable('x', 0, 3, pl.LpInteger)
+    y = pl.LpVariable('y', 0, 3, pl.LpInteger)
+    prob = pl.LpProblem('test', pl.LpMaximize)
+    prob += 2 * x + y
+    prob += 2 * x + 3 * y <= 7.5
+    events = []
+    process = CbcProcess(prob, maximize=True)
+    assert process.run(events.append) == pl.LpStatusOptimal
+    assert process.cbc_run.files is None
+    assert (x.varValue, y.varValue) == (3, 0)
+    assert events[-1].incumbent == 6
+
+
+def test_cbc_process_killed():
+    prob = pl.LpProblem('test', pl.LpMinimize)
+    prob += pl.LpVariable('x', 0, 1)
+    process = CbcProcess(prob)
+    process.kill()
+    with pytest.raises(pl.PulpSolverError):
+        process.run()
+    assert process.cbc_run.files is None
+
+
+def test_check_log_solve_args():
+    check_log_solve_args({'solver': pl.PULP_CBC_CMD(msg=0)})
+    with pytest.raises(AssertionError):
+        check_log_solve_args({'solver': pl.PULP_CBC_CMD(msg=0), 'warmStart': True})
+
+
+def test_apply_limits():
+    solver = pl.PULP_CBC_CMD(msg=0, gapRel=0.5)
+    limited = apply_limits(solver, time_limit=10, abs_gap=2, node_limit=100)
+    assert limited is not solver
+    assert (limited.timeLimit, limited.msg) == (10, 0)
+    assert (limited.optionsDict['gapRel'], limited.optionsDict['gapAbs'], limited.optionsDict['maxNodes']) == (0.5, 2, 100)
+    assert 'maxNodes' not in solver.optionsDict
+    assert solver.timeLimit is None
+    args = CbcRun(pl.LpProblem('test'), limited).prepare()
+    assert args[args.index('-sec') + 1] == '10'
+    assert args[args.index('-maxNodes') + 1] == '100'
+
+
+def test_apply_limits_default_solver():
+    assert isinstance(apply_limits(rel_gap=0.1), pl.COIN_CMD)
@@ -0,0 +1,75 @@
+import pulp as pl
+import pytest
+from unittest.mock import Mock
+
+from horuslp.core.SolverPool import SolverPool
+from tests.test_core.test_problem import FamilyProblem, ParallelProblem, LPProblem, BadlyScaledProblem, \
+    KnapsackProblem
+
+
+class PresolveFamilyProblem(FamilyProblem):
+    presolve = True
+
+
+def test_solver_pool():
+    expected = [FamilyProblem(), ParallelProblem(), PresolveFamilyProblem()]
+    for prob in expected:
+        prob.solve()
+    problems = [FamilyProblem(), ParallelProblem(), PresolveFamilyProblem()]
+    with SolverPool(processes=2) as pool:
+        assert pool.solve_all(problems) == ['Optimal', 'Optimal', 'Optimal']
+    for prob, expected_prob in zip(problems, expected):
+        assert prob.result_variables == expected_prob.result_variables
+        assert prob.constraint_results == expected_prob.constraint_results
+        assert prob.status == expected_prob.status
+
+
+def test_solver_pool_submit():
+    with SolverPool(processes=1) as pool:
+        prob = FamilyProblem()
+        future = pool.submit(prob)
+        assert future.result() == 'Optimal'
+        assert sum(prob.result_variables['picks'].values()) == 2
+
+
+def test_solver_pool_error():
+    with SolverPool(processes=1, solve_args={'solver': 'not_a_solver'}) as pool:
+        prob = FamilyProblem()
+        prob.read_results = Mock()
+        with pytest.raises(Exception):
+            pool.submit(prob).result()
+        prob.read_results.assert_not_called()
+
+
+def test_solver_pool_sensitivity():
+    expected = LPProblem()
+    expected.solve()
+    with SolverPool(processes=1) as pool:
+        prob = LPProblem()
+        assert pool.submit(prob).result() == 'Optimal'
+    assert prob.constraint_duals == expected.constraint_duals
+    assert prob.constraint_slacks == expected.constraint_slacks
+    assert prob.reduced_costs == expected.reduced_costs
+
+
+@pytest.mark.parametrize('presolve', [False, True])
+def test_solver_pool_scaling(presolve):
+    expected = BadlyScaledProblem()
+    expected.solve()
+    with SolverPool(processes=1) as pool:
+        prob = BadlyScaledProblem()
+        prob.scaling = True
+        prob.presolve = presolve
+        assert pool.submit(prob).result() == 'Optimal'
+    assert prob.scaled.stats['ratio_after'] < prob.scaled.stats['ratio_before']
+    assert prob.result_variables == pytest.approx(expected.result_variables, rel=1e-6)
+    assert prob.constraint_duals == pytest.approx(expected.constraint_duals, rel=1e-6)
+    assert prob.prob.objective.value() == pytest.approx(expected.prob.objective.value(), rel=1e-6)
+
+
+def test_solver_pool_limits():
+    with SolverPool(processes=1, solve_args={'solver': pl.PULP_CBC_CMD(msg=0, options=['cuts off'])}) as pool:
+        prob = KnapsackProblem()
+        prob.node_limit = 1
+        assert pool.submit(prob).result() == 'Feasible'
+    assert prob.sol_status == pl.LpSolutionIntegerFeasible
@@ -0,0 +1,102 @@
+import pulp as pl
+
+from horuslp.core import Constraint, ConstraintFamily, ObjectiveComponent, Problem, VariableManager
+from horuslp.core.Variables import BinaryVariableGroup, VariableGroup
+from horuslp.core.constants import MINIMIZE
+from horuslp.core.symmetry import find_symmetries, add_symmetry_breaking
+
+
+def build_model(costs):
+    x = {key: pl.LpVariable('x_%s' % key, 0, 1, pl.LpBinary) for key in costs}
+    prob = pl.LpProblem('test', pl.LpMinimize)
+    prob += pl.lpSum(cost * x[key] for key, cost in costs.items())
+    prob += pl.lpSum(x.values()) >= 2, 'cover'
+    return prob, x
+
+
+def test_find_identical_columns():
+    prob, x = build_model({'a': 1, 'b': 1, 'c': 2, 'd': 1})
+    symmetries = find_symmetries(prob, {'x': x})
+    assert len(symmetries) == 1
+    assert (symmetries[0].group, symmetries[0].position, symmetries[0].values) == ('x', None, ['a', 'b', 'd'])
+    rows = add_symmetry_breaking(prob, symmetries)
+    assert [row.name for row in rows] == ['symmetry_breaking_0', 'symmetry_breaking_1']
+    assert dict(rows[0].items()) == {x['a']: 1, x['b']: -1}
+    assert prob.solve(pl.PULP_CBC_CMD(msg=0)) == pl.LpStatusOptimal
+    assert (x['a'].varValue, x['b'].varValue) == (1, 1)
+
+
+def test_find_no_symmetry():
+    prob, x = build_model({'a': 1, 'b': 2})
+    assert find_symmetries(prob, {'x': x}) == []
+    prob, x = build_model({'a': 1, 'b': 1})
+    prob += x['a'] + 2 * x['b'] <= 2, 'weighted'
+    assert find_symmetries(prob, {'x': x}) == []
+
+
+def test_find_missing_image():
+    x = {key: pl.LpVariable('x_%s_%s' % key, 0, 1) for key in [(0, 0), (0, 1), (1, 0)]}
+    prob = pl.LpProblem('test', pl.LpMinimize)
+    prob += pl.lpSum(x.values())
+    assert find_symmetries(prob, {'x': x}) == []
+
+
+class TempVariables(VariableManager):
+    vars = [
+        BinaryVariableGroup('assign', [(temp, shift) for temp in range(4) for shift in range(3)]),
+        BinaryVariableGroup('hired', list(range(4))),
+        VariableGroup('overtime', list(range(4)), 0, 10)
+    ]
+
+
+class CoverageFamily(ConstraintFamily):
+    def define(self, assign):
+        for shift, requirement in enumerate([2, 1, 3]):
+            yield shift, pl.lpSum(assign[temp, shift] for temp in range(4)) >= requirement
+
+
+class HiredFamily(ConstraintFamily):
+    def define(self, assign, hired):
+        for temp in range(4):
+            yield temp, pl.lpSum(assign[temp, shift] for shift in range(3)) <= 2 * hired[temp]
+
+
+class OvertimeConstraint(Constraint):
+    def define(self, overtime):
+        return overtime[0] + 2 * overtime[1] + 3 * overtime[2] + 4 * overtime[3] >= 5
+
+
+class TempObjective(ObjectiveComponent):
+    def define(self, assign, hired, overtime):
+        return pl.lpSum(assign.values()) + 10 * pl.lpSum(hired.values()) + pl.lpSum(overtime.values())
+
+
+class TempProblem(Problem):
+    variables = TempVariables
+    objective = TempObjective
+    constraints = [CoverageFamily, HiredFamily, OvertimeConstraint]
+    sense = MINIMIZE
+
+
+def test_find_linked_symmetries():
+    prob = TempProblem()
+    symmetries = prob.find_symmetries()
+    assert prob.symmetries == [] and prob.symmetry_rows == []
+    assert [(symmetry.group, symmetry.position, symmetry.values, symmetry.linked) for symmetry in symmetries] == [
+        ('assign', 0, [0, 1, 2, 3], [('hired', None)])
+    ]
+    assert symmetries[0].columns[1] == [prob.vars['assign'][1, shift] for shift in range(3)]
+
+
+def test_symmetry_breaking():
+    expected = TempProblem()
+    assert expected.solve() == 'Optimal'
+    prob = TempProblem()
+    prob.symmetry_breaking = True
+    assert prob.solve() == 'Optimal'
+    assert len(prob.symmetries) == 1
+    assert len(prob.symmetry_rows) == 3
+    assert pl.value(prob.prob.objective) == pl.value(expected.prob.objective)
+    loads = [sum(prob.result_variables['assign'][temp, shift] for shift in range(3)) for temp in range(4)]
+    assert loads == sorted(loads, reverse=True)
+    assert 'symmetry_breaking_0' not in prob.constraint_results
@@ -1,7 +1,11 @@
+import pulp as pl
 import pytest
+from collections import OrderedDict
 from unittest.mock import patch, Mock
 
-from horuslp.core.utils import get_constraints_value, call_with_required_args
+from horuslp.core.utils import get_constraints_value, call_with_required_args, iterate_variables, \
+    serialize_constraint, deserialize_constraint, is_constraint_group, collect_rows, get_model_rows, remove_model_row, \
+    add_family_row, SparseValues
 
 
 def test_get_constr_value_null():
@@ -49,3 +53,86 @@ def test_call_with_required_args_with_varkw():
         assert retval == 'call_return'
         assert callee.call_count == 1
         assert callee.call_args_list[0][1] == {'a': 'val_a', 'b': 'val_b', 'c': 'val_c', 'd': 'val_d'}
+
+
+def test_iterate_variables():
+    group = OrderedDict([('a', 'var_a'), ('b', 'var_b')])
+    variables = OrderedDict([('single', 'var_single'), ('group', group)])
+    assert list(iterate_variables(variables)) == ['var_single', 'var_a', 'var_b']
+
+
+def test_serialize_constraint_passthrough():
+    assert serialize_constraint(True) is True
+    assert serialize_constraint(None) is None
+    assert deserialize_constraint(True, {}) is True
+
+
+def test_serialize_constraint_roundtrip():
+    x = pl.LpVariable('x', 0, 1)
+    y = pl.LpVariable('y', 0, 1)
+    block = serialize_constraint(2 * x - y + 1 >= 3)
+    assert block == ([('x', 2), ('y', -1)], pl.LpConstraintGE, -2)
+    x_copy = pl.LpVariable('x', 0, 1)
+    y_copy = pl.LpVariable('y', 0, 1)
+    constr = deserialize_constraint(block, {'x': x_copy, 'y': y_copy})
+    assert dict(constr.items()) == {x_copy: 2, y_copy: -1}
+    assert constr.sense == pl.LpConstraintGE
+    assert constr.constant == -2
+
+
+def test_serialize_constraint_group():
+    x = pl.LpVariable('x', 0, 1)
+    block = serialize_constraint(OrderedDict([('a', x <= 1), ('b', x >= 0)]))
+    assert list(block.keys()) == ['a', 'b']
+    constr = deserialize_constraint(block, {'x': x})
+    assert is_constraint_group(constr)
+    assert dict(constr['a'].items()) == {x: 1}
+    assert constr['b'].sense == pl.LpConstraintGE
+
+
+def test_is_constraint_group():
+    x = pl.LpVariable('x', 0, 1)
+    assert is_constraint_group(OrderedDict([('a', x <= 1)]))
+    assert not is_constraint_group(x <= 1)
+    assert not is_constraint_group(x + 1)
+    assert not is_constraint_group(True)
+
+
+def test_collect_rows():
+    rows = collect_rows(iter([('a', 'row_a'), ('b', True), ('c', 'row_c'), ('d', None)]))
+    assert rows == OrderedDict([('a', 'row_a'), ('c', 'row_c')])
+    assert list(rows.keys()) == ['a', 'c']
+    assert collect_rows({'a': 'row_a'}) == OrderedDict([('a', 'row_a')])
+
+
+def test_remove_model_row():
+    x = pl.LpVariable('x')
+    prob = pl.LpProblem('test')
+    prob += x <= 1, 'first'
+    prob += x >= 0, 'second'
+    remove_model_row(prob, 'first')
+    assert [row.name for row in get_model_rows(prob)] == ['second']
+
+
+def test_add_family_row():
+    x = pl.LpVariable('x')
+    prob = pl.LpProblem('test')
+    add_family_row(prob, 'Family', (1, 'a b'), x <= 1)
+    add_family_row(prob, 'Family', '1_a-b', x <= 2)
+    add_family_row(prob, 'Family', 3, x >= 0)
+    assert [row.name for row in get_model_rows(prob)] == ['Family_1_a_b_', 'Family_1_a_b_1_', 'Family_3_']
+
+
+def test_remove_model_row_unsupported():
+    prob = Mock()
+    prob.constraints = Mock(spec=[])
+    with pytest.raises(NotImplementedError):
+        remove_model_row(prob, 'first')
+
+
+def test_sparse_values():
+    values = SparseValues(a=1)
+    assert values['a'] == 1
+    assert values['b'] == 0
+    assert 'b' not in values
+    assert list(values.items()) == [('a', 1)]
@@ -4,7 +4,7 @@ from unittest.mock import patch, Mock
 
 from horuslp.core.constants import BINARY, INTEGER, CONTINUOUS
 from horuslp.core.Variables import Variable, VariableGroup, VariableManager, IntegerVariable, IntegerVariableGroup, \
-    BinaryVariable, BinaryVariableGroup
+    BinaryVariable, BinaryVariableGroup, Column
 
 
 def test_variable_class():
@@ -58,6 +58,17 @@ def test_integer_variable_group():
     assert test_variable.var_type == INTEGER
 
 
+def test_column():
+    column = Column('test_name', 'test_key', 'test_cost', 'test_coefficients')
+    assert column.group_name == 'test_name'
+    assert column.key == 'test_key'
+    assert column.cost == 'test_cost'
+    assert column.coefficients == 'test_coefficients'
+    assert column.lb == 0
+    assert column.ub is None
+    assert column.var_type == CONTINUOUS
+
+
 def test_var_manager_empty():
     var_mgr = VariableManager()
     var_mgr.define_variables()